@@ -0,0 +1,114 @@
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+# Cached responses are keyed on the current version of every tag they depend
+# on. A write bumps the tag's version, so stale entries are never read again
+# and simply age out; no key scanning is needed, which keeps this working the
+# same on local-memory, file and Redis backends.
+TAG_PREFIX = 'tag:'
+RESPONSE_PREFIX = 'resp:'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+# ==========================================
+# 1. TAG VERSIONS
+# ==========================================
+
+def tag_versions(tags):
+    """Current version of each tag, creating versions for unseen tags"""
+    cache = get_cache()
+    keys = [TAG_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        # add() keeps whichever version another worker may have just created
+        for key, version in missing.items():
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key) or version
+            versions[key] = version
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags):
+    """Bumps tag versions once the current transaction commits"""
+    tags = [tag for tag in tags if tag]
+    if not tags or not settings.RESPONSE_CACHE_ENABLED:
+        return
+
+    def bump():
+        get_cache().set_many({TAG_PREFIX + tag: uuid.uuid4().hex for tag in tags}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def patient_tags(patient_ids, doctor_ids=()):
+    tags = ['patients']
+    tags += [f'patient:{patient_id}' for patient_id in patient_ids]
+    tags += [f'doctor:{doctor_id}' for doctor_id in doctor_ids if doctor_id]
+    return tags
+
+
+def invalidate_patients(profiles):
+    """
+    Invalidates cached reads for a PatientProfile queryset: the profiles
+    themselves, the profile list and their doctors' dashboards (one query).
+    """
+    rows = list(profiles.values_list('id', 'assigned_doctor_id'))
+    if rows:
+        invalidate_tags(*patient_tags([row[0] for row in rows], {row[1] for row in rows}))
+
+
+# ==========================================
+# 2. RESPONSE CACHE + ETAGS
+# ==========================================
+
+def _etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    candidates = [value.strip().removeprefix('W/') for value in header.split(',')]
+    return etag in candidates or '*' in candidates
+
+
+def cached_response(request, tags, build, timeout=None):
+    """
+    Returns a DRF Response for `build()` (a JSON-serialisable object), served
+    from the cache while none of `tags` has been invalidated. Sets an ETag
+    and answers If-None-Match with 304 Not Modified. With
+    RESPONSE_CACHE_ENABLED off, build() runs on every request.
+    """
+    cache = get_cache()
+    key = entry = None
+    if settings.RESPONSE_CACHE_ENABLED:
+        query = sorted(request.query_params.lists())
+        versions = tag_versions(tags)
+        key = RESPONSE_PREFIX + hashlib.sha256(
+            json.dumps([request.path, query, versions]).encode('utf-8')
+        ).hexdigest()
+        entry = cache.get(key)
+
+    if entry is None:
+        data = json.loads(json.dumps(build(), cls=DjangoJSONEncoder))
+        etag = '"%s"' % hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+        entry = (etag, data)
+        if key is not None:
+            cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout)
+    etag, data = entry
+
+    if _etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    # Clients must revalidate, but may reuse their copy when we answer 304
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -44,8 +44,16 @@ INSTALLED_APPS = [
     'users',                # User roles (Patient/Doctor)
     'patients',             # Health data, vitals, meds
     'communication',        # Chat, Call logs, AI integration
+    'jobs',                 # Background job queue for AI & speech work
+    'realtime',             # Push events (SSE / WebSocket) for alerts, mood and vitals
 ]
 
+# Seeded fixtures & API load-test scenarios (seed_loadtest / loadtest commands);
+# installed in development, or elsewhere with LOADTEST=true
+LOADTEST = DEBUG or os.getenv('LOADTEST', '').lower() in ('1', 'true', 'yes')
+if LOADTEST:
+    INSTALLED_APPS.append('loadtest')
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # MUST be at the top for CORS to work
     'django.middleware.security.SecurityMiddleware',
@@ -77,15 +85,20 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'carebridge.wsgi.application'
 
+# ASGI entrypoint (async chat path). Run with e.g.
+#   gunicorn carebridge.asgi:application -k uvicorn.workers.UvicornWorker
+ASGI_APPLICATION = 'carebridge.asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+# Configured from DATABASE_URL (PostgreSQL in production, SQLite by default).
+# PostgreSQL: DB_CONN_MAX_AGE (persistent connections) or DB_POOL=1 (psycopg pool)
+# SQLite: WAL + busy timeout unless SQLITE_TUNING=0
+from .database import database_from_env  # noqa: E402
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(BASE_DIR / 'db.sqlite3'),
 }
 
 
@@ -151,13 +164,224 @@ CORS_ALLOW_CREDENTIALS = True
 # You can get this key from https://aistudio.google.com/
 
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash-lite')
 
 # Azure Speech Service (for Call Transcription)
 # Note: You could also use Google Cloud Speech-to-Text if you wanted to stay 100% Google
 AZURE_SPEECH_KEY = os.getenv('AZURE_SPEECH_KEY')
 AZURE_SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION')
+# Max seconds to wait for recognition to finish after the last audio chunk
+TRANSCRIPTION_TIMEOUT = float(os.getenv('TRANSCRIPTION_TIMEOUT', '120'))
 
 # Azure Language Service (for Sentiment Analysis)
 # Note: Gemini can often perform Sentiment Analysis via prompting, so you might not need this.
 AZURE_LANGUAGE_ENDPOINT = os.getenv('AZURE_LANGUAGE_ENDPOINT')
-AZURE_LANGUAGE_KEY = os.getenv('AZURE_LANGUAGE_KEY')
\ No newline at end of file
+AZURE_LANGUAGE_KEY = os.getenv('AZURE_LANGUAGE_KEY')
+
+# Pluggable AI backends (communication/backends/)
+# AI_BACKEND=local swaps every vendor for a deterministic in-process stand-in
+# (no network, no keys) with injectable latency/failures, for load testing.
+AI_BACKEND = os.getenv('AI_BACKEND', 'vendor')
+if AI_BACKEND == 'local':
+    _local_options = {
+        'latency_ms': float(os.getenv('LOCAL_AI_LATENCY_MS', '0')),
+        'jitter': float(os.getenv('LOCAL_AI_JITTER', '0')),
+        'failure_rate': float(os.getenv('LOCAL_AI_FAILURE_RATE', '0')),
+    }
+    AI_BACKENDS = {
+        'llm': {'BACKEND': 'communication.backends.local.LocalLLMBackend', 'OPTIONS': _local_options},
+        'sentiment': {'BACKEND': 'communication.backends.local.LocalSentimentBackend', 'OPTIONS': _local_options},
+        'speech': {'BACKEND': 'communication.backends.local.LocalSpeechBackend', 'OPTIONS': _local_options},
+    }
+else:
+    AI_BACKENDS = {
+        'llm': {'BACKEND': 'communication.backends.gemini.GeminiLLMBackend'},
+        'sentiment': {'BACKEND': 'communication.backends.azure.AzureSentimentBackend'},
+        'speech': {'BACKEND': 'communication.backends.azure.AzureSpeechBackend'},
+    }
+
+# Per-call deadlines (seconds) for every chat path (see AI_CALL_POLICIES).
+# On timeout the caller stops waiting and the usual fallback reply/mood is used.
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '15'))
+AZURE_LANGUAGE_TIMEOUT = float(os.getenv('AZURE_LANGUAGE_TIMEOUT', '5'))
+# Threads per worker for blocking AI SDK calls made from the async path
+AI_MAX_THREADS = int(os.getenv('AI_MAX_THREADS', '64'))
+
+# Call policies for every outbound AI call (communication/resilience.py), per
+# backend kind / vendor: an overall deadline (retries included), jittered
+# exponential retries, a circuit breaker that fails fast while a vendor is
+# down, and a bulkhead capping concurrent calls so a brownout cannot tie up
+# every worker thread. Hedging (a second attempt when the first is slower
+# than hedge_after seconds) is off by default; it doubles tail-latency calls.
+AI_RETRIES = int(os.getenv('AI_RETRIES', '2'))
+AI_RETRY_BACKOFF = float(os.getenv('AI_RETRY_BACKOFF', '0.2'))
+AI_BREAKER_FAILURES = int(os.getenv('AI_BREAKER_FAILURES', '5'))
+AI_BREAKER_RESET_SECONDS = float(os.getenv('AI_BREAKER_RESET_SECONDS', '30'))
+AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', '16'))
+AI_HEDGE_AFTER = float(os.getenv('AI_HEDGE_AFTER', '0')) or None
+_ai_policy = {
+    'retries': AI_RETRIES,
+    'backoff': AI_RETRY_BACKOFF,
+    'failure_threshold': AI_BREAKER_FAILURES,
+    'reset_timeout': AI_BREAKER_RESET_SECONDS,
+    'max_concurrency': AI_MAX_CONCURRENCY,
+}
+AI_CALL_POLICIES = {
+    'llm': dict(_ai_policy, deadline=GEMINI_TIMEOUT, hedge_after=AI_HEDGE_AFTER),
+    'sentiment': dict(_ai_policy, deadline=AZURE_LANGUAGE_TIMEOUT, hedge_after=AI_HEDGE_AFTER),
+    # Transcription has its own deadline (TRANSCRIPTION_TIMEOUT); only the breaker applies
+    'speech': dict(_ai_policy, deadline=TRANSCRIPTION_TIMEOUT, retries=0),
+}
+
+# Per-worker cache of AI results (communication/ai_cache.py), keyed on the
+# normalised prompt + backend/model. Sentiment is cached for every message, but
+# chat replies only while the prompt carries no conversation context: in
+# practice a user's first message. Once a user has history (summary or recent
+# turns) their chat replies always go to the backend. AI_CACHE_TTL=0 disables it.
+AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', '3600'))
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '5000'))
+
+# Long-lived AI clients (communication/clients.py)
+# Max pooled HTTP connections per vendor client, per worker
+AI_HTTP_POOL_SIZE = int(os.getenv('AI_HTTP_POOL_SIZE', '20'))
+# Consecutive failures before a client is torn down and rebuilt
+AI_CLIENT_MAX_FAILURES = int(os.getenv('AI_CLIENT_MAX_FAILURES', '3'))
+
+# Mood detection micro-batching (communication/mood.py)
+# Azure accepts up to 10 documents per analyze_sentiment call
+MOOD_BATCH_MAX_SIZE = int(os.getenv('MOOD_BATCH_MAX_SIZE', '10'))
+# How long a batch waits for more requests; only while other callers are waiting,
+# a lone request is sent at once
+MOOD_BATCH_MAX_WAIT_MS = float(os.getenv('MOOD_BATCH_MAX_WAIT_MS', '20'))
+# Batches that may be awaiting Azure at the same time
+MOOD_BATCH_MAX_IN_FLIGHT = int(os.getenv('MOOD_BATCH_MAX_IN_FLIGHT', '4'))
+
+# Chat history pagination (GET /api/communication/chat/<user_id>/)
+CHAT_HISTORY_PAGE_SIZE = int(os.getenv('CHAT_HISTORY_PAGE_SIZE', '50'))
+CHAT_HISTORY_MAX_PAGE_SIZE = int(os.getenv('CHAT_HISTORY_MAX_PAGE_SIZE', '200'))
+
+# Incremental clinical summaries: max new patient messages folded in per Gemini call
+CLINICAL_SUMMARY_CHUNK_SIZE = int(os.getenv('CLINICAL_SUMMARY_CHUNK_SIZE', '200'))
+# Gemini calls made inside one summary request; a longer backlog is finished by a job
+CLINICAL_SUMMARY_REQUEST_CHUNKS = int(os.getenv('CLINICAL_SUMMARY_REQUEST_CHUNKS', '1'))
+
+# Chat context: at most this many recent turns, within this token budget
+# (estimated), go into each prompt alongside the rolling conversation summary
+CHAT_CONTEXT_MAX_TURNS = int(os.getenv('CHAT_CONTEXT_MAX_TURNS', '20'))
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv('CHAT_CONTEXT_TOKEN_BUDGET', '1500'))
+# Once this many turns have left the window unsummarised, a background job
+# folds them into the conversation summary
+CHAT_SUMMARY_BATCH = int(os.getenv('CHAT_SUMMARY_BATCH', '20'))
+
+
+# ==============================================
+# Background Jobs (jobs app)
+# ==============================================
+
+# 'jobs.brokers.DatabaseBroker' queues in the DB (run `python manage.py run_jobs`)
+# 'jobs.brokers.InlineBroker' runs jobs immediately in the web process (no worker needed)
+JOB_BROKER = os.getenv('JOB_BROKER', 'jobs.brokers.DatabaseBroker')
+JOB_WORKER_PROCESSES = int(os.getenv('JOB_WORKER_PROCESSES', '2'))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '0.5'))
+# A running job older than this is assumed lost and re-queued
+JOB_VISIBILITY_TIMEOUT = int(os.getenv('JOB_VISIBILITY_TIMEOUT', '600'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+
+# ==============================================
+# Vitals
+# ==============================================
+
+# Max readings accepted by one POST /api/patients/vitals/bulk/
+VITALS_BULK_MAX_ROWS = int(os.getenv('VITALS_BULK_MAX_ROWS', '10000'))
+
+# Default and maximum number of points returned by GET /api/patients/vitals/series/
+VITALS_SERIES_DEFAULT_POINTS = int(os.getenv('VITALS_SERIES_DEFAULT_POINTS', '300'))
+VITALS_SERIES_MAX_POINTS = int(os.getenv('VITALS_SERIES_MAX_POINTS', '2000'))
+
+# Snapshot updates (mood, status) for the same patient within this window are
+# merged into one UPDATE; 0 writes immediately
+SNAPSHOT_COALESCE_MS = int(os.getenv('SNAPSHOT_COALESCE_MS', '200'))
+
+# Rows fetched and encoded per batch by vitals exports (CSV / columnar);
+# bounds export memory regardless of history length
+VITALS_EXPORT_BATCH_SIZE = int(os.getenv('VITALS_EXPORT_BATCH_SIZE', '5000'))
+
+# ==============================================
+# Vital Sign Alerts
+# ==============================================
+
+# Readings in the per-patient rolling (EWMA) baseline, and how many are needed before z-scores are trusted
+VITALS_BASELINE_WINDOW = int(os.getenv('VITALS_BASELINE_WINDOW', '50'))
+VITALS_BASELINE_WARMUP = int(os.getenv('VITALS_BASELINE_WARMUP', '20'))
+# |z| at or above which a reading is flagged as unusual for that patient
+VITALS_ZSCORE_THRESHOLD = float(os.getenv('VITALS_ZSCORE_THRESHOLD', '3.5'))
+# The same rule does not raise another alert for a patient within this window
+HEALTH_ALERT_DEDUP_MINUTES = int(os.getenv('HEALTH_ALERT_DEDUP_MINUTES', '30'))
+
+# ==============================================
+# Medication Schedules
+# ==============================================
+
+# Doses are expanded this far ahead (re-expanded when half of it is left)
+MEDICATION_SCHEDULE_HORIZON_HOURS = int(os.getenv('MEDICATION_SCHEDULE_HORIZON_HOURS', '48'))
+# A due dose not taken within this long is marked missed and alerted
+MEDICATION_MISSED_GRACE_MINUTES = int(os.getenv('MEDICATION_MISSED_GRACE_MINUTES', '60'))
+# A dose may be marked taken this long before it is due
+MEDICATION_EARLY_WINDOW_MINUTES = int(os.getenv('MEDICATION_EARLY_WINDOW_MINUTES', '120'))
+# `python manage.py run_medication_sweep` runs the sweep this often
+MEDICATION_SWEEP_INTERVAL = float(os.getenv('MEDICATION_SWEEP_INTERVAL', '60'))
+# Rows handled per sweep query / transaction
+MEDICATION_SWEEP_BATCH_SIZE = int(os.getenv('MEDICATION_SWEEP_BATCH_SIZE', '1000'))
+
+# ==============================================
+# Caching
+# ==============================================
+
+# CACHE_BACKEND: 'file' (default, shared by workers on one host), 'redis' (shared by
+# all hosts; needs the redis package and CACHE_URL) or 'locmem' (per process)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file')
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'carebridge',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# Cache alias and lifetime (seconds) for cached API responses (profiles, dashboard, chat history, summaries)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+# Tag invalidation only reaches other workers and job processes through a shared
+# cache, so with 'locmem' responses are rebuilt on every request (ETags still apply)
+RESPONSE_CACHE_ENABLED = CACHE_BACKEND != 'locmem'
+
+
+# ==============================================
+# Real-time Push (realtime app)
+# ==============================================
+
+# 'realtime.brokers.InProcessBroker' delivers within one worker process;
+# 'realtime.brokers.RedisBroker' relays through Redis pub/sub to every worker.
+# RedisBroker is also required for events from run_jobs and run_medication_sweep
+# (job results, dose alerts), which run outside the web process
+REALTIME_BROKER = os.getenv('REALTIME_BROKER', 'realtime.brokers.InProcessBroker')
+# Web worker processes (gunicorn reads the same variable); more than one needs
+# RedisBroker, which `manage.py check` warns about
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+REALTIME_REDIS_URL = os.getenv('REALTIME_REDIS_URL', 'redis://127.0.0.1:6379/2')
+# Idle streams get a heartbeat this often so proxies keep the connection open
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv('REALTIME_HEARTBEAT_SECONDS', '15'))
+# Events buffered per client before it is told to resync
+REALTIME_QUEUE_SIZE = int(os.getenv('REALTIME_QUEUE_SIZE', '200'))
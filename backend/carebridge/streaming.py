@@ -0,0 +1,35 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+async def iterate_in_thread(chunks):
+    """
+    Async iterator over a sync iterator (e.g. one reading the DB in batches).
+    Each step runs in the request's sync thread, so database cursors stay on
+    the connection that opened them.
+    """
+    iterator = iter(chunks)
+    try:
+        while True:
+            chunk = await sync_to_async(next)(iterator, _DONE)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def streaming_response(request, chunks, content_type):
+    """
+    StreamingHttpResponse for a sync iterator that streams under both servers.
+    Under ASGI Django would otherwise read a sync iterator to the end before
+    sending anything.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = iterate_in_thread(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
@@ -5,5 +5,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/communication/', include('communication.urls')),
     path('api/patients/', include('patients.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/realtime/', include('realtime.urls')),
     # Users API can be added similarly if needed
 ]
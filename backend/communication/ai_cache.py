@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+
+# Punctuation/whitespace that does not change what a short message asks for
+EDGE_RE = re.compile(r'^[\s.,!?;:~\-]+|[\s.,!?;:~\-]+$')
+SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """'  Good   Morning!! ' and 'good morning' address the same entry"""
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    return EDGE_RE.sub('', SPACE_RE.sub(' ', text))
+
+
+def backend_identity(backend):
+    """Backend class plus model name, so switching models never serves old replies"""
+    backend = getattr(backend, 'inner', backend) # Unwrap the call-policy wrapper
+    return f"{type(backend).__module__}.{type(backend).__name__}:{getattr(backend, 'model', '')}"
+
+
+class AIResponseCache:
+    """
+    Per-worker, content-addressed cache of AI results (LLM replies, sentiment).
+    Keys are SHA-256 digests of the result kind, backend/model and normalised
+    input (which includes the system prompt), so no message text is kept as
+    a key. Entries expire after `ttl` seconds and the least recently used
+    entry is evicted once `max_entries` is reached. Failed calls and
+    fallback results are never stored.
+    """
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._reset()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {}
+
+    def key(self, kind, backend, text):
+        raw = json.dumps([kind, backend_identity(backend), normalize_text(text)])
+        return kind, hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, kind, stat):
+        counts = self._stats.setdefault(kind, {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0})
+        counts[stat] += 1
+
+    def get(self, key):
+        """Cached value or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self._count(key[0], 'expired')
+                entry = None
+            if entry is None:
+                self._count(key[0], 'misses')
+                return None
+            self._entries.move_to_end(key)
+            self._count(key[0], 'hits')
+            return entry[1]
+
+    def set(self, key, value):
+        if not self.enabled or value is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._count(evicted[0], 'evictions')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters per kind, with hit rates"""
+        with self._lock:
+            kinds = {kind: dict(counts) for kind, counts in self._stats.items()}
+            size = len(self._entries)
+        for counts in kinds.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = round(counts['hits'] / lookups, 3) if lookups else None
+        return {'enabled': self.enabled, 'entries': size, 'max_entries': self.max_entries, 'ttl': self.ttl, 'kinds': kinds}
+
+
+ai_cache = AIResponseCache(settings.AI_CACHE_MAX_ENTRIES, settings.AI_CACHE_TTL)
+
+if hasattr(os, 'register_at_fork'):
+    # Locks must not be inherited mid-acquire; each worker keeps its own cache
+    os.register_at_fork(after_in_child=ai_cache._reset)
@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 class CommunicationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'communication'
\ No newline at end of file
+    name = 'communication'
+
+    def ready(self):
+        # Cache invalidation on model writes
+        from . import signals  # noqa: F401
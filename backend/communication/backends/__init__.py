@@ -0,0 +1,42 @@
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import AIBackendError
+from .resilience import with_policy
+
+_backends = {}
+_lock = threading.Lock()
+
+
+def get_backend(kind):
+    """
+    Returns the configured backend for 'llm', 'sentiment' or 'speech'.
+    Configured by settings.AI_BACKENDS (BACKEND dotted path + OPTIONS), one
+    instance per process, wrapped in the kind's settings.AI_CALL_POLICIES entry.
+    """
+    backend = _backends.get(kind)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(kind)
+            if backend is None:
+                config = settings.AI_BACKENDS[kind]
+                backend = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+                # Deadlines, retries, circuit breaker and bulkhead for every call
+                policy = getattr(settings, 'AI_CALL_POLICIES', {}).get(kind)
+                if policy is not None:
+                    backend = with_policy(kind, backend, policy)
+                _backends[kind] = backend
+    return backend
+
+
+def reset_backends():
+    """Drops cached backends so the next call re-reads settings.AI_BACKENDS"""
+    with _lock:
+        _backends.clear()
+
+
+def backend_policies():
+    """Call policy state (breaker, in-flight calls, counters) per initialised backend"""
+    return {kind: backend.policy.health() for kind, backend in list(_backends.items()) if hasattr(backend, 'policy')}
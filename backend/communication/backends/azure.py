@@ -0,0 +1,115 @@
+import threading
+
+from django.conf import settings
+
+from ..clients import ai_clients
+from .base import SentimentBackend, SpeechBackend, StreamingTranscriber
+
+
+class AzureSentimentBackend(SentimentBackend):
+    """Azure Language Service analyze_sentiment (up to 10 documents per call)"""
+    client_name = 'text_analytics'
+
+    def analyze(self, texts):
+        client = ai_clients.get(self.client_name)
+        try:
+            results = client.analyze_sentiment(documents=texts)
+        except Exception:
+            ai_clients.report_failure(self.client_name)
+            raise
+        ai_clients.report_success(self.client_name)
+        return [None if doc.is_error else doc.sentiment for doc in results]
+
+
+class AzureSpeechBackend(SpeechBackend):
+    """Azure Speech continuous recognition fed through a push stream"""
+    def create_transcriber(self):
+        return AzureStreamingTranscriber()
+
+
+class AzureStreamingTranscriber(StreamingTranscriber):
+    """
+    Continuous Azure speech recognition over audio that arrives in chunks.
+    Audio is pushed straight into the SDK (no temp file), recognition runs
+    while the rest is still arriving, and every utterance is kept as a
+    timed segment rather than only the first one.
+    """
+    def __init__(self):
+        super().__init__()
+        self.segments = []
+        self._push_stream = None
+        self._recognizer = None
+        self._error = None
+        self._done = threading.Event()
+
+    def start(self, stream_format):
+        # Native SDK, imported on first transcription only
+        import azure.cognitiveservices.speech as speechsdk
+
+        if stream_format:
+            audio_format = speechsdk.audio.AudioStreamFormat(**stream_format)
+            self._push_stream = speechsdk.audio.PushAudioInputStream(stream_format=audio_format)
+        else:
+            self._push_stream = speechsdk.audio.PushAudioInputStream()
+        audio_config = speechsdk.audio.AudioConfig(stream=self._push_stream)
+        self._recognizer = speechsdk.SpeechRecognizer(
+            speech_config=ai_clients.get('speech'),
+            audio_config=audio_config
+        )
+        self._recognizer.recognized.connect(self._on_recognized)
+        self._recognizer.canceled.connect(self._on_canceled)
+        self._recognizer.session_stopped.connect(lambda evt: self._done.set())
+        self._recognizer.start_continuous_recognition_async().get()
+
+    def write_audio(self, chunk):
+        self._push_stream.write(chunk)
+
+    def _on_recognized(self, evt):
+        import azure.cognitiveservices.speech as speechsdk
+
+        result = evt.result
+        if result.reason == speechsdk.ResultReason.RecognizedSpeech and result.text:
+            # Offsets and durations are in 100ns ticks
+            self.segments.append({
+                "text": result.text,
+                "offset_seconds": round(result.offset / 10_000_000, 2),
+                "duration_seconds": round(result.duration / 10_000_000, 2),
+            })
+
+    def _on_canceled(self, evt):
+        import azure.cognitiveservices.speech as speechsdk
+
+        # EndOfStream is the normal end of pushed audio
+        if evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+            self._error = evt.cancellation_details.error_details
+        self._done.set()
+
+    def finish(self):
+        """Signals end of audio, waits for the last utterances and returns the result"""
+        if not self.started and not self.start_headerless():
+            return {"status": "error", "message": "Empty audio file"}
+
+        self._push_stream.close()
+        finished = self._done.wait(timeout=settings.TRANSCRIPTION_TIMEOUT)
+        self._recognizer.stop_continuous_recognition_async().get()
+
+        if self._error:
+            return {"status": "error", "message": f"Canceled: {self._error}"}
+        if not self.segments:
+            return {"status": "error", "message": "No speech could be recognized"}
+        response_data = {
+            "status": "success",
+            "transcript": " ".join(segment["text"] for segment in self.segments),
+            "segments": self.segments,
+        }
+        if not finished:
+            response_data["partial"] = True # Timed out before the end of the audio
+        return response_data
+
+    def cancel(self):
+        """Stops recognition without a result (upload aborted before finish())"""
+        super().cancel()
+        if self._push_stream is not None:
+            self._push_stream.close()
+        if self._recognizer is not None:
+            self._recognizer.stop_continuous_recognition_async().get()
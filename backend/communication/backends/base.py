@@ -0,0 +1,140 @@
+import abc
+import struct
+
+# Give up looking for the WAV 'data' chunk after this many bytes
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class AIBackendError(Exception):
+    """Raised by a backend when a call fails"""
+
+
+class LLMBackend(abc.ABC):
+    """Text generation (chat replies, clinical summaries)"""
+    # Model name; part of the AI response cache key
+    model = ''
+
+    @abc.abstractmethod
+    def generate(self, prompt):
+        """Returns the full reply text"""
+
+    def stream(self, prompt):
+        """Yields reply text pieces as they are generated"""
+        yield self.generate(prompt)
+
+
+class SentimentBackend(abc.ABC):
+    """Sentiment analysis for mood detection"""
+    @abc.abstractmethod
+    def analyze(self, texts):
+        """
+        Returns one of 'positive', 'negative', 'neutral' (or None if that
+        document failed) per input text, in order.
+        """
+
+
+class SpeechBackend(abc.ABC):
+    """Speech-to-text for call recordings"""
+    @abc.abstractmethod
+    def create_transcriber(self):
+        """Returns a StreamingTranscriber for one upload"""
+
+
+# ==========================================
+# SPEECH: WAV HEADER + TRANSCRIBER BASE
+# ==========================================
+
+def parse_wav_header(buffer):
+    """
+    Reads a RIFF/WAVE header from the start of an upload.
+    Returns (format_kwargs, data_offset), or None if more bytes are needed.
+    format_kwargs is None for headerless audio, which is treated as raw
+    16 kHz / 16-bit / mono PCM (the Speech SDK default).
+    """
+    if len(buffer) < 12:
+        return None
+    if buffer[:4] != b'RIFF' or buffer[8:12] != b'WAVE':
+        return None, 0
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(buffer):
+        chunk_id = buffer[pos:pos + 4]
+        chunk_size = struct.unpack('<I', buffer[pos + 4:pos + 8])[0]
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            if body + 16 > len(buffer):
+                return None
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', buffer[body:body + 16])
+            if audio_format != 1:
+                raise ValueError("Only PCM WAV audio is supported")
+            fmt = {'samples_per_second': sample_rate, 'bits_per_sample': bits, 'channels': channels}
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV 'data' chunk found before 'fmt ' chunk")
+            return fmt, body
+        # Chunks are word-aligned
+        pos = body + chunk_size + (chunk_size % 2)
+    return None
+
+
+class StreamingTranscriber(abc.ABC):
+    """
+    Transcribes audio bytes as they arrive: write(chunk) per upload chunk,
+    finish() for the transcription response dict, cancel() to stop when
+    the upload is abandoned before finish().
+
+    write() buffers the start of the upload until the WAV header is read,
+    then calls start(stream_format) once and write_audio() with PCM bytes
+    only. stream_format is None for headerless (raw PCM) audio.
+    """
+    def __init__(self):
+        self.bytes_received = 0
+        self.started = False
+        self._header = bytearray()
+
+    def write(self, chunk):
+        self.bytes_received += len(chunk)
+        if not self.started:
+            self._header += chunk
+            parsed = parse_wav_header(self._header)
+            if parsed is None:
+                if len(self._header) > MAX_HEADER_BYTES:
+                    raise ValueError("Could not read the WAV header")
+                return
+            stream_format, data_offset = parsed
+            chunk = bytes(self._header[data_offset:])
+            self._header = None
+            self.started = True
+            self.start(stream_format)
+        if chunk:
+            self.write_audio(chunk)
+
+    def start_headerless(self):
+        """
+        Starts a short upload that never produced a full header as raw PCM.
+        Returns False if nothing was received at all.
+        """
+        if not self._header:
+            return False
+        header, self._header = bytes(self._header), None
+        self.started = True
+        self.start(None)
+        self.write_audio(header)
+        return True
+
+    @abc.abstractmethod
+    def start(self, stream_format):
+        """Called once the audio format is known, before the first write_audio()"""
+
+    @abc.abstractmethod
+    def write_audio(self, chunk):
+        """PCM bytes, in order"""
+
+    @abc.abstractmethod
+    def finish(self):
+        """Signals end of audio and returns the transcription response dict"""
+
+    def cancel(self):
+        """Stops without a result (upload aborted before finish())"""
+        self._header = None
@@ -0,0 +1,34 @@
+from django.conf import settings
+
+from ..clients import ai_clients
+from .base import LLMBackend
+
+
+class GeminiLLMBackend(LLMBackend):
+    """Google Gemini via the shared client registry"""
+    client_name = 'gemini'
+
+    @property
+    def model(self):
+        return settings.GEMINI_MODEL
+
+    def generate(self, prompt):
+        model = ai_clients.get(self.client_name)
+        try:
+            response = model.generate_content(prompt)
+        except Exception:
+            ai_clients.report_failure(self.client_name)
+            raise
+        ai_clients.report_success(self.client_name)
+        return response.text
+
+    def stream(self, prompt):
+        model = ai_clients.get(self.client_name)
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
+        except Exception:
+            ai_clients.report_failure(self.client_name)
+            raise
+        ai_clients.report_success(self.client_name)
@@ -0,0 +1,136 @@
+import hashlib
+import random
+import threading
+import time
+
+from .base import AIBackendError, LLMBackend, SentimentBackend, SpeechBackend, StreamingTranscriber
+
+# Keyword lexicon for the offline sentiment stand-in
+POSITIVE_WORDS = {'good', 'great', 'happy', 'better', 'fine', 'well', 'thanks', 'thank', 'love', 'glad', 'morning'}
+NEGATIVE_WORDS = {'pain', 'sad', 'bad', 'tired', 'hurt', 'hurts', 'dizzy', 'lonely', 'worse', 'sick', 'scared', 'ache'}
+
+LOCAL_REPLIES = (
+    "Thank you for telling me. How are you feeling otherwise today?",
+    "That sounds important. Please remember to take your medication on time.",
+    "I'm here for you. If anything feels serious, please call your doctor.",
+    "Good to hear from you! Have you had some water and a little walk today?",
+)
+
+
+class LocalBackendMixin:
+    """
+    Deterministic, in-process stand-in for a vendor API.
+    latency_ms / jitter simulate network time, failure_rate injects errors
+    (AIBackendError), so the Django tier can be load-tested without vendors.
+    """
+    def __init__(self, latency_ms=0, jitter=0.0, failure_rate=0.0, seed=0):
+        self.latency_ms = float(latency_ms)
+        self.jitter = float(jitter)
+        self.failure_rate = float(failure_rate)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def simulate_call(self, latency_ms=None):
+        with self._rng_lock:
+            factor = 1 + self._rng.uniform(-self.jitter, self.jitter)
+            failed = self._rng.random() < self.failure_rate
+        delay = (self.latency_ms if latency_ms is None else latency_ms) * factor
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if failed:
+            raise AIBackendError(f"{type(self).__name__}: injected failure")
+
+
+class LocalLLMBackend(LocalBackendMixin, LLMBackend):
+    """Picks a canned reply from a hash of the prompt (same prompt, same reply)"""
+    def __init__(self, tokens_per_second=50, **kwargs):
+        super().__init__(**kwargs)
+        self.tokens_per_second = float(tokens_per_second)
+
+    def reply_for(self, prompt):
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        return LOCAL_REPLIES[digest[0] % len(LOCAL_REPLIES)]
+
+    def generate(self, prompt):
+        self.simulate_call()
+        return self.reply_for(prompt)
+
+    def stream(self, prompt):
+        # Latency is time-to-first-token, then words arrive at tokens_per_second
+        self.simulate_call()
+        words = self.reply_for(prompt).split(' ')
+        for index, word in enumerate(words):
+            if index and self.tokens_per_second > 0:
+                time.sleep(1 / self.tokens_per_second)
+            yield word if index == len(words) - 1 else word + ' '
+
+
+class LocalSentimentBackend(LocalBackendMixin, SentimentBackend):
+    """Counts positive vs negative keywords; one simulated call per batch"""
+    def analyze(self, texts):
+        self.simulate_call()
+        return [self.sentiment_for(text) for text in texts]
+
+    def sentiment_for(self, text):
+        words = {word.strip('.,!?').lower() for word in text.split()}
+        score = len(words & POSITIVE_WORDS) - len(words & NEGATIVE_WORDS)
+        if score > 0:
+            return 'positive'
+        elif score < 0:
+            return 'negative'
+        return 'neutral'
+
+
+class LocalSpeechBackend(LocalBackendMixin, SpeechBackend):
+    """Returns one placeholder segment per segment_seconds of PCM audio"""
+    def __init__(self, segment_seconds=5, **kwargs):
+        super().__init__(**kwargs)
+        self.segment_seconds = float(segment_seconds)
+
+    def create_transcriber(self):
+        return LocalTranscriber(self)
+
+
+class LocalTranscriber(StreamingTranscriber):
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+        self._bytes_per_second = None
+        self._pcm_bytes = 0
+
+    def start(self, stream_format):
+        stream_format = stream_format or {'samples_per_second': 16000, 'bits_per_sample': 16, 'channels': 1}
+        self._bytes_per_second = (
+            stream_format['samples_per_second'] * stream_format['bits_per_sample'] // 8 * stream_format['channels']
+        )
+
+    def write_audio(self, chunk):
+        self._pcm_bytes += len(chunk)
+
+    def finish(self):
+        if not self.started and not self.start_headerless():
+            return {"status": "error", "message": "Empty audio file"}
+        try:
+            self.backend.simulate_call()
+        except AIBackendError as e:
+            return {"status": "error", "message": f"Canceled: {e}"}
+
+        duration = self._pcm_bytes / self._bytes_per_second if self._bytes_per_second else 0
+        if duration <= 0:
+            return {"status": "error", "message": "No speech could be recognized"}
+
+        segments = []
+        offset = 0.0
+        while offset < duration:
+            length = min(self.backend.segment_seconds, duration - offset)
+            segments.append({
+                "text": f"Local transcript segment {len(segments) + 1}.",
+                "offset_seconds": round(offset, 2),
+                "duration_seconds": round(length, 2),
+            })
+            offset += self.backend.segment_seconds
+        return {
+            "status": "success",
+            "transcript": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+        }
@@ -0,0 +1,367 @@
+"""
+Call policies for outbound AI calls.
+
+Every backend returned by get_backend() is wrapped so each call runs under
+its kind's policy (settings.AI_CALL_POLICIES):
+
+- deadline: the caller waits at most this long overall, retries included.
+  A hung SDK call cannot be interrupted, but it no longer holds the caller.
+- retries: jittered exponential backoff ("full jitter") within the deadline.
+- circuit breaker: after failure_threshold consecutive failures calls fail
+  fast for reset_timeout seconds, then a single trial call decides whether
+  it closes. Only retryable errors count as failures: a rejected request
+  (e.g. a safety-blocked reply raising ValueError) says nothing about the
+  vendor's health.
+- bulkhead: at most max_concurrency calls in flight per vendor, counting
+  abandoned ones that are still running; extra calls fail fast.
+- hedging (optional): if an idempotent attempt is slower than hedge_after,
+  a second one is started and the first success wins.
+
+Failures surface as AIBackendError subclasses, so existing fallbacks apply.
+"""
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .base import AIBackendError
+
+
+class CircuitOpenError(AIBackendError):
+    """The vendor is failing; the call was not attempted"""
+
+
+class BulkheadFullError(AIBackendError):
+    """Too many calls to this vendor are already in flight"""
+
+
+class DeadlineExceededError(AIBackendError):
+    """No result within the policy deadline"""
+
+
+# Caller bugs, rejected requests and local overload, not vendor trouble:
+# never retried and never counted by the circuit breaker
+NON_RETRYABLE = (TypeError, ValueError, KeyError, CircuitOpenError, BulkheadFullError)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        False if the call must fail fast, 'trial' for the one call let through
+        while half-open (pass it back to release()), True otherwise.
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state, self._trial = 'half_open', False
+            if self.state == 'half_open' and not self._trial:
+                self._trial = True
+                return 'trial'
+            return False
+
+    def release(self, ticket):
+        """The call ended without a verdict on the vendor; a trial slot is freed"""
+        if ticket == 'trial':
+            with self._lock:
+                self._trial = False
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self._trial = 'closed', 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state, self.opened_at, self._trial = 'open', time.monotonic(), False
+
+
+class CallPolicy:
+    def __init__(self, name, deadline, retries=2, backoff=0.2, failure_threshold=5, reset_timeout=30,
+                 max_concurrency=16, hedge_after=None):
+        self.name = name
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self.hedge_after = hedge_after
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.stats = {'calls': 0, 'failures': 0, 'retries': 0, 'timeouts': 0, 'rejected': 0, 'hedges': 0}
+        self._reset()
+
+    def _reset(self):
+        # Threads and locks do not survive fork; the child builds its own
+        self._pid = os.getpid()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix=f'ai-{self.name}')
+
+    def _check_fork(self):
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _admit(self):
+        """Breaker ticket for a new call; raises CircuitOpenError while open"""
+        ticket = self.breaker.allow()
+        if not ticket:
+            self._count('rejected')
+            raise CircuitOpenError(f"{self.name}: circuit open after repeated failures")
+        return ticket
+
+    def _submit(self, func, *args):
+        """Starts func in the vendor's pool, holding a bulkhead slot until it really finishes"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise BulkheadFullError(f"{self.name}: {self.max_concurrency} calls already in flight")
+        with self._lock:
+            self._in_flight += 1
+
+        def release(_):
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(release)
+        return future
+
+    def _attempt(self, func, args, timeout, hedge):
+        futures = [self._submit(func, *args)]
+        start = time.monotonic()
+        if hedge and self.hedge_after and self.hedge_after < timeout:
+            done, _ = wait(futures, timeout=self.hedge_after)
+            if not done:
+                try:
+                    futures.append(self._submit(func, *args))
+                    self._count('hedges')
+                except BulkheadFullError:
+                    pass # No spare capacity; keep waiting on the first attempt
+
+        error = None
+        pending = set(futures)
+        while pending:
+            remaining = timeout - (time.monotonic() - start)
+            done, pending = wait(pending, timeout=max(0, remaining), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        if error is not None and not pending:
+            raise error
+        self._count('timeouts')
+        raise DeadlineExceededError(f"{self.name}: no response within {timeout:.1f}s")
+
+    def _backoff(self, attempt, deadline_at):
+        delay = random.uniform(0, self.backoff * 2 ** attempt)
+        remaining = deadline_at - time.monotonic()
+        if remaining <= delay:
+            return False
+        time.sleep(delay)
+        return True
+
+    def call(self, func, *args, hedge=False):
+        """Runs func(*args) under the policy; raises an AIBackendError subclass on failure"""
+        self._check_fork()
+        self._count('calls')
+        ticket = self._admit()
+        settled = False
+        try:
+            deadline_at = time.monotonic() + self.deadline
+            attempt = 0
+            while True:
+                try:
+                    result = self._attempt(func, args, deadline_at - time.monotonic(), hedge)
+                except NON_RETRYABLE:
+                    raise
+                except Exception:
+                    self._count('failures')
+                    settled = True
+                    self.breaker.record_failure()
+                    if attempt >= self.retries:
+                        raise
+                    ticket = self.breaker.allow() # The breaker may have opened meanwhile
+                    settled = not ticket
+                    if not ticket or not self._backoff(attempt, deadline_at):
+                        raise
+                    attempt += 1
+                    self._count('retries')
+                    continue
+                settled = True
+                self.breaker.record_success()
+                return result
+        finally:
+            if not settled:
+                self.breaker.release(ticket)
+
+    def stream(self, make_stream):
+        """
+        Iterates make_stream() under the policy. The deadline applies to each
+        wait for the next piece; an attempt that fails before yielding anything
+        is retried, one that fails part-way through is not.
+        """
+        self._check_fork()
+        self._count('calls')
+        ticket = self._admit()
+        settled = False
+        try:
+            attempt = 0
+            while True:
+                pieces = queue.Queue()
+
+                def pump():
+                    try:
+                        for piece in make_stream():
+                            pieces.put(('piece', piece))
+                        pieces.put(('done', None))
+                    except Exception as e:
+                        pieces.put(('error', e))
+
+                self._submit(pump)
+                started = False
+                deadline_at = time.monotonic() + self.deadline
+                try:
+                    while True:
+                        try:
+                            kind, value = pieces.get(timeout=self.deadline)
+                        except queue.Empty:
+                            self._count('timeouts')
+                            raise DeadlineExceededError(f"{self.name}: stream stalled for {self.deadline:.1f}s")
+                        if kind == 'error':
+                            raise value
+                        if kind == 'done':
+                            settled = True
+                            self.breaker.record_success()
+                            return
+                        started = True
+                        yield value
+                except NON_RETRYABLE:
+                    raise
+                except Exception:
+                    self._count('failures')
+                    settled = True
+                    self.breaker.record_failure()
+                    if started or attempt >= self.retries:
+                        raise
+                    ticket = self.breaker.allow()
+                    settled = not ticket
+                    if not ticket or not self._backoff(attempt, deadline_at):
+                        raise
+                    attempt += 1
+                    self._count('retries')
+        finally:
+            # Also runs when the consumer stops iterating early (GeneratorExit)
+            if not settled:
+                self.breaker.release(ticket)
+
+    def health(self):
+        with self._lock:
+            stats = dict(self.stats, in_flight=self._in_flight)
+        return dict(stats, state=self.breaker.state, consecutive_failures=self.breaker.failures,
+                    max_concurrency=self.max_concurrency)
+
+
+# ==========================================
+# BACKEND WRAPPERS
+# ==========================================
+
+class PolicyBackend:
+    """Base for wrappers; anything not overridden goes to the real backend"""
+    def __init__(self, inner, policy):
+        self.inner = inner
+        self.policy = policy
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+class PolicyLLMBackend(PolicyBackend):
+    def generate(self, prompt):
+        return self.policy.call(self.inner.generate, prompt, hedge=True)
+
+    def stream(self, prompt):
+        return self.policy.stream(lambda: self.inner.stream(prompt))
+
+
+class PolicySentimentBackend(PolicyBackend):
+    def analyze(self, texts):
+        return self.policy.call(self.inner.analyze, texts, hedge=True)
+
+
+class PolicySpeechBackend(PolicyBackend):
+    """
+    Transcribers are fed by the upload as it arrives and bounded by
+    TRANSCRIPTION_TIMEOUT, so only the circuit breaker applies here.
+    """
+    def create_transcriber(self):
+        self.policy._check_fork()
+        ticket = self.policy._admit()
+        try:
+            inner = self.inner.create_transcriber()
+        except BaseException:
+            self.policy.breaker.release(ticket)
+            raise
+        return PolicyTranscriber(inner, self.policy, ticket)
+
+
+class PolicyTranscriber:
+    def __init__(self, inner, policy, ticket):
+        self.inner = inner
+        self.policy = policy
+        self.ticket = ticket
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def finish(self):
+        self.policy._count('calls')
+        try:
+            result = self.inner.finish()
+        except NON_RETRYABLE:
+            self.policy.breaker.release(self.ticket)
+            raise
+        except Exception:
+            self.policy._count('failures')
+            self.policy.breaker.record_failure()
+            raise
+        # Vendor-side cancellations count against the breaker; bad audio does not
+        if result.get('status') == 'error' and str(result.get('message', '')).startswith('Canceled'):
+            self.policy._count('failures')
+            self.policy.breaker.record_failure()
+        else:
+            self.policy.breaker.record_success()
+        return result
+
+    def cancel(self):
+        self.policy.breaker.release(self.ticket)
+        self.inner.cancel()
+
+
+WRAPPERS = {
+    'llm': PolicyLLMBackend,
+    'sentiment': PolicySentimentBackend,
+    'speech': PolicySpeechBackend,
+}
+
+
+def with_policy(kind, backend, options):
+    """Wraps a backend in its call policy"""
+    return WRAPPERS[kind](backend, CallPolicy(kind, **options))
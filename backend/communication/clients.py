@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+
+
+# ==========================================
+# 1. CLIENT FACTORIES
+# ==========================================
+# AI SDKs are imported inside the factories so a worker only pays their
+# import time and memory once it actually serves AI traffic.
+
+def _build_gemini():
+    import google.generativeai as genai
+
+    # configure() resets the SDK's cached transport, so it must only run once
+    genai.configure(api_key=settings.GOOGLE_API_KEY)
+    return genai.GenerativeModel(settings.GEMINI_MODEL)
+
+def _build_text_analytics():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from azure.ai.textanalytics import TextAnalyticsClient
+    from azure.core.credentials import AzureKeyCredential
+    from azure.core.pipeline.transport import RequestsTransport
+
+    # Share one pooled HTTP session for all sentiment calls in this worker
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.AI_HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    return TextAnalyticsClient(
+        endpoint=settings.AZURE_LANGUAGE_ENDPOINT,
+        credential=AzureKeyCredential(settings.AZURE_LANGUAGE_KEY),
+        transport=RequestsTransport(session=session, session_owner=True),
+    )
+
+def _build_speech_config():
+    import azure.cognitiveservices.speech as speechsdk
+
+    return speechsdk.SpeechConfig(
+        subscription=settings.AZURE_SPEECH_KEY,
+        region=settings.AZURE_SPEECH_REGION
+    )
+
+FACTORIES = {
+    'gemini': _build_gemini,
+    'text_analytics': _build_text_analytics,
+    'speech': _build_speech_config,
+}
+
+
+# ==========================================
+# 2. REGISTRY
+# ==========================================
+
+class AIClientRegistry:
+    """
+    Process-wide cache of long-lived AI SDK clients.
+    Clients are built lazily on first use, shared by all threads of a worker,
+    and dropped (without closing the parent's sockets) after a fork.
+    """
+    def __init__(self, factories):
+        self._factories = factories
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._stats = {}
+        self._pid = os.getpid()
+
+    def get(self, name):
+        """Returns the client for `name`, building it on first use"""
+        self._check_fork()
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = self._factories[name]()
+                self._clients[name] = client
+                self._stats[name] = {'created_at': time.time(), 'failures': 0}
+            return client
+
+    def report_success(self, name):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats:
+                stats['failures'] = 0
+
+    def report_failure(self, name):
+        """Resets a client after too many consecutive failures (stale connections etc.)"""
+        with self._lock:
+            stats = self._stats.get(name)
+            if not stats:
+                return
+            stats['failures'] += 1
+            failures = stats['failures']
+            if failures < settings.AI_CLIENT_MAX_FAILURES:
+                return
+            stats['failures'] = 0 # Only one of the failing threads resets
+        print(f"Resetting AI client '{name}' after {failures} failures")
+        self.reset(name)
+
+    def reset(self, name=None):
+        """Closes and drops one client (or all), so the next call rebuilds it"""
+        with self._lock:
+            names = [name] if name else list(self._clients)
+            for key in names:
+                client = self._clients.pop(key, None)
+                self._stats.pop(key, None)
+                close = getattr(client, 'close', None)
+                if callable(close):
+                    try:
+                        close()
+                    except Exception as e:
+                        print(f"Error closing AI client '{key}': {e}")
+
+    def health(self):
+        """Snapshot of which clients are live in this worker"""
+        now = time.time()
+        with self._lock:
+            live = set(self._clients)
+            stats = {name: dict(values) for name, values in self._stats.items()}
+        return {
+            name: {
+                'initialised': name in live,
+                'age_seconds': round(now - stats[name]['created_at'], 1) if name in stats else None,
+                'consecutive_failures': stats.get(name, {}).get('failures', 0),
+            }
+            for name in self._factories
+        }
+
+    def _after_fork(self):
+        # The child must not reuse (or close) connections owned by the parent
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._stats = {}
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        if os.getpid() != self._pid:
+            self._after_fork()
+
+
+ai_clients = AIClientRegistry(FACTORIES)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=ai_clients._after_fork)
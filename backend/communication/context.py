@@ -0,0 +1,127 @@
+"""
+Conversation context for chat prompts.
+
+Each prompt carries a bounded window of the most recent turns (newest first
+until CHAT_CONTEXT_TOKEN_BUDGET is spent) plus a rolling summary of older
+turns. Only the tail of the history is read (chat_user_timestamp_idx), and
+the summary is a single indexed row, so a turn costs the same however long
+the user has been chatting. Turns leaving the window are folded into the
+summary by a background job, never on the request path.
+"""
+from django.conf import settings
+
+from carebridge.caching import get_cache
+from jobs.queue import enqueue
+
+from .models import ChatMessage, ConversationSummary
+
+# Rough token estimate; good enough for budgeting across LLM vendors
+CHARS_PER_TOKEN = 4
+# Turns folded into the summary by one refresh (one LLM call)
+MAX_FOLD_MESSAGES = 200
+
+PENDING_KEY = 'chat-summary-pending:{}'
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def format_turn(is_user_sender, content):
+    return f"{'User' if is_user_sender else 'CareAI'}: {content}"
+
+
+def _recent_messages(user_id, limit, offset=0):
+    """Newest first: (id, content, is_user_sender)"""
+    return list(
+        ChatMessage.objects.filter(user_id=user_id).order_by('-timestamp', '-id')
+        .values_list('id', 'content', 'is_user_sender')[offset:offset + limit]
+    )
+
+
+# ==========================================
+# 1. ROLLING SUMMARY
+# ==========================================
+
+def get_summary(user_id):
+    """
+    (summary text, watermark message id). Read from the database every time:
+    the refresh runs in a job worker, and a per-process cache here would
+    never see its result.
+    """
+    row = ConversationSummary.objects.filter(user_id=user_id).values_list('summary', 'last_message_id').first()
+    return row or ('', 0)
+
+
+def refresh_summary(user_id, keep):
+    """
+    Folds turns older than the newest `keep` (still in the prompt window)
+    and newer than the watermark into the conversation summary.
+    """
+    from .views import generate_gemini_text # views imports this module
+
+    try:
+        summary, watermark = get_summary(user_id)
+        older = [row for row in _recent_messages(user_id, MAX_FOLD_MESSAGES, offset=keep) if row[0] > watermark]
+        if not older:
+            return {"folded": 0}
+        older.reverse()
+        transcript = "\n".join(format_turn(is_user, content) for _, content, is_user in older)
+        prompt = (
+            "You keep a short memory of an ongoing conversation between CareAI, a medical assistant, "
+            "and a senior patient. Update the memory with the new messages below. Keep only what helps "
+            "future replies: names, family, symptoms, medications, routines, preferences and plans. "
+            "Write at most 150 words.\n\n"
+            f"Current memory:\n{summary or '(empty)'}\n\n"
+            f"New messages:\n{transcript}"
+        )
+        summary = generate_gemini_text(prompt, cache=False)
+        watermark = max(row[0] for row in older)
+        ConversationSummary.objects.update_or_create(
+            user_id=user_id, defaults={"summary": summary, "last_message_id": watermark}
+        )
+        return {"folded": len(older), "last_message_id": watermark}
+    finally:
+        get_cache().delete(PENDING_KEY.format(user_id))
+
+
+def _schedule_refresh(user_id, keep):
+    # add() is atomic: one queued refresh per user at a time
+    if get_cache().add(PENDING_KEY.format(user_id), 1, timeout=settings.JOB_VISIBILITY_TIMEOUT):
+        enqueue('communication.conversation_summary', user_id=user_id, keep=keep)
+
+
+# ==========================================
+# 2. PROMPT WINDOW
+# ==========================================
+
+def build_context(user_id, text_input):
+    """
+    Returns (summary, recent turns oldest first) for the user's next prompt.
+    The user's current message is excluded (the caller appends it). Schedules
+    a summary refresh once CHAT_SUMMARY_BATCH turns have left the window.
+    """
+    summary, watermark = get_summary(user_id)
+    rows = _recent_messages(user_id, settings.CHAT_CONTEXT_MAX_TURNS + settings.CHAT_SUMMARY_BATCH + 1)
+    # The message being answered is usually already saved as the newest row
+    skipped = 1 if rows and rows[0][2] and rows[0][1] == text_input else 0
+    rows = rows[skipped:]
+
+    budget = settings.CHAT_CONTEXT_TOKEN_BUDGET
+    window = []
+    for row in rows[:settings.CHAT_CONTEXT_MAX_TURNS]:
+        cost = estimate_tokens(row[1])
+        if cost > budget:
+            break
+        budget -= cost
+        window.append(row)
+
+    unsummarised = [row for row in rows[len(window):] if row[0] > watermark]
+    if len(unsummarised) >= settings.CHAT_SUMMARY_BATCH:
+        try:
+            _schedule_refresh(user_id, keep=skipped + len(window))
+        except Exception as e:
+            print(f"Conversation summary Error: {e}")
+
+    window.reverse()
+    return summary, [format_turn(is_user, content) for _, content, is_user in window]
@@ -0,0 +1,113 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from communication import views
+from communication.ai_cache import ai_cache
+from communication.backends import reset_backends
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the chat AI fan-out against the local AI backends: the sequential "
+        "WSGI path (ChatAPIView) vs the concurrent ASGI path (AsyncChatAPIView)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--turns', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=20, help="Simultaneous chat turns")
+        parser.add_argument('--llm-ms', type=float, default=600, help="Mean stub Gemini latency")
+        parser.add_argument('--mood-ms', type=float, default=250, help="Mean stub Azure latency")
+        parser.add_argument('--jitter', type=float, default=0.3, help="Latency jitter as a fraction of the mean")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **opts):
+        local = 'communication.backends.local.'
+        common = {'jitter': opts['jitter'], 'seed': opts['seed']}
+        backends = {
+            'llm': {'BACKEND': local + 'LocalLLMBackend', 'OPTIONS': dict(common, latency_ms=opts['llm_ms'])},
+            'sentiment': {'BACKEND': local + 'LocalSentimentBackend', 'OPTIONS': dict(common, latency_ms=opts['mood_ms'])},
+            'speech': {'BACKEND': local + 'LocalSpeechBackend', 'OPTIONS': common},
+        }
+
+        # Room in every vendor bulkhead for all simulated callers
+        policies = {
+            kind: dict(policy, max_concurrency=max(policy['max_concurrency'], opts['concurrency']))
+            for kind, policy in settings.AI_CALL_POLICIES.items()
+        }
+        with override_settings(AI_BACKENDS=backends, AI_CALL_POLICIES=policies):
+            reset_backends()
+            try:
+                # Both runs send the same prompts; neither may answer from the AI cache
+                ai_cache.clear()
+                sync_latencies, sync_wall, sync_cpu = self.run_sync(opts)
+                ai_cache.clear()
+                async_latencies, async_wall, async_cpu = asyncio.run(self.run_async(opts))
+            finally:
+                reset_backends()
+
+        turns = opts['turns']
+        self.stdout.write(f"{turns} turns, concurrency {opts['concurrency']}, "
+                          f"stub latency llm={opts['llm_ms']}ms mood={opts['mood_ms']}ms")
+        self.report(
+            "sync (sequential, WSGI)", sync_latencies, sync_wall,
+            workers=opts['concurrency'], cpu=sync_cpu
+        )
+        self.report(
+            "async (concurrent, ASGI)", async_latencies, async_wall,
+            workers=1, cpu=async_cpu
+        )
+
+    def run_sync(self, opts):
+        """One WSGI worker thread per in-flight turn, Gemini then Azure"""
+        def turn(i):
+            start = time.perf_counter()
+            views.get_gemini_response(f"message {i}")
+            views.analyze_mood_azure(f"message {i}")
+            return time.perf_counter() - start
+
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=opts['concurrency']) as pool:
+            latencies = list(pool.map(turn, range(opts['turns'])))
+        return latencies, time.perf_counter() - start, time.process_time() - cpu_start
+
+    async def run_async(self, opts):
+        """All turns on a single event loop, each fanning out concurrently"""
+        limit = asyncio.Semaphore(opts['concurrency'])
+
+        async def turn(i):
+            async with limit:
+                start = time.perf_counter()
+                await views.get_chat_ai_results(f"message {i}")
+                return time.perf_counter() - start
+
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(turn(i) for i in range(opts['turns'])))
+        return latencies, time.perf_counter() - start, time.process_time() - cpu_start
+
+    def report(self, label, latencies, wall, workers, cpu):
+        """cpu is process CPU time over the run (all threads), so both paths are measured alike"""
+        ms = [value * 1000 for value in latencies]
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        self.stdout.write(
+            f"  p50 {percentile(ms, 50):.0f}ms  p99 {percentile(ms, 99):.0f}ms  "
+            f"throughput {len(ms) / wall:.1f} turns/s"
+        )
+        self.stdout.write(
+            f"  request workers held: {workers}  "
+            f"CPU per turn: {cpu / len(ms) * 1000:.1f}ms  "
+            f"CPU utilisation: {cpu / wall * 100:.0f}% of one core"
+        )
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Heavy vendor SDKs that should only load in workers serving AI traffic
+AI_SDK_MODULES = [
+    'google.generativeai',
+    'azure.ai.textanalytics',
+    'azure.cognitiveservices.speech',
+]
+
+# Runs in a fresh interpreter: boots Django like a worker does, then imports
+# the requested module and reports the time and resident memory it added.
+MEASURE_SCRIPT = r'''
+import importlib, json, os, sys, time, warnings
+warnings.simplefilter('ignore')
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+    except ImportError:
+        return None
+
+def measure(func):
+    rss, start = rss_mb(), time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000
+    after = rss_mb()
+    return {'ms': elapsed, 'rss_mb': None if rss is None else after - rss, 'total_rss_mb': after}
+
+def boot():
+    import django
+    from django.conf import settings
+    django.setup()
+    importlib.import_module(settings.ROOT_URLCONF)
+
+module = sys.argv[1]
+startup = measure(boot)
+if module == '-':
+    sdks = json.loads(sys.argv[2])
+    startup['loaded'] = [name for name in sdks if name in sys.modules]
+    print(json.dumps(startup))
+else:
+    print(json.dumps(measure(lambda: importlib.import_module(module))))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports worker startup cost (Django + URLconf) and the extra import time and "
+        "resident memory of each heavy AI SDK, each measured in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', action='append', default=[], help="Extra module to measure (repeatable)")
+
+    def run_probe(self, *args):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'carebridge.settings'))
+        completed = subprocess.run(
+            [sys.executable, '-c', MEASURE_SCRIPT, *args],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, env=env
+        )
+        if completed.returncode != 0:
+            return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'}
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def format_row(self, label, data):
+        if 'error' in data:
+            return f"  {label:<40} {data['error']}"
+        rss = 'n/a' if data['rss_mb'] is None else f"+{data['rss_mb']:.1f} MB"
+        return f"  {label:<40} {data['ms']:8.0f} ms   {rss}"
+
+    def handle(self, *args, **opts):
+        startup = self.run_probe('-', json.dumps(AI_SDK_MODULES))
+        self.stdout.write(self.style.MIGRATE_HEADING("Worker startup (django.setup + URLconf)"))
+        self.stdout.write(self.format_row('startup', startup))
+        if 'error' not in startup:
+            if startup['total_rss_mb'] is not None:
+                self.stdout.write(f"  resident memory after startup: {startup['total_rss_mb']:.1f} MB")
+            loaded = startup['loaded']
+            if loaded:
+                self.stdout.write(self.style.WARNING(f"  AI SDKs loaded eagerly at startup: {', '.join(loaded)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS("  No AI SDKs loaded at startup (lazy)"))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Extra cost on first use"))
+        for module in AI_SDK_MODULES + opts['module']:
+            self.stdout.write(self.format_row(module, self.run_probe(module)))
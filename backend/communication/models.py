@@ -36,14 +36,55 @@ class ChatMessage(models.Model):
     Care AI chat history.
     Source: message_model.dart / care_ai_screen.dart
     """
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chat_messages')
+    # Indexed by chat_user_timestamp_idx (user first), so no separate FK index
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chat_messages', db_index=False)
     content = models.TextField()
     is_user_sender = models.BooleanField(default=True, help_text="True if sent by user, False if sent by AI")
     timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # Keyset pagination of a user's history
+            models.Index(fields=['user', 'timestamp'], name='chat_user_timestamp_idx'),
+            # Clinical summary: a patient's own messages after the watermark id.
+            # Partial, because SQLite cannot match a bare boolean filter to an index column
+            models.Index(
+                fields=['user', 'id'], condition=models.Q(is_user_sender=True), name='chat_user_sender_id_idx'
+            ),
+        ]
 
     def __str__(self):
         sender = "User" if self.is_user_sender else "AI"
-        return f"{sender}: {self.content[:30]}..."
\ No newline at end of file
+        return f"{sender}: {self.content[:30]}..."
+
+
+class ClinicalSummary(models.Model):
+    """
+    Rolling clinical note per patient for the doctor view.
+    Built incrementally: only messages after the watermark are summarised,
+    on top of the previous note.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='clinical_summary')
+    summary = models.TextField()
+    last_message_id = models.BigIntegerField(default=0, help_text="Watermark: last ChatMessage id included in the summary")
+    message_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Summary for {self.user.username} (up to message {self.last_message_id})"
+
+
+class ConversationSummary(models.Model):
+    """
+    Rolling summary of a user's chat with the AI, used as long-term memory in
+    chat prompts. Turns older than the recent-context window are folded in
+    (in the background) up to the watermark.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='conversation_summary')
+    summary = models.TextField()
+    last_message_id = models.BigIntegerField(default=0, help_text="Watermark: last ChatMessage id included in the summary")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Conversation summary for {self.user.username} (up to message {self.last_message_id})"
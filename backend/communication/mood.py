@@ -0,0 +1,158 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+
+from patients.snapshots import snapshot_writer
+from .ai_cache import ai_cache
+from .backends import get_backend
+
+FALLBACK_MOOD = 'neutral'
+
+
+def sentiment_to_mood(sentiment):
+    """Map Azure Sentiment to App Moods ('happy', 'sad', 'neutral')"""
+    if sentiment == 'positive':
+        return 'happy'
+    elif sentiment == 'negative':
+        return 'sad'
+    return 'neutral'
+
+
+class MoodBatcher:
+    """
+    Coalesces concurrent mood-detection requests from this worker into
+    batched sentiment backend calls (Azure analyze_sentiment by default).
+
+    A background thread waits for the first request, then keeps collecting
+    until the batch is full or max_wait_ms has passed, sends one call, and
+    resolves every caller's future. A request with no other caller waiting
+    is sent at once, so batching adds no latency without concurrency.
+
+    Patient moods go through the snapshot writer (patients.snapshots)
+    instead of a get()/save() per message.
+    """
+    def __init__(self, max_batch_size, max_wait_ms, max_in_flight):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self.stats = {'requests': 0, 'batches': 0}
+        self._reset()
+
+    def _reset(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._waiting = 0 # Callers whose mood has not resolved yet
+        self._senders = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='mood-batch')
+
+    def submit(self, text_input, user_id=None):
+        """
+        Queues a text for analysis; returns a Future resolving to a mood.
+        Texts seen recently (after normalisation) resolve at once from the AI cache.
+        """
+        future = Future()
+        mood = ai_cache.get(ai_cache.key('sentiment', get_backend('sentiment'), text_input))
+        if mood is not None:
+            self._store_moods([(user_id, mood)])
+            future.set_result(mood)
+            return future
+        with self._lock:
+            self._waiting += 1
+        future.add_done_callback(self._resolved)
+        self._ensure_started()
+        self._queue.put((text_input, user_id, future))
+        return future
+
+    def _resolved(self, future):
+        with self._lock:
+            self._waiting -= 1
+
+    def detect(self, text_input, user_id=None):
+        """Blocking helper: mood for one text (FALLBACK_MOOD on timeout)"""
+        future = self.submit(text_input, user_id)
+        try:
+            return future.result(timeout=settings.AZURE_LANGUAGE_TIMEOUT + self.max_wait)
+        except FutureTimeout:
+            print("Azure Language Error: batched sentiment call timed out")
+            return FALLBACK_MOOD
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='mood-batcher', daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        """Blocks for the first item, then gathers more until full or timed out"""
+        batch = [self._queue.get()]
+        if self._waiting <= 1:
+            # Nobody to batch with: don't hold a lone request for max_wait
+            return batch
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            # Send from a small pool so one slow call does not hold up the next batch
+            self._senders.submit(self._process, batch)
+
+    def _process(self, batch):
+        try:
+            moods = self._analyze([text for text, _, _ in batch])
+
+            # Queue the profile updates, then answer the callers
+            self._store_moods([(user_id, mood) for (_, user_id, _), mood in zip(batch, moods)])
+
+            for (_, _, future), mood in zip(batch, moods):
+                if not future.done():
+                    future.set_result(mood)
+        except Exception as e:
+            print(f"Mood batch Error: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(FALLBACK_MOOD)
+
+    def _analyze(self, texts):
+        try:
+            backend = get_backend('sentiment')
+            sentiments = backend.analyze(texts)
+            for text, sentiment in zip(texts, sentiments):
+                if sentiment is not None:
+                    ai_cache.set(ai_cache.key('sentiment', backend, text), sentiment_to_mood(sentiment))
+            return [FALLBACK_MOOD if sentiment is None else sentiment_to_mood(sentiment) for sentiment in sentiments]
+        except Exception as e:
+            print(f"Azure Language Error: {e}")
+            return [FALLBACK_MOOD] * len(texts)
+
+    def _store_moods(self, user_moods):
+        # Later messages from the same user win; the snapshot writer skips
+        # unchanged moods and coalesces bursts into one UPDATE per patient
+        for user_id, mood in user_moods:
+            if user_id is not None:
+                snapshot_writer.update(user_id=user_id, current_mood=mood)
+
+
+mood_batcher = MoodBatcher(
+    settings.MOOD_BATCH_MAX_SIZE, settings.MOOD_BATCH_MAX_WAIT_MS, settings.MOOD_BATCH_MAX_IN_FLIGHT
+)
+
+if hasattr(os, 'register_at_fork'):
+    # The batcher thread does not survive fork; the child starts its own
+    os.register_at_fork(after_in_child=mood_batcher._reset)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from carebridge.caching import invalidate_tags
+
+from .models import ChatMessage, ClinicalSummary
+
+
+@receiver([post_save, post_delete], sender=ChatMessage)
+def chat_message_changed(sender, instance, **kwargs):
+    invalidate_tags(f'chat:{instance.user_id}')
+
+
+@receiver([post_save, post_delete], sender=ClinicalSummary)
+def clinical_summary_changed(sender, instance, **kwargs):
+    # A background catch-up changed the note the summary view serves
+    invalidate_tags(f'clinical-summary:{instance.user_id}')
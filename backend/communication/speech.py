@@ -0,0 +1,37 @@
+from django.core.files.uploadhandler import FileUploadHandler
+
+from .backends import get_backend
+
+
+def transcribe_chunks(chunks):
+    """Transcribes an iterable of audio byte chunks (e.g. a stored file's .chunks())"""
+    transcriber = get_backend('speech').create_transcriber()
+    for chunk in chunks:
+        transcriber.write(chunk)
+    return transcriber.finish()
+
+
+class SpeechUploadHandler(FileUploadHandler):
+    """
+    Upload handler that feeds one multipart file field directly into the
+    speech backend's transcriber as it is received. The file is never written to
+    disk or kept in memory, so it does not appear in request.FILES.
+    """
+    def __init__(self, request=None, target_field='audio'):
+        super().__init__(request)
+        self.target_field = target_field
+        self.transcriber = None
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        if field_name == self.target_field:
+            self.transcriber = get_backend('speech').create_transcriber()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.field_name == self.target_field:
+            self.transcriber.write(raw_data)
+            return None
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
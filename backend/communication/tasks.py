@@ -0,0 +1,34 @@
+from django.core.files.storage import default_storage
+
+from carebridge.caching import get_cache
+from jobs.registry import task
+from .views import CLINICAL_SUMMARY_PENDING_KEY, run_chat_turn, build_clinical_summary
+from .speech import transcribe_chunks
+from .context import refresh_summary
+
+
+@task('communication.chat_reply')
+def chat_reply(user_id, user_text):
+    return run_chat_turn(user_id, user_text)
+
+
+@task('communication.clinical_summary')
+def clinical_summary(user_id):
+    try:
+        return build_clinical_summary(user_id)
+    finally:
+        get_cache().delete(CLINICAL_SUMMARY_PENDING_KEY.format(user_id))
+
+
+@task('communication.transcribe')
+def transcribe(stored_name):
+    try:
+        with default_storage.open(stored_name) as audio_file:
+            return transcribe_chunks(audio_file.chunks())
+    finally:
+        default_storage.delete(stored_name)
+
+
+@task('communication.conversation_summary')
+def conversation_summary(user_id, keep):
+    return refresh_summary(user_id, keep)
@@ -1,11 +1,23 @@
 from django.urls import path
-from .views import ChatAPIView, CallTranscriptionView, ClinicalSummaryView # <--- Import this
+from .views import (
+    ChatAPIView, AsyncChatAPIView, ChatStreamView, CallTranscriptionView, ClinicalSummaryView, AIHealthView,
+    AICacheView, AIPolicyView,
+)
 
 urlpatterns = [
     path('chat/', ChatAPIView.as_view(), name='chat_api'),
+    path('chat/async/', AsyncChatAPIView.as_view(), name='chat_api_async'),
+    path('chat/stream/', ChatStreamView.as_view(), name='chat_stream'),
     path('chat/<int:user_id>/', ChatAPIView.as_view(), name='chat_history'),
     path('transcribe/', CallTranscriptionView.as_view(), name='transcribe_call'),
     
     # New Endpoint for Doctor
     path('summary/<int:user_id>/', ClinicalSummaryView.as_view(), name='clinical_summary'),
+
+    # Per-worker AI client status / reset hook
+    path('ai/health/', AIHealthView.as_view(), name='ai_health'),
+    # Per-worker AI call policies (circuit breakers, bulkheads)
+    path('ai/policies/', AIPolicyView.as_view(), name='ai_policies'),
+    # Per-worker AI response cache hit/miss stats / clear hook
+    path('ai/cache/', AICacheView.as_view(), name='ai_cache'),
 ]
\ No newline at end of file
@@ -1,73 +1,348 @@
-import os
-import gc
-import tempfile
+import re
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 from django.shortcuts import get_object_or_404
-from datetime import timedelta
-from django.utils import timezone
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 
 # Models & Serializers
-from .models import ChatMessage, CallLog
+from .models import ChatMessage, CallLog, ClinicalSummary
 from .serializers import ChatMessageSerializer
-from patients.models import PatientProfile
 from django.contrib.auth import get_user_model
+from carebridge.caching import cached_response, get_cache
+from carebridge.streaming import streaming_response
+from jobs.queue import enqueue
+from jobs.views import job_accepted_response
 
-# --- AI SDK Imports ---
-import google.generativeai as genai
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
-import azure.cognitiveservices.speech as speechsdk
+# --- AI Service Helpers ---
+from .backends import backend_policies, get_backend
+from .context import build_context
+from .ai_cache import ai_cache
+from .clients import ai_clients
+from .mood import mood_batcher, FALLBACK_MOOD
+from .speech import SpeechUploadHandler
 
 User = get_user_model()
 
+# Fallback used when an AI call fails or times out
+FALLBACK_AI_REPLY = "I'm having trouble connecting to the network right now, but I'm here for you."
+
+CLINICAL_SUMMARY_PENDING_KEY = 'clinical-summary-pending:{}'
+
+# A '+HH:MM' offset that arrived as ' HH:MM' because the '+' was not URL-encoded
+DECODED_PLUS_OFFSET_RE = re.compile(r' (\d{2}:?\d{2})$')
+
+# Threads that run the blocking AI SDK calls for the async chat path
+_ai_executor = None
+
 # ==========================================
 # 1. HELPER FUNCTIONS (AI Setup)
 # ==========================================
 
-def get_gemini_response(text_input):
-    """Interacts with Google Gemini Pro"""
+# Context prompt to make it behave like a medical assistant
+CHAT_SYSTEM_PROMPT = (
+    "You are CareAI, a compassionate medical assistant for seniors. "
+    "Keep responses short, encouraging, and easy to understand. "
+    "If the user mentions serious symptoms, advise them to call a doctor."
+)
+
+def build_chat_prompt(text_input, user_id=None):
+    """
+    System prompt + (with user_id) the conversation so far: a rolling summary
+    of older turns and a token-budgeted window of recent ones.
+    Returns (prompt, personalised); personalised prompts are never cached,
+    so for a user with any history every chat reply goes to the backend.
+    """
+    if user_id is None:
+        return f"{CHAT_SYSTEM_PROMPT}\nUser: {text_input}", False
+    summary, turns = build_context(user_id, text_input)
+    parts = [CHAT_SYSTEM_PROMPT]
+    if summary:
+        parts.append(f"What you remember about this patient:\n{summary}")
+    if turns:
+        parts.append("Recent conversation:\n" + "\n".join(turns))
+    parts.append(f"User: {text_input}")
+    return "\n\n".join(parts), bool(summary or turns)
+
+def generate_gemini_text(prompt, cache=True):
+    """
+    Raw LLM call through the configured backend (Gemini by default); raises on failure.
+    Identical (normalised) prompts are answered from the AI response cache;
+    pass cache=False for prompts carrying patient-specific context.
+    """
+    backend = get_backend('llm')
+    if not cache:
+        return backend.generate(prompt)
+    key = ai_cache.key('llm', backend, prompt)
+    text = ai_cache.get(key)
+    if text is None:
+        text = backend.generate(prompt)
+        ai_cache.set(key, text)
+    return text
+
+def complete_chat_prompt(prompt, cache=True):
+    """Chat reply for a built prompt, or the fallback reply on failure"""
     try:
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        model = genai.GenerativeModel('gemini-2.5-flash-lite')
-        
-        # Context prompt to make it behave like a medical assistant
-        system_prompt = (
-            "You are CareAI, a compassionate medical assistant for seniors. "
-            "Keep responses short, encouraging, and easy to understand. "
-            "If the user mentions serious symptoms, advise them to call a doctor."
-        )
-        
-        response = model.generate_content(f"{system_prompt}\nUser: {text_input}")
-        return response.text
+        return generate_gemini_text(prompt, cache=cache)
     except Exception as e:
         print(f"Gemini Error: {e}")
-        return "I'm having trouble connecting to the network right now, but I'm here for you."
+        return FALLBACK_AI_REPLY
 
-def analyze_mood_azure(text_input):
-    """Uses Azure Language Service to detect sentiment"""
+def _chat_prompt_or_plain(text_input, user_id):
     try:
-        endpoint = settings.AZURE_LANGUAGE_ENDPOINT
-        key = settings.AZURE_LANGUAGE_KEY
-        
-        credential = AzureKeyCredential(key)
-        client = TextAnalyticsClient(endpoint=endpoint, credential=credential)
-        
-        documents = [text_input]
-        response = client.analyze_sentiment(documents=documents)[0]
-        
-        # Map Azure Sentiment to App Moods ('happy', 'sad', 'neutral')
-        if response.sentiment == 'positive':
-            return 'happy'
-        elif response.sentiment == 'negative':
-            return 'sad'
-        else:
-            return 'neutral'
+        return build_chat_prompt(text_input, user_id)
     except Exception as e:
-        print(f"Azure Language Error: {e}")
-        return 'neutral' # Default fallback
+        print(f"Chat context Error: {e}")
+        return build_chat_prompt(text_input)
+
+def get_gemini_response(text_input, user_id=None):
+    """Interacts with Google Gemini Pro"""
+    prompt, personalised = _chat_prompt_or_plain(text_input, user_id)
+    return complete_chat_prompt(prompt, cache=not personalised)
+
+def stream_gemini_response(text_input, user_id=None):
+    """
+    Yields Gemini reply text as it is generated.
+    Falls back to the standard reply if the stream fails before any text
+    arrives; a failure part-way through is raised to the caller.
+    A cached reply is sent as one piece; a completed stream is cached.
+    """
+    prompt, personalised = _chat_prompt_or_plain(text_input, user_id)
+    backend = get_backend('llm')
+    key = None if personalised else ai_cache.key('llm', backend, prompt)
+    cached = ai_cache.get(key) if key else None
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    try:
+        for text in backend.stream(prompt):
+            parts.append(text)
+            yield text
+    except Exception as e:
+        print(f"Gemini Stream Error: {e}")
+        if parts:
+            raise
+        yield FALLBACK_AI_REPLY
+        return
+    if key:
+        ai_cache.set(key, "".join(parts))
+
+def analyze_mood_azure(text_input, user_id=None):
+    """
+    Uses Azure Language Service to detect sentiment.
+    Requests are micro-batched with other chat turns in this worker, and the
+    patient's current_mood is updated by the batcher when user_id is given.
+    """
+    return mood_batcher.detect(text_input, user_id)
+
+def get_ai_executor():
+    """Lazily creates the thread pool used for blocking AI SDK calls"""
+    global _ai_executor
+    if _ai_executor is None:
+        _ai_executor = ThreadPoolExecutor(
+            max_workers=settings.AI_MAX_THREADS,
+            thread_name_prefix='ai-call'
+        )
+    return _ai_executor
+
+async def _run_with_timeout(timeout, fallback, func, *args):
+    """
+    Runs a blocking AI helper in the AI thread pool with a deadline.
+    On timeout the await is cancelled and the fallback is returned; the
+    SDK call itself cannot be interrupted and finishes in the background.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(get_ai_executor(), func, *args),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        print(f"AI call timed out after {timeout}s: {func.__name__}")
+        return fallback
+
+async def get_chat_ai_results(text_input, user_id=None):
+    """
+    Runs Gemini reply generation and Azure mood detection concurrently,
+    so a chat turn costs max() of the two round-trips instead of sum().
+    If the request is cancelled (client disconnect) both calls are cancelled.
+    """
+    prompt, personalised = await sync_to_async(_chat_prompt_or_plain)(text_input, user_id)
+    return await asyncio.gather(
+        _run_with_timeout(settings.GEMINI_TIMEOUT, FALLBACK_AI_REPLY, complete_chat_prompt, prompt, not personalised),
+        _run_with_timeout(settings.AZURE_LANGUAGE_TIMEOUT, FALLBACK_MOOD, analyze_mood_azure, text_input, user_id),
+    )
+
+def save_ai_reply(user_id, ai_text):
+    """Saves the AI reply to the chat history"""
+    return ChatMessage.objects.create(
+        user_id=user_id,
+        content=ai_text,
+        is_user_sender=False
+    )
+
+def chat_response_data(ai_text, detected_mood, ai_msg):
+    """Response body shared by the sync and async chat endpoints"""
+    return {
+        "status": "success",
+        "ai_response": ai_text,
+        "detected_mood": detected_mood,
+        "data": ChatMessageSerializer(ai_msg).data
+    }
+
+def run_chat_turn(user_id, user_text):
+    """Blocking chat turn: Gemini reply, mood update, saved AI message"""
+    # 2. Get AI Response (Gemini), with the conversation so far as context
+    ai_text = get_gemini_response(user_text, user_id)
+
+    # 3. Analyze Mood (Azure) & Update Patient Profile
+    detected_mood = analyze_mood_azure(user_text, user_id)
+
+    # 4. Save AI Message to Database
+    ai_msg = save_ai_reply(user_id, ai_text)
+    return chat_response_data(ai_text, detected_mood, ai_msg)
+
+def _format_patient_logs(messages):
+    return "\n".join([f"- {msg.content} ({msg.timestamp.strftime('%Y-%m-%d %H:%M')})" for msg in messages])
+
+def build_clinical_summary(user_id, max_chunks=None):
+    """
+    Returns the patient's clinical note for the doctor.
+    The note is persisted per patient and only messages newer than its
+    watermark are sent to Gemini, folded into the previous note. When
+    nothing new was said the stored note is returned without an AI call.
+    With max_chunks, at most that many Gemini calls are made and the rest
+    of a long backlog is queued as a job ("pending": true). Raises if a
+    Gemini call fails.
+    """
+    existing = ClinicalSummary.objects.filter(user_id=user_id).first()
+    watermark = existing.last_message_id if existing else 0
+    summary = existing.summary if existing else None
+    message_count = existing.message_count if existing else 0
+
+    # 1. Fetch patient messages after the watermark
+    # Only summarize what the PATIENT said; the rolling note covers all history
+    chunk_size = settings.CLINICAL_SUMMARY_CHUNK_SIZE
+    new_messages = ChatMessage.objects.filter(
+        user_id=user_id,
+        is_user_sender=True,
+        id__gt=watermark
+    ).order_by('id').only('id', 'content', 'timestamp')
+    if max_chunks is not None:
+        new_messages = new_messages[:max_chunks * chunk_size + 1]
+    new_messages = list(new_messages)
+
+    if not new_messages:
+        if existing is None:
+            return {"summary": "No patient activity recorded recently."}
+        # Cache hit: nothing changed since the last summary
+        return {
+            "status": "success",
+            "patient_id": user_id,
+            "summary": summary,
+            "cached": True,
+            "updated_at": existing.updated_at.isoformat()
+        }
+
+    # 2. Fold new messages into the note, a bounded chunk at a time
+    pending = max_chunks is not None and len(new_messages) > max_chunks * chunk_size
+    if pending:
+        new_messages = new_messages[:max_chunks * chunk_size]
+    for start in range(0, len(new_messages), chunk_size):
+        chunk = new_messages[start:start + chunk_size]
+        logs_text = _format_patient_logs(chunk)
+
+        # 3. Create the Doctor Prompt
+        if summary is None:
+            prompt = (
+                f"You are an expert Medical Scribe. Summarize the following patient chat logs into a "
+                f"concise clinical note using standard medical terminology (SOAP format if possible). "
+                f"Highlight any symptoms, pain points, or mental health indicators.\n\n"
+                f"Patient Logs:\n{logs_text}"
+            )
+        else:
+            prompt = (
+                f"You are an expert Medical Scribe. Below is the current clinical note for a patient, "
+                f"followed by chat logs recorded since it was written. Update the note so it reflects "
+                f"the new information, keeping it concise and in standard medical terminology "
+                f"(SOAP format if possible). Highlight any new or changed symptoms, pain points, "
+                f"or mental health indicators.\n\n"
+                f"Current Note:\n{summary}\n\n"
+                f"New Patient Logs:\n{logs_text}"
+            )
+
+        # 4. Ask Gemini (raises on failure so the watermark is not advanced)
+        summary = generate_gemini_text(prompt, cache=False)
+        watermark = chunk[-1].id
+        message_count += len(chunk)
+
+        # 5. Persist after each chunk so progress survives a later failure
+        existing, _ = ClinicalSummary.objects.update_or_create(
+            user_id=user_id,
+            defaults={"summary": summary, "last_message_id": watermark, "message_count": message_count}
+        )
+
+    # 6. Long backlog: a job folds in the rest (one queued catch-up per patient)
+    if pending and get_cache().add(CLINICAL_SUMMARY_PENDING_KEY.format(user_id), 1, timeout=settings.JOB_VISIBILITY_TIMEOUT):
+        enqueue('communication.clinical_summary', user_id=user_id)
+
+    return {
+        "status": "success",
+        "patient_id": user_id,
+        "summary": summary,
+        "cached": False,
+        "pending": pending,
+        "updated_at": existing.updated_at.isoformat()
+    }
+
+def clinical_summary_fallback(user_id):
+    """Served when Gemini fails: the stored note if there is one, else the fallback text"""
+    existing = ClinicalSummary.objects.filter(user_id=user_id).first()
+    if existing is None:
+        return {"summary": FALLBACK_AI_REPLY}
+    return {
+        "status": "success",
+        "patient_id": user_id,
+        "summary": existing.summary,
+        "cached": True,
+        "stale": True,
+        "updated_at": existing.updated_at.isoformat()
+    }
+
+def wants_background(request):
+    """True if the client asked for the work to be queued (?background=true)"""
+    return request.query_params.get('background', '').lower() in ('1', 'true', 'yes')
+
+def _save_user_message(data):
+    """Validates and saves the incoming user message (sync ORM work)"""
+    serializer = ChatMessageSerializer(data=data)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    return serializer.save(), None
+
+def before_cursor(timestamp, message_id):
+    """Messages before (timestamp, id) in history order: the keyset for ?before="""
+    return Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=message_id)
+
+def parse_since(value):
+    """ISO 8601 timestamp from a query string, or None if it is not one"""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed = parse_datetime(DECODED_PLUS_OFFSET_RE.sub(r'+\1', value))
+    return parsed
 
 # ==========================================
 # 2. API VIEWS
@@ -78,10 +353,63 @@ class ChatAPIView(APIView):
     Handles Chatbot interaction + Mood Detection
     """
     def get(self, request, user_id):
-        # Return chat history
-        messages = ChatMessage.objects.filter(user_id=user_id).order_by('timestamp')
-        serializer = ChatMessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        """
+        Returns chat history one page at a time (oldest first within a page).
+        ?before=<id>  older messages (default: the latest page)
+        ?after=<id>   newer messages, for clients that already hold earlier ones
+        ?since=<ISO timestamp>  delta mode by time (an unencoded '+' offset is accepted)
+        ?page_size=<n>
+        Pages are cached until the user's next message (ETag / 304 supported).
+        """
+        try:
+            return cached_response(request, [f'chat:{user_id}'], lambda: self.history_page(request.query_params, user_id))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def history_page(self, params, user_id):
+        try:
+            page_size = min(int(params.get('page_size', settings.CHAT_HISTORY_PAGE_SIZE)), settings.CHAT_HISTORY_MAX_PAGE_SIZE)
+            before = int(params['before']) if 'before' in params else None
+            after = int(params['after']) if 'after' in params else None
+        except ValueError:
+            raise ValueError("before, after and page_size must be integers")
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+
+        messages = ChatMessage.objects.filter(user_id=user_id)
+
+        if after is not None or 'since' in params:
+            # Delta mode: walk forward from the cursor
+            if after is not None:
+                messages = messages.filter(id__gt=after).order_by('id')
+            else:
+                since = parse_since(params['since'])
+                if since is None:
+                    raise ValueError("since must be an ISO 8601 timestamp")
+                messages = messages.filter(timestamp__gt=since).order_by('timestamp', 'id')
+            page = list(messages[:page_size + 1])
+            has_more = len(page) > page_size
+            page = page[:page_size]
+        else:
+            # History mode: walk backwards from the newest (or the cursor)
+            if before is not None:
+                # Keyset on (timestamp, id), the same order the page is read in
+                cursor = messages.filter(id=before).values_list('timestamp', flat=True).first()
+                if cursor is None:
+                    messages = messages.filter(id__lt=before)
+                else:
+                    messages = messages.filter(before_cursor(cursor, before))
+            page = list(messages.order_by('-timestamp', '-id')[:page_size + 1])
+            has_more = len(page) > page_size
+            page = page[:page_size][::-1]
+
+        return {
+            "results": ChatMessageSerializer(page, many=True).data,
+            "has_more": has_more,
+            # Cursors for the next request in either direction
+            "next_before": page[0].id if page else before,
+            "next_after": page[-1].id if page else after,
+        }
 
     def post(self, request):
         # 1. Validate Input
@@ -89,146 +417,208 @@ class ChatAPIView(APIView):
         if serializer.is_valid():
             # Save User Message
             user_msg = serializer.save()
-            user_text = user_msg.content
-            user_id = user_msg.user.id
             
-            # 2. Get AI Response (Gemini)
-            ai_text = get_gemini_response(user_text)
-            
-            # 3. Save AI Message to Database
-            ai_msg = ChatMessage.objects.create(
-                user_id=user_id,
-                content=ai_text,
-                is_user_sender=False
-            )
-            
-            # 4. Analyze Mood (Azure) & Update Patient Profile
-            detected_mood = analyze_mood_azure(user_text)
-            try:
-                # Update the profile associated with this user
-                profile = PatientProfile.objects.get(user_id=user_id)
-                profile.current_mood = detected_mood
-                profile.save()
-            except PatientProfile.DoesNotExist:
-                pass # If user is a doctor or has no profile, skip
+            # Optionally hand the AI work to the job queue and return a job id
+            if wants_background(request):
+                job = enqueue('communication.chat_reply', user_id=user_msg.user_id, user_text=user_msg.content)
+                return job_accepted_response(job)
             
+            # 2-4. Gemini reply, Azure mood, save AI message
             # 5. Return response to Flutter
-            return Response({
-                "status": "success",
-                "ai_response": ai_text,
-                "detected_mood": detected_mood,
-                "data": ChatMessageSerializer(ai_msg).data
-            }, status=status.HTTP_201_CREATED)
+            return Response(run_chat_turn(user_msg.user_id, user_msg.content), status=status.HTTP_201_CREATED)
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CallTranscriptionView(APIView):
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncChatAPIView(View):
     """
-    Handles Audio File Upload -> Azure Speech-to-Text
+    Async (ASGI) variant of ChatAPIView.post.
+    Gemini and Azure run concurrently with per-call timeouts, and the
+    worker is not blocked while waiting on the network.
+    """
+    async def post(self, request):
+        # 1. Validate Input & Save User Message
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+        user_msg, errors = await sync_to_async(_save_user_message)(data)
+        if errors:
+            return JsonResponse(errors, status=400)
+
+        # 2. Get AI Response + Mood concurrently (mood also updates the profile)
+        ai_text, detected_mood = await get_chat_ai_results(user_msg.content, user_msg.user_id)
+
+        # 3. Save AI Message to Database
+        ai_msg = await sync_to_async(save_ai_reply)(user_msg.user_id, ai_text)
+
+        return JsonResponse(chat_response_data(ai_text, detected_mood, ai_msg), status=201)
+
+
+def sse_event(event, data):
+    """Formats one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ChatStreamView(View):
+    """
+    Streaming variant of ChatAPIView.post over Server-Sent Events.
+    Events: 'token' (reply text as it is generated), 'message' (the saved
+    AI ChatMessage), 'mood' (detected mood, sent last) and 'done'.
+    If the AI fails part-way, an 'error' event is sent and the partial reply
+    is replaced by the fallback reply in the saved 'message'.
     """
     def post(self, request):
-        if 'audio' not in request.FILES:
-            return Response({"error": "No audio file provided"}, status=status.HTTP_400_BAD_REQUEST)
-            
-        audio_file = request.FILES['audio']
-        temp_audio_path = None
-        
+        # 1. Validate Input & Save User Message
         try:
-            # 1. Save to a temporary file
-            # delete=False is crucial for Windows so we can close it before Azure reads it
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
-                for chunk in audio_file.chunks():
-                    temp_audio.write(chunk)
-                temp_audio_path = temp_audio.name
-            
-            # FILE IS NOW CLOSED BY PYTHON (Exited 'with' block)
-            
-            # 2. Configure Azure Speech
-            speech_config = speechsdk.SpeechConfig(
-                subscription=settings.AZURE_SPEECH_KEY, 
-                region=settings.AZURE_SPEECH_REGION
-            )
-            audio_config = speechsdk.audio.AudioConfig(filename=temp_audio_path)
-            speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=speech_config, 
-                audio_config=audio_config
-            )
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
 
-            # 3. Perform recognition
-            result = speech_recognizer.recognize_once_async().get()
+        user_msg, errors = _save_user_message(data)
+        if errors:
+            return JsonResponse(errors, status=400)
 
-            # 4. CRITICAL: Force release of file handle on Windows
-            del speech_recognizer
-            del audio_config
-            del speech_config
-            
-            # Force garbage collection to ensure C++ objects release the file lock
-            gc.collect() 
-
-            # 5. Process Result
-            if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                response_data = {
-                    "status": "success",
-                    "transcript": result.text
-                }
-            elif result.reason == speechsdk.ResultReason.NoMatch:
-                response_data = {"status": "error", "message": "No speech could be recognized"}
-            else:
-                response_data = {"status": "error", "message": f"Canceled: {result.cancellation_details.reason}"}
+        # 2. Start mood detection now so it runs while the reply streams
+        mood_future = mood_batcher.submit(user_msg.content, user_msg.user_id)
+
+        response = streaming_response(request, self.events(user_msg, mood_future), 'text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no' # Disable proxy buffering (nginx)
+        return response
+
+    def events(self, user_msg, mood_future):
+        # 3. Stream the reply
+        parts = []
+        ai_text = None
+        try:
+            for text in stream_gemini_response(user_msg.content, user_msg.user_id):
+                parts.append(text)
+                yield sse_event('token', {"text": text})
+        except GeneratorExit:
+            # Client disconnected mid-stream: keep what was generated so far
+            if parts:
+                save_ai_reply(user_msg.user_id, "".join(parts))
+            raise
+        except Exception:
+            # Vendor failed mid-reply: the partial text is not kept
+            ai_text = FALLBACK_AI_REPLY
+            yield sse_event('error', {"message": "The reply was interrupted", "partial_discarded": True})
+
+        # 4. Save the AI message once the stream has finished
+        ai_msg = save_ai_reply(user_msg.user_id, ai_text or "".join(parts))
+        yield sse_event('message', ChatMessageSerializer(ai_msg).data)
+
+        # 5. Trailing mood result
+        try:
+            detected_mood = mood_future.result(timeout=settings.AZURE_LANGUAGE_TIMEOUT)
+        except FutureTimeout:
+            detected_mood = FALLBACK_MOOD
+        yield sse_event('mood', {"detected_mood": detected_mood})
+        yield sse_event('done', {"status": "success"})
 
-            return Response(response_data)
 
+class CallTranscriptionView(APIView):
+    """
+    Handles Audio File Upload -> Azure Speech-to-Text
+    The upload is streamed into continuous recognition as it arrives (no temp
+    file), and the whole recording is transcribed as timed segments.
+    """
+    def post(self, request):
+        # Long recordings: store the upload and let a job worker transcribe it
+        if wants_background(request):
+            if 'audio' not in request.FILES:
+                return Response({"error": "No audio file provided"}, status=status.HTTP_400_BAD_REQUEST)
+            audio_file = request.FILES['audio']
+            stored_name = default_storage.save(f"transcribe/{audio_file.name or 'call.wav'}", audio_file)
+            job = enqueue('communication.transcribe', stored_name=stored_name)
+            return job_accepted_response(job)
+
+        upload_handler = SpeechUploadHandler(request._request, target_field='audio')
+        finished = False
+        try:
+            # 1. Feed the upload straight into the recogniser while it is parsed.
+            # Raises AttributeError if the body was already read (e.g. by auth).
+            request._request.upload_handlers = [upload_handler]
+            request.FILES # Reading the body drives the upload handler
+            if upload_handler.transcriber is None:
+                return Response({"error": "No audio file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+            # 2. Wait for the final utterances
+            result = upload_handler.transcriber.finish()
+            finished = True
+            return Response(result)
+
+        except ValueError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({"status": "error", "message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
         finally:
-            # 6. Safe Deletion
-            # We put this in 'finally' to ensure it runs even if errors occur above
-            if temp_audio_path and os.path.exists(temp_audio_path):
+            # Aborted or invalid upload: don't leave the recogniser running
+            if not finished and upload_handler.transcriber is not None:
                 try:
-                    os.remove(temp_audio_path)
-                except PermissionError:
-                    # If Windows still locks it, just pass. 
-                    # The OS will clean up temp files eventually.
-                    print(f"Warning: Could not delete temp file {temp_audio_path}")
-                    pass
+                    upload_handler.transcriber.cancel()
+                except Exception as e:
+                    print(f"Transcription cancel Error: {e}")
 
-class ClinicalSummaryView(APIView):
+
+class AIHealthView(APIView):
     """
-    Generates a clinical summary for the Doctor based on recent chat logs.
+    Reports which AI clients are initialised in this worker.
+    POST with {"reset": "<client name>"} (or "all") to force a rebuild.
     """
-    def get(self, request, user_id):
-        # 1. Fetch recent messages (last 24 hours)
-        # You can remove the time filter if you want to summarize ALL history for the demo
-        last_24h = timezone.now() - timedelta(hours=24)
-        messages = ChatMessage.objects.filter(
-            user_id=user_id, 
-            is_user_sender=True,  # Only summarize what the PATIENT said
-            # timestamp__gte=last_24h 
-        ).order_by('timestamp')
+    def get(self, request):
+        return Response(ai_clients.health())
 
-        if not messages.exists():
-            return Response({"summary": "No patient activity recorded recently."})
+    def post(self, request):
+        name = request.data.get('reset') if isinstance(request.data, dict) else None
+        if name not in list(ai_clients.health()) + ['all']:
+            return Response({"error": "Unknown client"}, status=status.HTTP_400_BAD_REQUEST)
+        ai_clients.reset(None if name == 'all' else name)
+        return Response(ai_clients.health())
 
-        # 2. Format the logs for the AI
-        logs_text = "\n".join([f"- {msg.content} ({msg.timestamp.strftime('%H:%M')})" for msg in messages])
 
-        # 3. Create the Doctor Prompt
-        prompt = (
-            f"You are an expert Medical Scribe. Summarize the following patient chat logs into a "
-            f"concise clinical note using standard medical terminology (SOAP format if possible). "
-            f"Highlight any symptoms, pain points, or mental health indicators.\n\n"
-            f"Patient Logs:\n{logs_text}"
-        )
+class AIPolicyView(APIView):
+    """
+    Reports this worker's AI call policies: circuit breaker state, calls in
+    flight against the bulkhead limit, and retry / timeout / rejection counts.
+    """
+    def get(self, request):
+        return Response(backend_policies())
+
+
+class AICacheView(APIView):
+    """
+    Reports this worker's AI response cache stats (hits, misses, evictions).
+    POST {"clear": true} to empty it.
+    """
+    def get(self, request):
+        return Response(ai_cache.stats())
+
+    def post(self, request):
+        if not isinstance(request.data, dict) or request.data.get('clear') is not True:
+            return Response({"error": "Expected {\"clear\": true}"}, status=status.HTTP_400_BAD_REQUEST)
+        ai_cache.clear()
+        return Response(ai_cache.stats())
+
+
+class ClinicalSummaryView(APIView):
+    """
+    Generates a clinical summary for the Doctor based on recent chat logs.
+    """
+    def get(self, request, user_id):
+        if wants_background(request):
+            job = enqueue('communication.clinical_summary', user_id=user_id)
+            return job_accepted_response(job)
 
-        # 4. Ask Gemini
         try:
-            summary = get_gemini_response(prompt) # Reusing your existing helper function
-            return Response({
-                "status": "success",
-                "patient_id": user_id,
-                "summary": summary
-            })
+            return cached_response(
+                request, [f'chat:{user_id}', f'clinical-summary:{user_id}'],
+                lambda: build_clinical_summary(user_id, max_chunks=settings.CLINICAL_SUMMARY_REQUEST_CHUNKS)
+            )
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            print(f"Clinical summary Error: {e}")
+            return Response(clinical_summary_fallback(user_id))
\ No newline at end of file
@@ -0,0 +1,80 @@
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+
+class BaseBroker(ABC):
+    """
+    Decides how queued jobs reach a worker.
+    Job rows always hold the payload, status and result so clients can poll
+    them; a broker only has to deliver job ids (publish) and hand them out (claim).
+    """
+    def enqueue(self, task_name, payload):
+        job = Job.objects.create(task=task_name, payload=payload)
+        self.publish(job)
+        return job
+
+    @abstractmethod
+    def publish(self, job):
+        """Makes a newly queued job available to workers"""
+
+    @abstractmethod
+    def claim(self):
+        """Returns the next Job to run (already marked running), or None"""
+
+
+class DatabaseBroker(BaseBroker):
+    """
+    Uses the Job table itself as the queue, so it runs with no outside services.
+    Claims are optimistic (conditional UPDATE), which is safe on SQLite and PostgreSQL.
+    """
+    # monotonic() time of this process's next stale-job sweep
+    _next_requeue = 0.0
+
+    def publish(self, job):
+        pass # The queued row is the message
+
+    def claim(self):
+        # A job only goes stale after JOB_VISIBILITY_TIMEOUT, so sweeping once per
+        # timeout is enough; idle workers do not write on every poll
+        now = time.monotonic()
+        if now >= self._next_requeue:
+            self._next_requeue = now + settings.JOB_VISIBILITY_TIMEOUT
+            self.requeue_stale()
+        for _ in range(5):
+            job_id = Job.objects.filter(status='queued').order_by('id').values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            claimed = Job.objects.filter(id=job_id, status='queued').update(
+                status='running', started_at=timezone.now(), attempts=F('attempts') + 1
+            )
+            if claimed:
+                return Job.objects.get(id=job_id)
+            # Another worker won the race, try the next one
+        return None
+
+    def requeue_stale(self):
+        """Puts back jobs whose worker died mid-run (or fails them after max attempts)"""
+        cutoff = timezone.now() - timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+        stale = Job.objects.filter(status='running', started_at__lt=cutoff)
+        stale.filter(attempts__gte=settings.JOB_MAX_ATTEMPTS).update(
+            status='failed', error='Worker timed out', finished_at=timezone.now()
+        )
+        stale.update(status='queued')
+
+
+class InlineBroker(DatabaseBroker):
+    """Runs each job immediately in the enqueuing process (local dev without a worker)"""
+    def publish(self, job):
+        from .queue import run_job
+        for attempt in range(1, settings.JOB_MAX_ATTEMPTS + 1):
+            Job.objects.filter(id=job.id).update(status='running', started_at=timezone.now(), attempts=attempt)
+            job.refresh_from_db()
+            if run_job(job) != 'queued':
+                return
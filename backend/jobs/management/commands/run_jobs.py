@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+
+def work_loop(poll_interval, burst, child=False):
+    """Claims and runs jobs until stopped (or until the queue is empty in burst mode)"""
+    # Spawned children (Windows/macOS) start without Django configured
+    django.setup()
+    from jobs.queue import get_broker, run_job
+    from jobs.signals import worker_stopping
+    from realtime.events import mark_producer
+
+    mark_producer('run_jobs')
+    if child:
+        # terminate() sends SIGTERM; leave through the finally below
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    broker = get_broker()
+    try:
+        while True:
+            close_old_connections()
+            job = broker.claim()
+            if job is None:
+                if burst:
+                    return
+                time.sleep(poll_interval)
+                continue
+            run_job(job)
+    finally:
+        if child:
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        worker_stopping.send(sender=None, child=child)
+
+
+class Command(BaseCommand):
+    help = "Runs a pool of background worker processes for queued jobs (AI chat, summaries, transcription)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.JOB_WORKER_PROCESSES)
+        parser.add_argument('--poll-interval', type=float, default=settings.JOB_POLL_INTERVAL)
+        parser.add_argument('--burst', action='store_true', help="Exit once the queue is empty")
+
+    def handle(self, *args, **opts):
+        processes = max(1, opts['processes'])
+        self.stdout.write(f"Starting {processes} job worker(s) (pid {os.getpid()})")
+
+        if processes == 1:
+            work_loop(opts['poll_interval'], opts['burst'])
+            return
+
+        # Children must not share the parent's DB connections
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=work_loop,
+                args=(opts['poll_interval'], opts['burst'], True),
+                name=f'job-worker-{i}'
+            )
+            for i in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping job workers...")
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
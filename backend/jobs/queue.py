@@ -0,0 +1,45 @@
+import traceback
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+from .registry import get_task
+
+_broker = None
+
+
+def get_broker():
+    """Broker configured by settings.JOB_BROKER (one per process)"""
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.JOB_BROKER)()
+    return _broker
+
+
+def enqueue(task_name, **payload):
+    """Queues a registered task and returns its Job (use job.id to poll)"""
+    get_task(task_name) # Fail fast on typos
+    return get_broker().enqueue(task_name, payload)
+
+
+def run_job(job):
+    """
+    Executes a claimed job and stores its result or error. A failed job is
+    queued again until it has run JOB_MAX_ATTEMPTS times.
+    Returns the job's new status.
+    """
+    try:
+        result = get_task(job.task)(**job.payload)
+        Job.objects.filter(id=job.id).update(status='succeeded', result=result, finished_at=timezone.now())
+        return 'succeeded'
+    except Exception as e:
+        error = f"{e}\n{traceback.format_exc()}"
+        if job.attempts < settings.JOB_MAX_ATTEMPTS:
+            print(f"Job {job.id} ({job.task}) attempt {job.attempts} failed, retrying: {e}")
+            Job.objects.filter(id=job.id).update(status='queued', error=error)
+            return 'queued'
+        print(f"Job {job.id} ({job.task}) failed: {e}")
+        Job.objects.filter(id=job.id).update(status='failed', error=error, finished_at=timezone.now())
+        return 'failed'
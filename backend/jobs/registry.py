@@ -0,0 +1,20 @@
+# Maps task names to the functions that run them
+TASKS = {}
+
+
+def task(name):
+    """
+    Registers a function as a background task.
+    Tasks take JSON-serialisable keyword arguments and return a JSON-serialisable result.
+    """
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return TASKS[name]
+    except KeyError:
+        raise LookupError(f"Unknown background task '{name}'")
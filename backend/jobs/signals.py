@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by a run_jobs worker process just before it exits. Worker processes end
+# with os._exit(), which skips atexit handlers, so receivers holding buffered
+# writes must flush them here.
+worker_stopping = Signal()
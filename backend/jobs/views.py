@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.response import Response
+
+from .models import Job
+from .serializers import JobSerializer
+
+# Upper bound for long-polling so a request never waits for long
+MAX_WAIT_SECONDS = 25
+POLL_INTERVAL = 0.25
+
+
+class JobDetailView(View):
+    """
+    Poll a background job. Pass ?wait=<seconds> to long-poll until it finishes.
+    Async, so under ASGI a waiting client does not hold a worker thread.
+    """
+    async def get(self, request, job_id):
+        try:
+            job = await Job.objects.aget(id=job_id)
+        except Job.DoesNotExist:
+            return JsonResponse({"detail": "Not found."}, status=404)
+
+        try:
+            wait = min(float(request.GET.get('wait', 0)), MAX_WAIT_SECONDS)
+        except ValueError:
+            wait = 0
+        deadline = time.monotonic() + wait
+        while not job.is_finished and time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            await job.arefresh_from_db()
+
+        return JsonResponse(JobSerializer(job).data)
+
+
+def job_accepted_response(job):
+    """202 body returned by endpoints that hand work to the job queue"""
+    return Response({
+        "status": "queued",
+        "job_id": job.id,
+        "poll_url": f"/api/jobs/{job.id}/"
+    }, status=202)
@@ -0,0 +1,109 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from communication.models import ChatMessage
+from patients.ingest import ingest_vitals
+from patients.models import PatientProfile
+
+# Every seeded user starts with this, so load-test data can be found and removed
+USERNAME_PREFIX = 'lt-'
+
+PATIENT_LINES = (
+    "Good morning, I slept well last night.",
+    "My knee hurts a little when I walk.",
+    "I took my medication after breakfast.",
+    "Feeling a bit dizzy and tired today.",
+    "I am happy, my grandson visited me.",
+    "Can you remind me about my evening pills?",
+)
+
+
+def clear():
+    """Deletes all seeded users (profiles, vitals, chat etc. cascade)"""
+    deleted, _ = get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).delete()
+    return deleted
+
+
+def seed(doctors=10, patients=1000, vitals_per_patient=50, messages_per_patient=40, seed=42, log=print):
+    """
+    Seeds doctors, patients (spread across doctors), vitals and chat history.
+    Vitals go through the real bulk-ingest path, so snapshots, rollups,
+    baselines and alerts look like production data.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(None) # Unusable; load tests do not log in
+    clear()
+
+    User.objects.bulk_create(
+        [User(username=f'{USERNAME_PREFIX}doctor-{i}', role='doctor', password=password) for i in range(doctors)]
+        + [User(username=f'{USERNAME_PREFIX}patient-{i}', first_name=f'Patient {i}', password=password)
+           for i in range(patients)],
+        batch_size=1000,
+    )
+    doctor_ids = list(User.objects.filter(username__startswith=f'{USERNAME_PREFIX}doctor-').values_list('id', flat=True))
+    patient_users = list(User.objects.filter(username__startswith=f'{USERNAME_PREFIX}patient-').values_list('id', flat=True))
+    PatientProfile.objects.bulk_create(
+        [PatientProfile(user_id=user_id, assigned_doctor_id=doctor_ids[i % len(doctor_ids)] if doctor_ids else None)
+         for i, user_id in enumerate(patient_users)],
+        batch_size=1000,
+    )
+    profile_ids = list(PatientProfile.objects.filter(user_id__in=patient_users).values_list('id', flat=True))
+    log(f"Seeded {len(doctor_ids)} doctors and {len(profile_ids)} patients")
+
+    # Vitals: one reading every 10 minutes per patient, ending now
+    start = timezone.now() - timedelta(minutes=10 * vitals_per_patient)
+    rows = []
+    created = 0
+    for step in range(vitals_per_patient):
+        at = (start + timedelta(minutes=10 * step)).isoformat()
+        for patient_id in profile_ids:
+            rows.append({
+                'patient': patient_id,
+                'heart_rate': int(rng.gauss(74, 8)),
+                'steps': rng.randint(0, 300),
+                'oxygen_level': min(100, int(rng.gauss(97, 1.5))),
+                'temperature': round(rng.gauss(98.4, 0.4), 1),
+                'blood_pressure': f"{int(rng.gauss(122, 10))}/{int(rng.gauss(80, 6))}",
+                'timestamp': at,
+            })
+            if len(rows) >= settings.VITALS_BULK_MAX_ROWS:
+                created += ingest_vitals(rows)['created']
+                rows = []
+    if rows:
+        created += ingest_vitals(rows)['created']
+    log(f"Seeded {created} vital readings")
+
+    messages = []
+    for user_id in patient_users:
+        for i in range(messages_per_patient):
+            from_patient = i % 2 == 0
+            messages.append(ChatMessage(
+                user_id=user_id,
+                content=rng.choice(PATIENT_LINES) if from_patient else "Thank you for telling me.",
+                is_user_sender=from_patient,
+            ))
+    ChatMessage.objects.bulk_create(messages, batch_size=2000)
+    log(f"Seeded {len(messages)} chat messages")
+
+    return {'doctors': len(doctor_ids), 'patients': len(profile_ids), 'vitals': created, 'messages': len(messages)}
+
+
+def load_context():
+    """Ids the scenarios pick from (seeded data only)"""
+    profiles = list(
+        PatientProfile.objects.filter(user__username__startswith=USERNAME_PREFIX).values_list('id', 'user_id')
+    )
+    doctor_ids = list(
+        get_user_model().objects.filter(username__startswith=f'{USERNAME_PREFIX}doctor-').values_list('id', flat=True)
+    )
+    return {
+        'patient_ids': [row[0] for row in profiles],
+        'patient_user_ids': [row[1] for row in profiles],
+        'doctor_ids': doctor_ids,
+    }
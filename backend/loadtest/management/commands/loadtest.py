@@ -0,0 +1,123 @@
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from communication.backends import reset_backends
+from communication.models import ChatMessage
+from loadtest.fixtures import load_context
+from loadtest.runner import run_scenario
+from loadtest.scenarios import SCENARIOS, silent_wav
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs API load-test scenarios against the seeded data (see seed_loadtest) with "
+        "stubbed AI backends, and reports throughput, latency percentiles and DB queries "
+        "per endpoint. Save a run with --output and pass it to --compare on another commit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', metavar='SCENARIO', help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per scenario")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--llm-ms', type=float, default=0, help="Stub Gemini latency")
+        parser.add_argument('--mood-ms', type=float, default=0, help="Stub Azure Language latency")
+        parser.add_argument('--speech-ms', type=float, default=0, help="Stub Azure Speech latency")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help="Write the results as JSON to this file")
+        parser.add_argument('--compare', help="JSON results of an earlier run to compare against")
+
+    def handle(self, *args, **opts):
+        names = opts['scenarios'] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        ctx = load_context()
+        if not ctx['patient_ids'] or not ctx['doctor_ids']:
+            raise CommandError("No load-test data found; run `manage.py seed_loadtest` first")
+        ctx['max_message_id'] = ChatMessage.objects.order_by('-id').values_list('id', flat=True).first() or 1
+        ctx['wav'] = silent_wav()
+
+        baseline = None
+        if opts['compare']:
+            with open(opts['compare']) as f:
+                baseline = json.load(f)
+
+        local = 'communication.backends.local.'
+        common = {'seed': opts['seed']}
+        backends = {
+            'llm': {'BACKEND': local + 'LocalLLMBackend', 'OPTIONS': dict(common, latency_ms=opts['llm_ms'])},
+            'sentiment': {'BACKEND': local + 'LocalSentimentBackend', 'OPTIONS': dict(common, latency_ms=opts['mood_ms'])},
+            'speech': {'BACKEND': local + 'LocalSpeechBackend', 'OPTIONS': dict(common, latency_ms=opts['speech_ms'])},
+        }
+
+        results = {}
+        # Room in every vendor bulkhead for all simulated callers
+        policies = {
+            kind: dict(policy, max_concurrency=max(policy['max_concurrency'], opts['concurrency']))
+            for kind, policy in settings.AI_CALL_POLICIES.items()
+        }
+        with override_settings(AI_BACKENDS=backends, AI_CALL_POLICIES=policies):
+            reset_backends()
+            try:
+                for name in names:
+                    results[name] = run_scenario(
+                        SCENARIOS[name], ctx, opts['requests'], opts['concurrency'], seed=opts['seed']
+                    )
+            finally:
+                reset_backends()
+
+        report = {
+            'commit': git_commit(),
+            'database': connection.vendor,
+            'cache': settings.CACHE_BACKEND,
+            'patients': len(ctx['patient_ids']),
+            'scenarios': results,
+        }
+        self.stdout.write(
+            f"commit {report['commit']}, {report['database']}, {report['patients']} patients, "
+            f"{opts['requests']} requests x concurrency {opts['concurrency']}"
+        )
+        self.stdout.write(f"{'scenario':<14}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}")
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<14}{r['throughput']:>9.1f}{r['latency_ms']['p50']:>10.1f}{r['latency_ms']['p95']:>10.1f}"
+                f"{r['latency_ms']['p99']:>10.1f}{r['queries']['mean']:>9.1f}{r['errors']:>8}"
+            )
+        if baseline:
+            self.compare(baseline, results)
+
+        if opts['output']:
+            with open(opts['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Results written to {opts['output']}")
+
+    def compare(self, baseline, results):
+        """Relative change against an earlier run, per scenario"""
+        def change(old, new):
+            return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+        self.stdout.write(f"\nvs commit {baseline.get('commit')}:")
+        self.stdout.write(f"{'scenario':<14}{'req/s':>9}{'p95':>9}{'queries':>9}")
+        for name, r in results.items():
+            old = baseline.get('scenarios', {}).get(name)
+            if not old:
+                continue
+            self.stdout.write(
+                f"{name:<14}{change(old['throughput'], r['throughput']):>9}"
+                f"{change(old['latency_ms']['p95'], r['latency_ms']['p95']):>9}"
+                f"{change(old['queries']['mean'], r['queries']['mean']):>9}"
+            )
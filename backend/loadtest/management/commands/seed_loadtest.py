@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from loadtest import fixtures
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds load-test data: doctors, patients, vitals (through the bulk-ingest path) "
+        "and chat history. Existing load-test users are replaced; --clear only removes them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--doctors', type=int, default=10)
+        parser.add_argument('--patients', type=int, default=1000)
+        parser.add_argument('--vitals', type=int, default=50, help="Readings per patient")
+        parser.add_argument('--messages', type=int, default=40, help="Chat messages per patient")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--clear', action='store_true', help="Only delete existing load-test data")
+
+    def handle(self, *args, **opts):
+        if opts['clear']:
+            deleted = fixtures.clear()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} load-test rows"))
+            return
+
+        counts = fixtures.seed(
+            doctors=opts['doctors'], patients=opts['patients'], vitals_per_patient=opts['vitals'],
+            messages_per_patient=opts['messages'], seed=opts['seed'], log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Seeded " + ", ".join(f"{n} {name}" for name, n in counts.items())
+        ))
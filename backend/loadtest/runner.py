@@ -0,0 +1,88 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class QueryCounter:
+    """execute_wrapper that counts the queries run on one connection"""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_scenario(scenario, ctx, requests, concurrency, seed=42):
+    """
+    Sends `requests` requests for one scenario from `concurrency` threads, each
+    with its own client and DB connection. Returns throughput, latency
+    percentiles (ms), DB queries per request and the status code breakdown.
+    """
+    local = threading.local()
+    results = []
+
+    def one(i):
+        if not hasattr(local, 'client'):
+            local.client = Client(raise_request_exception=False)
+            local.counter = QueryCounter()
+        rng = random.Random(seed * 100003 + i)
+        with connection.execute_wrapper(local.counter):
+            before = local.counter.count
+            start = time.perf_counter()
+            try:
+                status = scenario(local.client, ctx, rng).status_code
+            except Exception as e:
+                print(f"Load test request Error: {e}")
+                status = 'exception'
+            elapsed = time.perf_counter() - start
+        return elapsed, local.counter.count - before, status
+
+    def worker(indices):
+        try:
+            return [one(i) for i in indices]
+        finally:
+            connection.close()
+
+    chunks = [range(w, requests, concurrency) for w in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for chunk in pool.map(worker, chunks):
+            results.extend(chunk)
+    wall = time.perf_counter() - start
+
+    latencies = [r[0] * 1000 for r in results]
+    queries = [r[1] for r in results]
+    statuses = {}
+    for r in results:
+        statuses[str(r[2])] = statuses.get(str(r[2]), 0) + 1
+    errors = sum(n for code, n in statuses.items() if not code.isdigit() or int(code) >= 400)
+    return {
+        'requests': len(results),
+        'concurrency': concurrency,
+        'wall_seconds': round(wall, 3),
+        'throughput': round(len(results) / wall, 1) if wall else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(max(latencies), 2),
+        },
+        'queries': {
+            'mean': round(sum(queries) / len(queries), 1),
+            'max': max(queries),
+        },
+        'statuses': statuses,
+        'errors': errors,
+    }
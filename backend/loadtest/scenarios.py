@@ -0,0 +1,84 @@
+"""
+API scenarios for the load test. Each scenario sends one request through the
+Django test client (full middleware/URL/view stack, no network) and returns
+the response. Scenarios pick their ids from the seeded fixtures.
+"""
+import io
+import wave
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from .fixtures import PATIENT_LINES
+
+# Readings per vitals ingestion request
+VITALS_BATCH = 20
+
+
+def silent_wav(seconds=5, rate=16000):
+    """In-memory 16-bit mono WAV, enough for the local speech backend"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b'\x00\x00' * int(seconds * rate))
+    return buffer.getvalue()
+
+
+def chat(client, ctx, rng):
+    """A patient sends a chat message (AI reply + mood analysis)"""
+    return client.post('/api/communication/chat/', {
+        'user': rng.choice(ctx['patient_user_ids']),
+        'content': rng.choice(PATIENT_LINES),
+        'is_user_sender': True,
+    }, content_type='application/json')
+
+
+def history(client, ctx, rng):
+    """Chat history: mostly the newest page, sometimes an older one"""
+    path = f"/api/communication/chat/{rng.choice(ctx['patient_user_ids'])}/"
+    if rng.random() < 0.3:
+        path += '?page_size=20&before=' + str(rng.randint(1, ctx['max_message_id']))
+    return client.get(path)
+
+
+def vitals(client, ctx, rng):
+    """A device uploads a batch of readings for one patient"""
+    patient_id = rng.choice(ctx['patient_ids'])
+    now = timezone.now().isoformat()
+    readings = [{
+        'patient': patient_id,
+        'heart_rate': int(rng.gauss(74, 8)),
+        'oxygen_level': min(100, int(rng.gauss(97, 1.5))),
+        'temperature': round(rng.gauss(98.4, 0.4), 1),
+        'blood_pressure': f"{int(rng.gauss(122, 10))}/{int(rng.gauss(80, 6))}",
+        'timestamp': now,
+    } for _ in range(VITALS_BATCH)]
+    return client.post('/api/patients/vitals/bulk/', readings, content_type='application/json')
+
+
+def dashboard(client, ctx, rng):
+    """A doctor opens their dashboard"""
+    return client.get(f"/api/patients/dashboard/{rng.choice(ctx['doctor_ids'])}/")
+
+
+def profile(client, ctx, rng):
+    """A single patient profile"""
+    return client.get(f"/api/patients/profiles/{rng.choice(ctx['patient_ids'])}/")
+
+
+def transcription(client, ctx, rng):
+    """A recorded call is uploaded and transcribed"""
+    audio = SimpleUploadedFile('call.wav', ctx['wav'], content_type='audio/wav')
+    return client.post('/api/communication/transcribe/', {'audio': audio})
+
+
+SCENARIOS = {
+    'chat': chat,
+    'history': history,
+    'vitals': vitals,
+    'dashboard': dashboard,
+    'profile': profile,
+    'transcription': transcription,
+}
@@ -0,0 +1,184 @@
+import math
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from realtime.events import publish_patient_event
+
+from .models import HealthAlert, VitalBaseline, split_blood_pressure
+from .serializers import HealthAlertSerializer
+from .snapshots import write_snapshots
+
+# metric -> (label, unit, [(severity, low, high), ...]) checked in order;
+# a reading outside (low, high) triggers that severity. None means unbounded.
+THRESHOLDS = {
+    'heart_rate': ('Heart rate', 'bpm', [('Critical', 40, 140), ('High', 50, 120)]),
+    'oxygen_level': ('Oxygen level', '%', [('Critical', 88, None), ('High', 92, None)]),
+    'temperature': ('Temperature', '°F', [('Critical', 95.0, 104.0), ('High', 96.0, 100.4)]),
+    'systolic': ('Systolic pressure', 'mmHg', [('Critical', 80, 180), ('High', 90, 140)]),
+    'diastolic': ('Diastolic pressure', 'mmHg', [('Critical', None, 120), ('High', None, 90)]),
+}
+
+# metric -> smallest standard deviation trusted for a z-score, so a very
+# steady baseline does not flag normal measurement noise
+BASELINE_METRICS = {
+    'heart_rate': 3.0,
+    'oxygen_level': 1.0,
+    'temperature': 0.3,
+    'systolic': 4.0,
+}
+
+SEVERITY_STATUS = {'Critical': 'Critical', 'High': 'High'}
+SEVERITY_RANK = {'Critical': 3, 'High': 2, 'Medium': 1, 'Low': 0}
+
+
+def _metrics(vital):
+    values = {
+        'heart_rate': vital.heart_rate,
+        'oxygen_level': vital.oxygen_level,
+        'temperature': vital.temperature,
+    }
+    systolic, diastolic = vital.systolic, vital.diastolic
+    if systolic is None or diastolic is None:
+        systolic, diastolic = split_blood_pressure(vital.blood_pressure)
+    if systolic is not None:
+        values['systolic'], values['diastolic'] = systolic, diastolic
+    return values
+
+
+# ==========================================
+# 1. DETECTOR (pure, no database)
+# ==========================================
+
+class AnomalyDetector:
+    """
+    Streaming evaluation of vital readings against static thresholds and a
+    per-patient EWMA baseline (z-score). Readings flagged against the baseline
+    are not folded into it. All state for a patient lives in one small dict,
+    updated in O(1) per reading.
+    """
+    def __init__(self, window=50, warmup=20, z_threshold=3.5, dedup_seconds=1800):
+        self.alpha = 2 / (window + 1)
+        self.warmup = warmup
+        self.z_threshold = z_threshold
+        self.dedup_seconds = dedup_seconds
+
+    def evaluate(self, state, vital):
+        """
+        Folds one reading into `state` and returns (alerts, status) where alerts
+        is a list of (severity, rule, message) not suppressed by deduplication.
+        """
+        baselines = state.setdefault('baselines', {})
+        alerted = state.setdefault('alerted', {})
+        at = vital.timestamp.timestamp()
+        findings = []
+
+        for metric, value in _metrics(vital).items():
+            label, unit, levels = THRESHOLDS[metric]
+            for severity, low, high in levels:
+                if low is not None and value < low:
+                    findings.append((severity, f'{metric}_low', f"{label} {value} {unit} is below {low} {unit}"))
+                    break
+                if high is not None and value > high:
+                    findings.append((severity, f'{metric}_high', f"{label} {value} {unit} is above {high} {unit}"))
+                    break
+
+            min_std = BASELINE_METRICS.get(metric)
+            if min_std is None:
+                continue
+            count, mean, variance = baselines.get(metric, (0, float(value), 0.0))
+            if count >= self.warmup:
+                std = max(math.sqrt(variance), min_std)
+                z = (value - mean) / std
+                if abs(z) >= self.z_threshold:
+                    findings.append((
+                        'Medium', f'{metric}_baseline',
+                        f"{label} {value} {unit} is unusual for this patient "
+                        f"(baseline {mean:.0f} ± {std:.0f} {unit}, z={z:+.1f})"
+                    ))
+                    # Keep outliers out of the baseline, or they widen it and mask the next ones
+                    continue
+            # Exponentially weighted mean/variance (West's incremental form)
+            diff = value - mean
+            increment = self.alpha * diff
+            baselines[metric] = (count + 1, mean + increment, (1 - self.alpha) * (variance + diff * increment))
+
+        status = 'Stable'
+        alerts = []
+        for severity, rule, message in findings:
+            if SEVERITY_RANK[severity] > SEVERITY_RANK.get(status, 0):
+                status = SEVERITY_STATUS.get(severity, status)
+            last = alerted.get(rule)
+            if last is not None and abs(at - last) < self.dedup_seconds:
+                continue
+            alerted[rule] = at
+            alerts.append((severity, rule, message))
+
+        # Status follows the newest reading seen, even when readings arrive out of order
+        if at >= state.get('last_seen', 0):
+            state['last_seen'] = at
+            state['status'] = status
+        return alerts, status
+
+
+def get_detector():
+    return AnomalyDetector(
+        window=settings.VITALS_BASELINE_WINDOW,
+        warmup=settings.VITALS_BASELINE_WARMUP,
+        z_threshold=settings.VITALS_ZSCORE_THRESHOLD,
+        dedup_seconds=settings.HEALTH_ALERT_DEDUP_MINUTES * 60,
+    )
+
+
+# ==========================================
+# 2. DATABASE GLUE
+# ==========================================
+
+def detect_anomalies(vitals, detector=None):
+    """
+    Runs a batch of saved readings through the detector, creates the resulting
+    HealthAlerts and updates PatientProfile.current_status where it changed,
+    pushing both to real-time subscribers.
+    Uses a fixed number of queries per batch. Call inside the ingest transaction.
+    """
+    if not vitals:
+        return 0
+    detector = detector or get_detector()
+    patient_ids = {vital.patient_id for vital in vitals}
+
+    with transaction.atomic():
+        # Create missing baselines first (a concurrent first ingest may win the
+        # insert), then lock them all, so every batch folds into committed state
+        VitalBaseline.objects.bulk_create(
+            [VitalBaseline(patient_id=patient_id, state={}) for patient_id in patient_ids],
+            batch_size=500, ignore_conflicts=True
+        )
+        existing = list(VitalBaseline.objects.select_for_update().filter(patient_id__in=patient_ids))
+        baselines = {baseline.patient_id: baseline for baseline in existing}
+        previous = {patient_id: baseline.state.get('status') for patient_id, baseline in baselines.items()}
+
+        alerts = []
+        for vital in sorted(vitals, key=lambda v: v.timestamp):
+            found, _ = detector.evaluate(baselines[vital.patient_id].state, vital)
+            alerts.extend(
+                HealthAlert(patient_id=vital.patient_id, alert_type=severity, message=message)
+                for severity, _, message in found
+            )
+        HealthAlert.objects.bulk_create(alerts, batch_size=500)
+        for alert in alerts:
+            publish_patient_event(alert.patient_id, 'alert', HealthAlertSerializer(alert).data)
+
+        now = timezone.now()
+        for baseline in existing:
+            baseline.updated_at = now
+        VitalBaseline.objects.bulk_update(existing, ['state', 'updated_at'], batch_size=500)
+
+        # Targeted UPDATEs, only for patients whose status changed
+        write_snapshots({
+            patient_id: {'current_status': baseline.state['status']}
+            for patient_id, baseline in baselines.items()
+            if baseline.state.get('status') and baseline.state['status'] != previous[patient_id]
+        })
+
+    return len(alerts)
@@ -0,0 +1,150 @@
+"""
+Columnar access to vitals history.
+
+Readings are read with values_list() in fixed-size batches and packed into
+NumPy structured arrays (one typed column per metric, blood pressure split
+into systolic/diastolic integers), so analytics and exports never build
+model instances and memory stays bounded by the batch size.
+
+Binary export format (little-endian):
+
+    b'CBVCOL1\\n'
+    uint32 schema length, schema JSON {"columns": [[name, dtype], ...], ...}
+    per batch: uint32 row count, then each column's values back to back
+    uint32 0 (end of stream)
+"""
+import csv
+import io
+import json
+import struct
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+
+from .models import VitalSign
+
+MAGIC = b'CBVCOL1\n'
+
+# (column, values_list field, dtype); timestamps are ms since the epoch (UTC).
+# Integer dtypes are as wide as the model fields, so any stored value fits
+COLUMNS = (
+    ('patient_id', 'patient_id', '<i4'),
+    ('timestamp', 'timestamp', '<i8'),
+    ('heart_rate', 'heart_rate', '<i4'),
+    ('steps', 'steps', '<i4'),
+    ('sleep_hours', 'sleep_hours', '<f4'),
+    ('systolic', 'systolic', '<i2'),
+    ('diastolic', 'diastolic', '<i2'),
+    ('temperature', 'temperature', '<f4'),
+    ('oxygen_level', 'oxygen_level', '<i4'),
+)
+DTYPE = np.dtype([(name, dtype) for name, _, dtype in COLUMNS])
+# Stored for blood pressure readings that could not be split
+MISSING = -1
+
+
+# ==========================================
+# 1. LOADING (values_list -> NumPy)
+# ==========================================
+
+def vitals_queryset(patient_ids=None, start=None, end=None):
+    """Readings in (patient, timestamp) order, served by vital_patient_timestamp_idx"""
+    vitals = VitalSign.objects.all()
+    if patient_ids is not None:
+        vitals = vitals.filter(patient_id__in=patient_ids)
+    if start is not None:
+        vitals = vitals.filter(timestamp__gte=start)
+    if end is not None:
+        vitals = vitals.filter(timestamp__lt=end)
+    return vitals.order_by('patient_id', 'timestamp')
+
+
+def _records(rows):
+    for patient_id, timestamp, heart_rate, steps, sleep_hours, systolic, diastolic, temperature, oxygen in rows:
+        yield (
+            patient_id, int(timestamp.timestamp() * 1000), heart_rate, steps, sleep_hours,
+            MISSING if systolic is None else systolic, MISSING if diastolic is None else diastolic,
+            temperature, oxygen,
+        )
+
+
+def iter_batches(queryset, batch_size=None):
+    """Yields structured arrays of at most batch_size readings"""
+    batch_size = batch_size or settings.VITALS_EXPORT_BATCH_SIZE
+    rows = queryset.values_list(*(field for _, field, _ in COLUMNS)).iterator(chunk_size=batch_size)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        yield np.fromiter(_records(chunk), dtype=DTYPE, count=len(chunk))
+
+
+def load_series(patient_id, start=None, end=None):
+    """
+    One patient's readings as a structured array in time order, e.g.
+    series['heart_rate'].mean() or series['timestamp'].astype('datetime64[ms]').
+    """
+    batches = list(iter_batches(vitals_queryset([patient_id], start, end)))
+    return np.concatenate(batches) if batches else np.empty(0, dtype=DTYPE)
+
+
+# ==========================================
+# 2. EXPORT ENCODERS (streaming)
+# ==========================================
+
+def _csv_column(batch, name):
+    values = batch[name]
+    if name == 'timestamp':
+        return np.datetime_as_string(values.astype('datetime64[ms]'), unit='ms', timezone='UTC')
+    text = values.astype(str)
+    if name in ('systolic', 'diastolic'):
+        text = np.where(values == MISSING, '', text)
+    return text
+
+
+def iter_csv(batches):
+    """CSV text chunks: a header row, then one chunk per batch"""
+    names = [name for name, _, _ in COLUMNS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(zip(*(_csv_column(batch, name) for name in names)))
+        yield buffer.getvalue()
+
+
+def iter_columnar(batches):
+    """Binary columnar chunks (format in the module docstring)"""
+    schema = json.dumps({
+        'columns': [[name, dtype] for name, _, dtype in COLUMNS],
+        'timestamp': 'ms since epoch, UTC',
+        'missing': MISSING,
+    }).encode('utf-8')
+    yield MAGIC + struct.pack('<I', len(schema)) + schema
+    for batch in batches:
+        yield struct.pack('<I', len(batch)) + b''.join(
+            np.ascontiguousarray(batch[name]).tobytes() for name, _, _ in COLUMNS
+        )
+    yield struct.pack('<I', 0)
+
+
+def read_columnar(stream):
+    """Reads a binary export back, yielding one structured array per batch"""
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a vitals columnar export")
+    (length,) = struct.unpack('<I', stream.read(4))
+    schema = json.loads(stream.read(length))
+    dtype = np.dtype([tuple(column) for column in schema['columns']])
+    while True:
+        (rows,) = struct.unpack('<I', stream.read(4))
+        if rows == 0:
+            return
+        batch = np.empty(rows, dtype=dtype)
+        for name in dtype.names:
+            column_dtype = dtype.fields[name][0]
+            batch[name] = np.frombuffer(stream.read(rows * column_dtype.itemsize), dtype=column_dtype)
+        yield batch
@@ -0,0 +1,49 @@
+from django.db.models import Case, Count, IntegerField, OuterRef, Q, Subquery, Value, When
+
+from .models import HealthAlert, PatientProfile, VitalSign
+
+# Most urgent patients first
+STATUS_ORDER = Case(
+    When(current_status='Critical', then=Value(0)),
+    When(current_status='High', then=Value(1)),
+    default=Value(2),
+    output_field=IntegerField(),
+)
+
+
+def dashboard_queryset(doctor_id):
+    """Profiles + user + unread alert count + ids of the latest vital / unread alert"""
+    latest_vital = VitalSign.objects.filter(patient=OuterRef('pk')).order_by('-timestamp', '-id').values('id')[:1]
+    latest_alert = (
+        HealthAlert.objects.filter(patient=OuterRef('pk'), is_read=False)
+        .order_by('-created_at', '-id').values('id')[:1]
+    )
+    return (
+        PatientProfile.objects.filter(assigned_doctor_id=doctor_id)
+        .select_related('user')
+        .annotate(
+            unread_alerts=Count('alerts', filter=Q(alerts__is_read=False)),
+            latest_vital_id=Subquery(latest_vital),
+            latest_alert_id=Subquery(latest_alert),
+            status_order=STATUS_ORDER,
+        )
+        .order_by('status_order', 'user__first_name', 'user__username')
+    )
+
+
+def dashboard_patients(doctor_id):
+    """
+    Assigned patients for a doctor with everything the dashboard shows, in
+    three queries regardless of patient count:
+      1. dashboard_queryset()
+      2. those latest vitals
+      3. those latest unread alerts
+    Returns (profiles, {patient_id: VitalSign}, {patient_id: HealthAlert}).
+    """
+    profiles = list(dashboard_queryset(doctor_id))
+
+    vital_ids = [p.latest_vital_id for p in profiles if p.latest_vital_id]
+    alert_ids = [p.latest_alert_id for p in profiles if p.latest_alert_id]
+    vitals = {v.patient_id: v for v in VitalSign.objects.filter(id__in=vital_ids)} if vital_ids else {}
+    alerts = {a.patient_id: a for a in HealthAlert.objects.filter(id__in=alert_ids)} if alert_ids else {}
+    return profiles, vitals, alerts
@@ -0,0 +1,262 @@
+import csv
+import json
+import re
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from carebridge.caching import invalidate_patients
+from realtime.events import publish_patient_event
+
+from .alerts import detect_anomalies
+from .models import PatientProfile, VitalSign, split_blood_pressure
+from .rollups import update_rollups
+from .serializers import DashboardVitalSerializer
+
+BLOOD_PRESSURE_RE = re.compile(r'^\d{2,3}/\d{2,3}$')
+
+
+def whole_number(value):
+    """int() that rejects 72.9 instead of truncating it to 72 ('72.0' is fine)"""
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(value)
+    return int(number)
+
+
+# field -> (converter, (min, max) or None, default); None default means required
+VITAL_FIELDS = {
+    'heart_rate': (whole_number, (20, 250), None),
+    'steps': (whole_number, (0, 200000), 0),
+    'sleep_hours': (float, (0, 24), 0.0),
+    'temperature': (float, (85, 115), 98.6),
+    'oxygen_level': (whole_number, (50, 100), 98),
+}
+
+
+# ==========================================
+# 1. PARSERS (JSON / NDJSON / CSV)
+# ==========================================
+
+def rows_from_json(data):
+    """Accepts a list of readings or {"readings": [...]}"""
+    if isinstance(data, dict):
+        data = data.get('readings')
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of readings")
+    return data
+
+
+def _text_lines(lines):
+    """Decodes UTF-8 lines, dropping the byte order mark some exporters write"""
+    for number, line in enumerate(lines):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        yield line.removeprefix('\ufeff') if number == 0 else line
+
+
+def _check_row_limit(count, max_rows):
+    # Checked while reading, so an oversized body is never read to the end
+    if max_rows is not None and count > max_rows:
+        raise ValueError(f"At most {max_rows} readings per request")
+
+
+def rows_from_ndjson(lines, max_rows=None):
+    """One JSON object per line; blank lines are skipped"""
+    rows = []
+    for number, line in enumerate(_text_lines(lines), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            raise ValueError(f"Line {number} is not valid JSON")
+        _check_row_limit(len(rows), max_rows)
+    return rows
+
+
+def rows_from_csv(lines, max_rows=None):
+    """CSV with a header row naming the fields (patient, heart_rate, ...)"""
+    rows = []
+    for row in csv.DictReader(_text_lines(lines)):
+        rows.append(row)
+        _check_row_limit(len(rows), max_rows)
+    return rows
+
+
+# ==========================================
+# 2. VALIDATION (column at a time)
+# ==========================================
+
+def _is_blank(value):
+    return value is None or value == ''
+
+
+def _convert_column(values, converter, bounds, default, field, errors):
+    """Converts and range-checks one column, recording errors by row index"""
+    converted = []
+    for index, value in enumerate(values):
+        if _is_blank(value):
+            if default is None:
+                errors.setdefault(index, {})[field] = "This field is required."
+            converted.append(default)
+            continue
+        try:
+            number = converter(value)
+        except (TypeError, ValueError, OverflowError):
+            errors.setdefault(index, {})[field] = "Invalid number."
+            converted.append(None)
+            continue
+        if bounds and not (bounds[0] <= number <= bounds[1]):
+            errors.setdefault(index, {})[field] = f"Must be between {bounds[0]} and {bounds[1]}."
+        converted.append(number)
+    return converted
+
+
+def parse_timestamp(value):
+    if _is_blank(value):
+        return timezone.now()
+    parsed = parse_datetime(str(value))
+    if parsed is None:
+        raise ValueError
+    if timezone.is_naive(parsed):
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def validate_readings(rows):
+    """
+    Validates readings column by column and checks every patient id with a
+    single query. Returns (unsaved VitalSign objects, {row index: errors}).
+    """
+    errors = {}
+    count = len(rows)
+    not_objects = [index for index, row in enumerate(rows) if not isinstance(row, dict)]
+    rows = [row if isinstance(row, dict) else {} for row in rows]
+
+    columns = {}
+    for field, (converter, bounds, default) in VITAL_FIELDS.items():
+        columns[field] = _convert_column([row.get(field) for row in rows], converter, bounds, default, field, errors)
+
+    patients = _convert_column([row.get('patient') for row in rows], whole_number, None, None, 'patient', errors)
+    known = set(PatientProfile.objects.filter(id__in={p for p in patients if p is not None}).values_list('id', flat=True))
+    for index, patient_id in enumerate(patients):
+        if patient_id is not None and patient_id not in known:
+            errors.setdefault(index, {})['patient'] = f"Invalid pk \"{patient_id}\" - object does not exist."
+
+    blood_pressures = []
+    for index, row in enumerate(rows):
+        value = row.get('blood_pressure')
+        value = '120/80' if _is_blank(value) else str(value).strip()
+        if not BLOOD_PRESSURE_RE.match(value):
+            errors.setdefault(index, {})['blood_pressure'] = "Expected 'systolic/diastolic', e.g. 120/80."
+        blood_pressures.append(value)
+
+    timestamps = []
+    for index, row in enumerate(rows):
+        try:
+            timestamps.append(parse_timestamp(row.get('timestamp')))
+        except ValueError:
+            errors.setdefault(index, {})['timestamp'] = "Expected an ISO 8601 timestamp."
+            timestamps.append(None)
+
+    for index in not_objects:
+        errors[index] = {"non_field_errors": "Each reading must be an object."}
+
+    vitals = []
+    for index in range(count):
+        if index in errors:
+            continue
+        systolic, diastolic = split_blood_pressure(blood_pressures[index])
+        vitals.append(VitalSign(
+            patient_id=patients[index],
+            blood_pressure=blood_pressures[index],
+            systolic=systolic,
+            diastolic=diastolic,
+            timestamp=timestamps[index],
+            **{field: columns[field][index] for field in VITAL_FIELDS}
+        ))
+    return vitals, errors
+
+
+# ==========================================
+# 3. WRITES
+# ==========================================
+
+def refresh_snapshots(vitals):
+    """
+    Updates PatientProfile.last_* from the newest reading per patient, in one
+    bulk_update. Readings older than what is already stored are ignored.
+    """
+    latest = {}
+    for vital in vitals:
+        current = latest.get(vital.patient_id)
+        if current is None or vital.timestamp >= current.timestamp:
+            latest[vital.patient_id] = vital
+    if not latest:
+        return 0
+
+    # Newest reading already stored for each patient (excluding this batch)
+    stored = dict(
+        VitalSign.objects.filter(patient_id__in=latest)
+        .exclude(id__in=[vital.id for vital in latest.values() if vital.id])
+        .values('patient_id').annotate(newest=Max('timestamp')).values_list('patient_id', 'newest')
+    )
+    now = timezone.now()
+    profiles = [
+        PatientProfile(
+            id=patient_id,
+            last_heart_rate=vital.heart_rate,
+            last_temperature=vital.temperature,
+            last_blood_pressure=vital.blood_pressure,
+            last_update=now,
+        )
+        for patient_id, vital in latest.items()
+        if stored.get(patient_id) is None or vital.timestamp >= stored[patient_id]
+    ]
+    PatientProfile.objects.bulk_update(
+        profiles, ['last_heart_rate', 'last_temperature', 'last_blood_pressure', 'last_update']
+    )
+    return len(profiles)
+
+
+def publish_latest_vitals(vitals):
+    """One push event per patient with their newest reading in the batch"""
+    latest, counts = {}, {}
+    for vital in vitals:
+        counts[vital.patient_id] = counts.get(vital.patient_id, 0) + 1
+        current = latest.get(vital.patient_id)
+        if current is None or vital.timestamp >= current.timestamp:
+            latest[vital.patient_id] = vital
+    for patient_id, vital in latest.items():
+        publish_patient_event(patient_id, 'vitals', dict(DashboardVitalSerializer(vital).data, batch_size=counts[patient_id]))
+
+
+def ingest_vitals(rows):
+    """
+    Validates a batch of readings, inserts the valid ones with bulk_create and
+    refreshes the affected patients' snapshots, rollups and alerts, all in one
+    transaction.
+    """
+    _check_row_limit(len(rows), settings.VITALS_BULK_MAX_ROWS)
+
+    vitals, errors = validate_readings(rows)
+    with transaction.atomic():
+        created = VitalSign.objects.bulk_create(vitals, batch_size=500)
+        patients_updated = refresh_snapshots(created)
+        update_rollups(created)
+        alerts_created = detect_anomalies(created)
+        invalidate_patients(PatientProfile.objects.filter(id__in={vital.patient_id for vital in created}))
+        publish_latest_vitals(created)
+
+    return {
+        "created": len(created),
+        "patients_updated": patients_updated,
+        "alerts_created": alerts_created,
+        "errors": [{"row": index, "errors": errors[index]} for index in sorted(errors)],
+    }
@@ -0,0 +1,95 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from patients.alerts import get_detector
+from patients.ingest import ingest_vitals
+from patients.models import HealthAlert, PatientProfile, VitalSign
+
+
+def synthetic_readings(patient_ids, count, anomaly_rate, seed):
+    """Plausible readings one minute apart per patient, with occasional spikes"""
+    rng = random.Random(seed)
+    start = timezone.now() - timedelta(minutes=count // max(1, len(patient_ids)) + 1)
+    rows = []
+    for index in range(count):
+        patient_id = patient_ids[index % len(patient_ids)]
+        spike = rng.random() < anomaly_rate
+        rows.append({
+            'patient': patient_id,
+            'heart_rate': rng.randint(130, 160) if spike else int(rng.gauss(72, 4)),
+            'oxygen_level': rng.randint(85, 91) if spike else min(100, int(rng.gauss(97, 1))),
+            'temperature': round(rng.gauss(98.4, 0.3), 1),
+            'blood_pressure': f"{int(rng.gauss(120, 6))}/{int(rng.gauss(80, 4))}",
+            'timestamp': (start + timedelta(minutes=index // len(patient_ids))).isoformat(),
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the vital-sign anomaly detector: pure in-memory evaluation and full "
+        "bulk ingestion (insert + snapshots + rollups + alerts). Database work is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--patients', type=int, default=100)
+        parser.add_argument('--readings', type=int, default=50000)
+        parser.add_argument('--batch-size', type=int, default=5000, help="Readings per ingest call")
+        parser.add_argument('--anomaly-rate', type=float, default=0.01)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **opts):
+        patient_ids = list(range(1, opts['patients'] + 1))
+        rows = synthetic_readings(patient_ids, opts['readings'], opts['anomaly_rate'], opts['seed'])
+        self.bench_detector(rows)
+
+        User = get_user_model()
+        with transaction.atomic():
+            profiles = [
+                PatientProfile.objects.create(user=User.objects.create_user(username=f'bench-alerts-{i}'))
+                for i in patient_ids
+            ]
+            ids = {i: profile.id for i, profile in zip(patient_ids, profiles)}
+            for row in rows:
+                row['patient'] = ids[row['patient']]
+            self.bench_ingest(rows, opts['batch_size'])
+            transaction.set_rollback(True)
+
+    def bench_detector(self, rows):
+        detector = get_detector()
+        vitals = [
+            VitalSign(patient_id=row['patient'], timestamp=timezone.datetime.fromisoformat(row['timestamp']),
+                      **{k: row[k] for k in ('heart_rate', 'oxygen_level', 'temperature', 'blood_pressure')})
+            for row in rows
+        ]
+        states = {}
+        alerts = 0
+        start = time.perf_counter()
+        for vital in vitals:
+            found, _ = detector.evaluate(states.setdefault(vital.patient_id, {}), vital)
+            alerts += len(found)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.MIGRATE_HEADING("Detector only (in memory)"))
+        self.stdout.write(f"  {len(vitals)} readings in {elapsed * 1000:.0f} ms -> "
+                          f"{len(vitals) / elapsed:,.0f} readings/s, {alerts} alerts")
+
+    def bench_ingest(self, rows, batch_size):
+        alerts = 0
+        start = time.perf_counter()
+        for offset in range(0, len(rows), batch_size):
+            result = ingest_vitals(rows[offset:offset + batch_size])
+            alerts += result['alerts_created']
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Bulk ingestion (batches of {batch_size})"))
+        self.stdout.write(f"  {len(rows)} readings in {elapsed * 1000:.0f} ms -> "
+                          f"{len(rows) / elapsed:,.0f} readings/s, {alerts} alerts "
+                          f"({HealthAlert.objects.count()} total in DB before rollback)")
+        statuses = PatientProfile.objects.filter(user__username__startswith='bench-alerts-')
+        critical = statuses.filter(current_status='Critical').count()
+        self.stdout.write(f"  patients now Critical: {critical}/{statuses.count()}")
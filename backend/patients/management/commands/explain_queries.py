@@ -0,0 +1,103 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from communication.models import ChatMessage, ClinicalSummary
+from communication.views import before_cursor
+from jobs.models import Job
+from patients.dashboard import dashboard_queryset
+from patients.models import HealthAlert, PatientProfile, VitalBaseline, VitalRollup, VitalSign
+
+# Plan lines that mean "reads the whole table"
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?!CONSTANT ROW)(?!\()(?P<table>\w+)(?!.*\bUSING (COVERING )?INDEX\b)'),
+    'postgresql': re.compile(r'Seq Scan on (?P<table>\w+)'),
+}
+# Plan lines that mean "sorts in memory / a temp structure"
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY)'),
+    'postgresql': re.compile(r'^\s*(->\s*)?Sort\b'),
+}
+
+
+def known_queries():
+    """
+    The app's hot read paths, as (name, queryset). Parameter values are
+    placeholders; only the plan matters. Add new hot queries here.
+    """
+    now = timezone.now()
+    return [
+        ('chat history (latest page)',
+         ChatMessage.objects.filter(user_id=1).order_by('-timestamp', '-id')[:51]),
+        ('chat history (before cursor)',
+         ChatMessage.objects.filter(before_cursor(now, 1000), user_id=1).order_by('-timestamp', '-id')[:51]),
+        ('chat history (since timestamp)',
+         ChatMessage.objects.filter(user_id=1, timestamp__gt=now).order_by('timestamp', 'id')[:51]),
+        ('clinical summary (new patient messages)',
+         ChatMessage.objects.filter(user_id=1, is_user_sender=True, id__gt=100).order_by('id')),
+        ('clinical summary (stored note)',
+         ClinicalSummary.objects.filter(user_id=1)),
+        ('doctor dashboard',
+         dashboard_queryset(1)),
+        ('patients of a doctor',
+         PatientProfile.objects.filter(assigned_doctor_id=1)),
+        ('mood update (profiles by user)',
+         PatientProfile.objects.filter(user_id__in=[1, 2, 3])),
+        ('snapshot refresh (newest stored reading)',
+         VitalSign.objects.filter(patient_id__in=[1, 2]).values('patient_id').annotate(newest=Max('timestamp'))),
+        ('vitals of a patient (time range)',
+         VitalSign.objects.filter(patient_id=1, timestamp__gte=now - timedelta(days=1)).order_by('timestamp')),
+        ('vitals series (rollups)',
+         VitalRollup.objects.filter(patient_id=1, resolution='hour', bucket_start__gte=now, bucket_start__lt=now)
+         .order_by('bucket_start')),
+        ('anomaly baselines',
+         VitalBaseline.objects.filter(patient_id__in=[1, 2])),
+        ('unread alerts of a patient',
+         HealthAlert.objects.filter(patient_id=1, is_read=False).order_by('-created_at')),
+        ('job claim (next queued)',
+         Job.objects.filter(status='queued').order_by('id').values_list('id', flat=True)[:1]),
+        ('stale running jobs',
+         Job.objects.filter(status='running', started_at__lt=now)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the app's known hot queries through EXPLAIN and reports full table scans "
+        "(and in-memory sorts). Exits with an error if any query scans a table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan")
+        parser.add_argument('--allow-sorts', action='store_true', help="Do not warn about sorts")
+
+    def handle(self, *args, **opts):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"EXPLAIN audit is not supported on {vendor}")
+        scan_re, sort_re = FULL_SCAN_PATTERNS[vendor], SORT_PATTERNS[vendor]
+
+        failures = 0
+        for name, queryset in known_queries():
+            plan = queryset.explain()
+            scans = sorted({match.group('table') for match in scan_re.finditer(plan)})
+            sorts = [line.strip() for line in plan.splitlines() if sort_re.search(line)]
+
+            if scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {', '.join(scans)}"))
+            elif sorts and not opts['allow_sorts']:
+                self.stdout.write(self.style.WARNING(f"SORT       {name}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok         {name}"))
+            if opts['verbose_plans'] or scans:
+                for line in plan.splitlines():
+                    self.stdout.write(f"             {line}")
+
+        if failures:
+            raise CommandError(f"{failures} known queries do full table scans")
+        self.stdout.write(self.style.SUCCESS("No full table scans in known queries"))
@@ -0,0 +1,48 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from patients.columnar import iter_batches, iter_columnar, iter_csv, vitals_queryset
+from patients.ingest import parse_timestamp
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports raw vitals history as CSV or the binary columnar format "
+        "(see patients.columnar), streamed in batches so memory stays flat."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--patient', type=int, action='append', help="Only these patients (repeatable)")
+        parser.add_argument('--start', help="ISO 8601, inclusive")
+        parser.add_argument('--end', help="ISO 8601, exclusive")
+        parser.add_argument('--format', choices=['csv', 'columnar'], default='csv')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--output', help="File to write (default: stdout for CSV)")
+
+    def handle(self, *args, **opts):
+        try:
+            start = parse_timestamp(opts['start']) if opts['start'] else None
+            end = parse_timestamp(opts['end']) if opts['end'] else None
+        except ValueError:
+            raise CommandError("start/end must be ISO 8601 timestamps")
+        if opts['format'] == 'columnar' and not opts['output']:
+            raise CommandError("The columnar format is binary; pass --output")
+
+        batches = iter_batches(vitals_queryset(opts['patient'], start, end), opts['batch_size'])
+        if opts['format'] == 'csv':
+            chunks = (chunk.encode('utf-8') for chunk in iter_csv(batches))
+        else:
+            chunks = iter_columnar(batches)
+
+        out = open(opts['output'], 'wb') if opts['output'] else sys.stdout.buffer
+        try:
+            written = 0
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if opts['output']:
+                out.close()
+        if opts['output']:
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {opts['output']}"))
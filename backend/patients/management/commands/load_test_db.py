@@ -0,0 +1,192 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from communication.models import ChatMessage
+from patients.ingest import ingest_vitals
+from patients.models import PatientProfile
+
+USERNAME_PREFIX = 'loadtest-db-'
+
+# Configurations compared by --compare, each run in a fresh interpreter on its own file
+SQLITE_VARIANTS = (
+    ('sqlite, rollback journal (untuned)', {'SQLITE_TUNING': '0'}),
+    ('sqlite, WAL + busy timeout', {'SQLITE_TUNING': '1'}),
+)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+# ==========================================
+# 1. WRITE OPERATIONS (what the API does per request)
+# ==========================================
+
+def op_chat(rng, profile):
+    # ChatAPIView.post: user message then AI reply
+    ChatMessage.objects.create(user_id=profile['user_id'], content="I feel a bit tired today", is_user_sender=True)
+    ChatMessage.objects.create(user_id=profile['user_id'], content="Thank you for telling me.", is_user_sender=False)
+
+def op_vitals(rng, profile):
+    # Wearable sync: a few readings through the bulk ingest path (snapshots, rollups, alerts)
+    ingest_vitals([
+        {'patient': profile['id'], 'heart_rate': rng.randint(60, 90), 'oxygen_level': rng.randint(95, 99)}
+        for _ in range(3)
+    ])
+
+def op_mood(rng, profile):
+    # Mood batcher: one UPDATE per detected mood
+    PatientProfile.objects.filter(id=profile['id']).update(current_mood=rng.choice(['happy', 'sad', 'neutral']))
+
+OPERATIONS = {'chat': op_chat, 'vitals': op_vitals, 'mood': op_mood}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests database write throughput with concurrent chat saves, vitals ingestion and "
+        "mood updates against the configured database. --compare also runs untuned and tuned "
+        "SQLite side by side on temporary files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--patients', type=int, default=20)
+        parser.add_argument('--ops', default='chat,vitals,mood', help="Comma-separated mix of: chat, vitals, mood")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--compare', action='store_true')
+        parser.add_argument('--json', action='store_true', help="Print the raw result as JSON")
+
+    def handle(self, *args, **opts):
+        if opts['compare']:
+            return self.compare(opts)
+        result = self.run_load(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result))
+        else:
+            self.report(f"{connection.vendor} ({settings.DATABASES['default']['NAME']})", result)
+
+    # ------------------------------------------
+    def compare(self, opts):
+        forwarded = [
+            f"--threads={opts['threads']}", f"--seconds={opts['seconds']}", f"--patients={opts['patients']}",
+            f"--ops={opts['ops']}", f"--seed={opts['seed']}", '--json',
+        ]
+        runs = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for index, (label, env) in enumerate(SQLITE_VARIANTS):
+                path = os.path.join(tmp, f'load-{index}.sqlite3')
+                runs.append((label, dict(env, DATABASE_URL=f'sqlite:///{path}')))
+            if os.getenv('DATABASE_URL', '').split(':')[0] not in ('', 'sqlite'):
+                runs.append((f"configured DATABASE_URL ({connection.vendor})", {}))
+
+            for label, env in runs:
+                env = dict(os.environ, **env)
+                manage = [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py')]
+                subprocess.run(manage + ['migrate', '-v0'], env=env, check=True, cwd=settings.BASE_DIR)
+                completed = subprocess.run(
+                    manage + ['load_test_db'] + forwarded,
+                    env=env, capture_output=True, text=True, cwd=settings.BASE_DIR
+                )
+                if completed.returncode != 0:
+                    self.stdout.write(self.style.ERROR(f"{label}: failed\n{completed.stderr[-2000:]}"))
+                    continue
+                self.report(label, json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    def run_load(self, opts):
+        ops = [name.strip() for name in opts['ops'].split(',') if name.strip()]
+        unknown = [name for name in ops if name not in OPERATIONS]
+        if unknown:
+            raise ValueError(f"Unknown ops: {', '.join(unknown)}")
+
+        profiles = self.setup_patients(opts['patients'])
+        latencies = {name: [] for name in ops}
+        errors = {}
+        lock = threading.Lock()
+        deadline = time.monotonic() + opts['seconds']
+
+        def worker(index):
+            rng = random.Random(opts['seed'] + index)
+            local = {name: [] for name in ops}
+            try:
+                while time.monotonic() < deadline:
+                    name = rng.choice(ops)
+                    start = time.perf_counter()
+                    try:
+                        OPERATIONS[name](rng, rng.choice(profiles))
+                        local[name].append(time.perf_counter() - start)
+                    except Exception as e:
+                        with lock:
+                            key = f"{name}: {type(e).__name__}: {str(e)[:80]}"
+                            errors[key] = errors.get(key, 0) + 1
+            finally:
+                close_old_connections()
+                connection.close()
+                with lock:
+                    for name, values in local.items():
+                        latencies[name].extend(values)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(opts['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        self.cleanup()
+
+        return {
+            'threads': opts['threads'],
+            'seconds': wall,
+            'ops': {
+                name: {
+                    'count': len(values),
+                    'per_second': len(values) / wall,
+                    'p50_ms': percentile(values, 50) * 1000 if values else None,
+                    'p99_ms': percentile(values, 99) * 1000 if values else None,
+                }
+                for name, values in latencies.items()
+            },
+            'errors': errors,
+        }
+
+    def setup_patients(self, count):
+        self.cleanup()
+        User = get_user_model()
+        users = User.objects.bulk_create([User(username=f'{USERNAME_PREFIX}{i}') for i in range(count)])
+        users = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        PatientProfile.objects.bulk_create([PatientProfile(user=user) for user in users])
+        return list(PatientProfile.objects.filter(user__in=users).values('id', 'user_id'))
+
+    def cleanup(self):
+        get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def report(self, label, result):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {result['threads']} threads, {result['seconds']:.1f}s"))
+        total = 0
+        for name, stats in result['ops'].items():
+            total += stats['count']
+            if stats['count']:
+                self.stdout.write(
+                    f"  {name:<8} {stats['count']:7d} ops {stats['per_second']:9.1f}/s   "
+                    f"p50 {stats['p50_ms']:7.1f} ms   p99 {stats['p99_ms']:8.1f} ms"
+                )
+            else:
+                self.stdout.write(f"  {name:<8}       0 ops")
+        self.stdout.write(f"  total    {total:7d} ops {total / result['seconds']:9.1f}/s")
+        for key, count in sorted(result['errors'].items()):
+            self.stdout.write(self.style.WARNING(f"  {count} x {key}"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from patients.models import VitalRollup, VitalSign
+from patients.rollups import update_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the minute/hour/day vitals rollups from raw VitalSign rows (backfill or repair)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--patient', type=int, action='append', help="Only rebuild these patients (repeatable)")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        vitals = VitalSign.objects.order_by('patient_id', 'timestamp')
+        rollups = VitalRollup.objects.all()
+        if opts['patient']:
+            vitals = vitals.filter(patient_id__in=opts['patient'])
+            rollups = rollups.filter(patient_id__in=opts['patient'])
+
+        with transaction.atomic():
+            deleted, _ = rollups.delete()
+            chunk, total = [], 0
+            for vital in vitals.only('patient_id', 'timestamp', 'heart_rate', 'steps', 'sleep_hours', 'oxygen_level').iterator(chunk_size=opts['chunk_size']):
+                chunk.append(vital)
+                if len(chunk) >= opts['chunk_size']:
+                    update_rollups(chunk)
+                    total += len(chunk)
+                    chunk = []
+            update_rollups(chunk)
+            total += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt rollups from {total} readings ({deleted} old rollup rows removed, "
+            f"{VitalRollup.objects.count()} now)"
+        ))
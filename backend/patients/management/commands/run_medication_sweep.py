@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from patients.medications import sweep
+from realtime.events import mark_producer
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the medication scheduler: expands dose schedules ahead, opens due doses "
+        "(resetting is_taken) and marks overdue ones missed with a HealthAlert."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=settings.MEDICATION_SWEEP_INTERVAL)
+        parser.add_argument('--once', action='store_true', help="Run a single sweep and exit")
+
+    def handle(self, *args, **opts):
+        # Dose alerts reach clients only through a cross-process broker
+        mark_producer('run_medication_sweep')
+        while True:
+            close_old_connections()
+            start = time.perf_counter()
+            try:
+                result = sweep()
+                self.stdout.write(
+                    f"Sweep: {result['doses_scheduled']} scheduled, {result['doses_due']} due, "
+                    f"{result['doses_missed']} missed, {result['alerts_created']} alerts "
+                    f"({(time.perf_counter() - start) * 1000:.0f} ms)"
+                )
+            except Exception as e:
+                print(f"Medication sweep Error: {e}")
+            if opts['once']:
+                return
+            time.sleep(max(0.0, opts['interval'] - (time.perf_counter() - start)))
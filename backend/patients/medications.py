@@ -0,0 +1,273 @@
+import re
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from carebridge.caching import invalidate_patients
+from realtime.events import publish_patient_event
+
+from .models import HealthAlert, Medication, MedicationDose, PatientProfile
+from .serializers import HealthAlertSerializer
+
+DOSE_TIME_RE = re.compile(r'^([01]?\d|2[0-3]):([0-5]\d)$')
+
+# time_of_day words -> default clock time
+TIME_OF_DAY_TIMES = {
+    'morning': '08:00',
+    'noon': '12:00',
+    'afternoon': '14:00',
+    'evening': '18:00',
+    'night': '21:00',
+    'bedtime': '21:00',
+}
+# Doses per day -> default clock times
+FREQUENCY_TIMES = {
+    1: ['08:00'],
+    2: ['08:00', '20:00'],
+    3: ['08:00', '14:00', '20:00'],
+    4: ['08:00', '12:00', '16:00', '20:00'],
+}
+FREQUENCY_WORDS = {'once': 1, 'twice': 2, 'three times': 3, 'thrice': 3, 'four times': 4}
+
+
+# ==========================================
+# 1. SCHEDULES (pure)
+# ==========================================
+
+def parse_dose_time(value):
+    match = DOSE_TIME_RE.match(str(value).strip())
+    if not match:
+        raise ValueError(f"Invalid dose time '{value}', expected HH:MM")
+    return time(int(match.group(1)), int(match.group(2)))
+
+
+def _doses_per_day(frequency):
+    text = (frequency or '').lower()
+    for word, count in FREQUENCY_WORDS.items():
+        if word in text:
+            return count
+    match = re.search(r'(\d+)\s*(x|times)', text)
+    return int(match.group(1)) if match else None
+
+
+def schedule_times(medication):
+    """
+    Daily dose times for a medication: dose_times when set, otherwise derived
+    from the free-text time_of_day ("Morning, Evening") and frequency ("Twice daily").
+    """
+    if medication.dose_times:
+        return sorted({parse_dose_time(value) for value in medication.dose_times})
+
+    text = (medication.time_of_day or '').lower()
+    named = sorted({value for word, value in TIME_OF_DAY_TIMES.items() if word in text})
+    count = _doses_per_day(medication.frequency)
+    if named and (count is None or len(named) == count):
+        values = named
+    elif count in FREQUENCY_TIMES:
+        values = FREQUENCY_TIMES[count]
+    else:
+        values = named or FREQUENCY_TIMES[1]
+    return [parse_dose_time(value) for value in values]
+
+
+def dose_datetimes(times, start, end):
+    """Dose datetimes in (start, end], with clock times in the default time zone"""
+    tz = timezone.get_default_timezone()
+    day = timezone.localtime(start, tz).date()
+    last_day = timezone.localtime(end, tz).date()
+    while day <= last_day:
+        for at in times:
+            due = timezone.make_aware(datetime.combine(day, at), tz)
+            if start < due <= end:
+                yield due
+        day += timedelta(days=1)
+
+
+# ==========================================
+# 2. SWEEP (expand -> open -> miss)
+# ==========================================
+
+def expand_schedules(now=None, medications=None):
+    """
+    Creates dose rows up to the horizon for active medications whose
+    expansion is running out (found via medication_schedule_idx, so
+    medications with enough doses ahead are never read). Returns doses created.
+    """
+    now = now or timezone.now()
+    horizon = now + timedelta(hours=settings.MEDICATION_SCHEDULE_HORIZON_HOURS)
+    refresh_before = now + timedelta(hours=settings.MEDICATION_SCHEDULE_HORIZON_HOURS / 2)
+    if medications is None:
+        medications = Medication.objects.all()
+    pending = (
+        medications.filter(is_active=True)
+        .filter(Q(scheduled_through__isnull=True) | Q(scheduled_through__lt=refresh_before))
+        .only('id', 'patient_id', 'frequency', 'time_of_day', 'dose_times', 'scheduled_through')
+        .order_by('id')
+    )
+
+    created = 0
+    while True:
+        batch = list(pending[:settings.MEDICATION_SWEEP_BATCH_SIZE])
+        if not batch:
+            return created
+        doses = []
+        for medication in batch:
+            # New schedules start now; past doses are never invented
+            start = max(medication.scheduled_through or now, now)
+            try:
+                times = schedule_times(medication)
+            except ValueError as e:
+                print(f"Medication {medication.id} schedule Error: {e}")
+                continue
+            doses.extend(
+                MedicationDose(medication_id=medication.id, patient_id=medication.patient_id, due_at=due)
+                for due in dose_datetimes(times, start, horizon)
+            )
+        with transaction.atomic():
+            MedicationDose.objects.bulk_create(doses, batch_size=500, ignore_conflicts=True)
+            Medication.objects.filter(id__in=[m.id for m in batch]).update(scheduled_through=horizon)
+        created += len(doses)
+
+
+def open_due_doses(now=None):
+    """
+    Moves doses whose time has come from scheduled to due, and resets
+    is_taken on their medications (the new dose has not been taken yet).
+    """
+    now = now or timezone.now()
+    due = MedicationDose.objects.filter(status='scheduled', due_at__lte=now).order_by('due_at')
+    opened = 0
+    while True:
+        rows = list(due.values_list('id', 'medication_id')[:settings.MEDICATION_SWEEP_BATCH_SIZE])
+        if not rows:
+            return opened
+        with transaction.atomic():
+            opened += MedicationDose.objects.filter(id__in=[r[0] for r in rows], status='scheduled').update(status='due')
+            Medication.objects.filter(id__in={r[1] for r in rows}, is_taken=True).update(is_taken=False)
+
+
+def _missed_message(doses):
+    def describe(dose):
+        due = timezone.localtime(dose['due_at']).strftime('%b %d %H:%M')
+        return f"{dose['medication__name']} {dose['medication__dosage']} (due {due})".replace('  ', ' ')
+
+    if len(doses) == 1:
+        return f"Missed dose: {describe(doses[0])}"
+    return f"Missed {len(doses)} doses: " + "; ".join(describe(dose) for dose in doses)
+
+
+def mark_missed_doses(now=None):
+    """
+    Marks due doses past the grace period as missed and raises one
+    HealthAlert per patient per batch. Rows are claimed with SKIP LOCKED
+    where supported, so concurrent sweeps never alert twice.
+    Returns (doses missed, alerts created).
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(minutes=settings.MEDICATION_MISSED_GRACE_MINUTES)
+    overdue = MedicationDose.objects.filter(status='due', due_at__lt=cutoff).order_by('due_at')
+    missed = alerted = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                overdue.select_for_update(skip_locked=True, of=('self',))
+                .values('id', 'patient_id', 'due_at', 'medication__name', 'medication__dosage')
+                [:settings.MEDICATION_SWEEP_BATCH_SIZE]
+            )
+            if not rows:
+                return missed, alerted
+            missed += MedicationDose.objects.filter(id__in=[r['id'] for r in rows]).update(status='missed')
+
+            by_patient = {}
+            for row in rows:
+                by_patient.setdefault(row['patient_id'], []).append(row)
+            alerts = [
+                HealthAlert(patient_id=patient_id, alert_type='Medium', message=_missed_message(doses))
+                for patient_id, doses in by_patient.items()
+            ]
+            HealthAlert.objects.bulk_create(alerts, batch_size=500)
+            for alert in alerts:
+                publish_patient_event(alert.patient_id, 'alert', HealthAlertSerializer(alert).data)
+            invalidate_patients(PatientProfile.objects.filter(id__in=by_patient))
+            alerted += len(alerts)
+
+
+def sweep(now=None):
+    """One scheduler tick; only touches medications and doses that need work"""
+    now = now or timezone.now()
+    scheduled = expand_schedules(now)
+    opened = open_due_doses(now)
+    missed, alerts = mark_missed_doses(now)
+    return {'doses_scheduled': scheduled, 'doses_due': opened, 'doses_missed': missed, 'alerts_created': alerts}
+
+
+# ==========================================
+# 3. ADHERENCE
+# ==========================================
+
+def reschedule(medication):
+    """
+    Call after a medication's schedule or active flag changes: drops its
+    future doses (an open dose is skipped if it was deactivated) and
+    re-expands from now.
+    """
+    with transaction.atomic():
+        medication.doses.filter(status='scheduled').delete()
+        if not medication.is_active:
+            medication.doses.filter(status='due').update(status='skipped')
+        Medication.objects.filter(id=medication.id).update(scheduled_through=None)
+    expand_schedules(medications=Medication.objects.filter(id=medication.id))
+
+
+def take_dose(medication, now=None):
+    """
+    Records the current dose as taken: the oldest open dose, or the next one
+    if it is due within MEDICATION_EARLY_WINDOW_MINUTES. Returns the dose or None.
+    """
+    now = now or timezone.now()
+    early = now + timedelta(minutes=settings.MEDICATION_EARLY_WINDOW_MINUTES)
+    with transaction.atomic():
+        dose = (
+            medication.doses.select_for_update()
+            .filter(Q(status='due') | Q(status='scheduled', due_at__lte=early))
+            .order_by('due_at').first()
+        )
+        if dose is None:
+            return None
+        dose.status, dose.taken_at = 'taken', now
+        dose.save(update_fields=['status', 'taken_at'])
+        Medication.objects.filter(id=medication.id).update(is_taken=True)
+    return dose
+
+
+def adherence(patient_id, start, end):
+    """Taken vs missed doses per medication for doses due in [start, end)"""
+    counts = (
+        MedicationDose.objects.filter(patient_id=patient_id, due_at__gte=start, due_at__lt=end)
+        .values('medication_id', 'medication__name')
+        .annotate(taken=Count('id', filter=Q(status='taken')), missed=Count('id', filter=Q(status='missed')))
+        .order_by('medication__name')
+    )
+
+    def rate(taken, missed):
+        return round(taken / (taken + missed), 3) if taken + missed else None
+
+    medications = [
+        {'medication': row['medication_id'], 'name': row['medication__name'], 'taken': row['taken'],
+         'missed': row['missed'], 'rate': rate(row['taken'], row['missed'])}
+        for row in counts
+    ]
+    taken = sum(m['taken'] for m in medications)
+    missed = sum(m['missed'] for m in medications)
+    return {
+        'patient': patient_id,
+        'start': start,
+        'end': end,
+        'taken': taken,
+        'missed': missed,
+        'rate': rate(taken, missed),
+        'medications': medications,
+    }
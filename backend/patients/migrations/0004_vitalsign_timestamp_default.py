@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0003_patientprofile_assigned_doctor_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vitalsign',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0004_vitalsign_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VitalRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour'), ('day', 'Day')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.IntegerField(default=0)),
+                ('heart_rate_min', models.IntegerField()),
+                ('heart_rate_max', models.IntegerField()),
+                ('heart_rate_sum', models.BigIntegerField()),
+                ('steps_min', models.IntegerField()),
+                ('steps_max', models.IntegerField()),
+                ('steps_sum', models.BigIntegerField()),
+                ('sleep_hours_min', models.FloatField()),
+                ('sleep_hours_max', models.FloatField()),
+                ('sleep_hours_sum', models.FloatField()),
+                ('oxygen_level_min', models.IntegerField()),
+                ('oxygen_level_max', models.IntegerField()),
+                ('oxygen_level_sum', models.BigIntegerField()),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vital_rollups', to='patients.patientprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('patient', 'resolution', 'bucket_start'), name='unique_vital_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0005_vitalrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VitalBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('patient', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='vital_baseline', to='patients.patientprofile')),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0006_vitalbaseline'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='healthalert',
+            name='patient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='patients.patientprofile'),
+        ),
+        migrations.AlterField(
+            model_name='vitalsign',
+            name='patient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='vitals', to='patients.patientprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='healthalert',
+            index=models.Index(fields=['patient', 'created_at'], name='alert_patient_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthalert',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['patient', 'created_at'], name='alert_patient_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vitalsign',
+            index=models.Index(fields=['patient', 'timestamp'], name='vital_patient_timestamp_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:17
+
+from django.db import migrations, models
+
+
+def split_existing(apps, schema_editor):
+    # One UPDATE per distinct reading string rather than one per row
+    VitalSign = apps.get_model('patients', 'VitalSign')
+    values = VitalSign.objects.filter(systolic__isnull=True).values_list('blood_pressure', flat=True).distinct()
+    for value in list(values):
+        try:
+            systolic, diastolic = (int(part) for part in value.split('/'))
+        except ValueError:
+            continue
+        VitalSign.objects.filter(blood_pressure=value).update(systolic=systolic, diastolic=diastolic)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vitalsign',
+            name='diastolic',
+            field=models.SmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vitalsign',
+            name='systolic',
+            field=models.SmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(split_existing, migrations.RunPython.noop),
+    ]
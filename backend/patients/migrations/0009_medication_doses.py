@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0008_vitalsign_systolic_diastolic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicationDose',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('due', 'Due'), ('taken', 'Taken'), ('missed', 'Missed'), ('skipped', 'Skipped')], default='scheduled', max_length=20)),
+                ('taken_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='dose_times',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='medication',
+            name='scheduled_through',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='medication',
+            index=models.Index(fields=['is_active', 'scheduled_through'], name='medication_schedule_idx'),
+        ),
+        migrations.AddField(
+            model_name='medicationdose',
+            name='medication',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='doses', to='patients.medication'),
+        ),
+        migrations.AddField(
+            model_name='medicationdose',
+            name='patient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='medication_doses', to='patients.patientprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='medicationdose',
+            index=models.Index(fields=['status', 'due_at'], name='dose_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicationdose',
+            index=models.Index(fields=['patient', 'due_at'], name='dose_patient_due_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='medicationdose',
+            constraint=models.UniqueConstraint(fields=('medication', 'due_at'), name='unique_medication_dose'),
+        ),
+    ]
@@ -1,5 +1,24 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+
+# mmHg accepted for the split systolic/diastolic columns; keeps garbage such
+# as '40000/80' out of SmallIntegerField and the <i2 export columns
+BLOOD_PRESSURE_BOUNDS = (20, 300)
+
+
+def split_blood_pressure(value):
+    """'120/80' -> (120, 80); (None, None) if it cannot be parsed or is out of range"""
+    try:
+        systolic, diastolic = (int(part) for part in str(value).split('/'))
+    except (TypeError, ValueError):
+        return None, None
+    low, high = BLOOD_PRESSURE_BOUNDS
+    if not (low <= systolic <= high and low <= diastolic <= high):
+        return None, None
+    return systolic, diastolic
+
 
 class PatientProfile(models.Model):
     """
@@ -54,19 +73,87 @@ class VitalSign(models.Model):
     Historical log of health metrics.
     Source: vital_signs_model.dart
     """
-    patient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='vitals')
+    # Indexed by vital_patient_timestamp_idx (patient first), so no separate FK index
+    patient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='vitals', db_index=False)
     heart_rate = models.IntegerField()
     steps = models.IntegerField(default=0)
     sleep_hours = models.FloatField(default=0.0)
     blood_pressure = models.CharField(max_length=20, default='120/80')
+    # blood_pressure split into integers for analytics and columnar export;
+    # derived on save (and by bulk ingest), never set by clients
+    systolic = models.SmallIntegerField(null=True, blank=True, editable=False)
+    diastolic = models.SmallIntegerField(null=True, blank=True, editable=False)
     temperature = models.FloatField(default=98.6)
     oxygen_level = models.IntegerField(default=98)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Defaults to now, but devices may send the time the reading was taken
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Latest reading per patient (dashboard, snapshots) and time-range scans
+            models.Index(fields=['patient', 'timestamp'], name='vital_patient_timestamp_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.systolic, self.diastolic = split_blood_pressure(self.blood_pressure)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Vitals for {self.patient.user.username} at {self.timestamp}"
 
 
+class VitalRollup(models.Model):
+    """
+    Pre-aggregated vitals per patient and time bucket (minute / hour / day).
+    Stores sums rather than means so new readings can be merged in incrementally.
+    """
+    RESOLUTION_CHOICES = (
+        ('minute', 'Minute'),
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    )
+
+    patient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='vital_rollups')
+    resolution = models.CharField(max_length=10, choices=RESOLUTION_CHOICES)
+    bucket_start = models.DateTimeField()
+    count = models.IntegerField(default=0)
+
+    heart_rate_min = models.IntegerField()
+    heart_rate_max = models.IntegerField()
+    heart_rate_sum = models.BigIntegerField()
+    steps_min = models.IntegerField()
+    steps_max = models.IntegerField()
+    steps_sum = models.BigIntegerField()
+    sleep_hours_min = models.FloatField()
+    sleep_hours_max = models.FloatField()
+    sleep_hours_sum = models.FloatField()
+    oxygen_level_min = models.IntegerField()
+    oxygen_level_max = models.IntegerField()
+    oxygen_level_sum = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['patient', 'resolution', 'bucket_start'], name='unique_vital_rollup_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.resolution} rollup for patient {self.patient_id} at {self.bucket_start}"
+
+
+class VitalBaseline(models.Model):
+    """
+    Rolling per-patient baseline used by the anomaly detector.
+    `state` holds a fixed-size EWMA (count, mean, variance) per metric plus the
+    time each alert rule last fired, so it never grows with history.
+    """
+    patient = models.OneToOneField(PatientProfile, on_delete=models.CASCADE, related_name='vital_baseline')
+    state = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Baseline for patient {self.patient_id}"
+
+
 class Medication(models.Model):
     """
     Prescriptions and schedule.
@@ -77,14 +164,63 @@ class Medication(models.Model):
     dosage = models.CharField(max_length=100)
     frequency = models.CharField(max_length=100) # e.g., "Once daily"
     time_of_day = models.CharField(max_length=100) # e.g., "Morning"
-    is_taken = models.BooleanField(default=False)
+    is_taken = models.BooleanField(default=False) # Current dose; reset when the next dose falls due
     notes = models.TextField(blank=True, null=True)
     color_hex = models.CharField(max_length=10, default='#C6E2B5') # For UI styling
 
+    # Explicit dose times ["08:00", "20:00"] in TIME_ZONE; when empty they are
+    # derived from frequency / time_of_day (see patients.medications)
+    dose_times = models.JSONField(default=list, blank=True)
+    is_active = models.BooleanField(default=True)
+    # Doses exist up to here; the scheduler only expands medications nearing it
+    scheduled_through = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Scheduler: active medications whose dose horizon is running out
+            models.Index(fields=['is_active', 'scheduled_through'], name='medication_schedule_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.patient.user.username}"
 
 
+class MedicationDose(models.Model):
+    """
+    One scheduled dose of a medication, expanded ahead of time from its schedule.
+    scheduled -> due (its time has come) -> taken / missed / skipped.
+    """
+    STATUS_CHOICES = (
+        ('scheduled', 'Scheduled'),
+        ('due', 'Due'),
+        ('taken', 'Taken'),
+        ('missed', 'Missed'),
+        ('skipped', 'Skipped'),
+    )
+
+    medication = models.ForeignKey(Medication, on_delete=models.CASCADE, related_name='doses')
+    # Denormalised from the medication for per-patient adherence queries
+    patient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='medication_doses', db_index=False)
+    due_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
+    taken_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # Re-expanding a schedule never duplicates a dose
+            models.UniqueConstraint(fields=['medication', 'due_at'], name='unique_medication_dose'),
+        ]
+        indexes = [
+            # The sweep walks only doses in one status that are past a due time
+            models.Index(fields=['status', 'due_at'], name='dose_status_due_idx'),
+            # A patient's dose history / adherence over a period
+            models.Index(fields=['patient', 'due_at'], name='dose_patient_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.medication.name} dose due {self.due_at} ({self.status})"
+
+
 class HealthAlert(models.Model):
     """
     System generated alerts based on vitals or missed meds.
@@ -97,11 +233,23 @@ class HealthAlert(models.Model):
         ('Low', 'Low'),
     )
 
-    patient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='alerts')
+    # Indexed by alert_patient_created_idx (patient first), so no separate FK index
+    patient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='alerts', db_index=False)
     alert_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A patient's alerts, newest first
+            models.Index(fields=['patient', 'created_at'], name='alert_patient_created_idx'),
+            # Unread alert counts and the newest unread alert per patient (partial:
+            # only unread rows, and usable for the bare `NOT is_read` filter SQLite gets)
+            models.Index(
+                fields=['patient', 'created_at'], condition=models.Q(is_read=False), name='alert_patient_unread_idx'
+            ),
+        ]
+
     def __str__(self):
         return f"{self.alert_type}: {self.patient.user.username}"
\ No newline at end of file
@@ -0,0 +1,190 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .models import VitalRollup, VitalSign
+
+ROLLUP_METRICS = ('heart_rate', 'steps', 'sleep_hours', 'oxygen_level')
+
+# Resolution -> bucket length, finest first
+RESOLUTIONS = (
+    ('minute', timedelta(minutes=1)),
+    ('hour', timedelta(hours=1)),
+    ('day', timedelta(days=1)),
+)
+
+# (patient, resolution) groups per locking query; keeps the OR chain well under
+# SQLite's expression depth limit
+LOCK_GROUPS_PER_QUERY = 100
+
+
+def bucket_start(timestamp, resolution):
+    """Floors a timestamp to the start of its UTC bucket"""
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    if resolution == 'minute':
+        return timestamp.replace(second=0, microsecond=0)
+    elif resolution == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# ==========================================
+# 1. INCREMENTAL MAINTENANCE
+# ==========================================
+
+def _aggregate(vitals):
+    """Folds readings into {(patient_id, resolution, bucket_start): stats} in memory"""
+    buckets = {}
+    for vital in vitals:
+        for resolution, _ in RESOLUTIONS:
+            key = (vital.patient_id, resolution, bucket_start(vital.timestamp, resolution))
+            stats = buckets.get(key)
+            if stats is None:
+                stats = buckets[key] = {'count': 0}
+                for metric in ROLLUP_METRICS:
+                    value = getattr(vital, metric)
+                    stats.update({f'{metric}_min': value, f'{metric}_max': value, f'{metric}_sum': 0})
+            stats['count'] += 1
+            for metric in ROLLUP_METRICS:
+                value = getattr(vital, metric)
+                stats[f'{metric}_min'] = min(stats[f'{metric}_min'], value)
+                stats[f'{metric}_max'] = max(stats[f'{metric}_max'], value)
+                stats[f'{metric}_sum'] += value
+    return buckets
+
+
+def _merge(rollup, stats):
+    rollup.count += stats['count']
+    for metric in ROLLUP_METRICS:
+        setattr(rollup, f'{metric}_min', min(getattr(rollup, f'{metric}_min'), stats[f'{metric}_min']))
+        setattr(rollup, f'{metric}_max', max(getattr(rollup, f'{metric}_max'), stats[f'{metric}_max']))
+        setattr(rollup, f'{metric}_sum', getattr(rollup, f'{metric}_sum') + stats[f'{metric}_sum'])
+
+
+def _apply(buckets):
+    # Fetch (and lock) exactly the buckets this batch touches: an OR of
+    # per-patient bucket_start__in lists, so other buckets in between stay unlocked
+    starts = {}
+    for patient_id, resolution, start in buckets:
+        starts.setdefault((patient_id, resolution), []).append(start)
+    groups = list(starts.items())
+
+    existing = {}
+    for offset in range(0, len(groups), LOCK_GROUPS_PER_QUERY):
+        lookup = Q()
+        for (patient_id, resolution), values in groups[offset:offset + LOCK_GROUPS_PER_QUERY]:
+            lookup |= Q(patient_id=patient_id, resolution=resolution, bucket_start__in=values)
+        for rollup in VitalRollup.objects.select_for_update().filter(lookup):
+            existing[(rollup.patient_id, rollup.resolution, rollup.bucket_start)] = rollup
+
+    new, to_update = {}, []
+    for key, stats in buckets.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            new[key] = stats
+        else:
+            _merge(rollup, stats)
+            to_update.append(rollup)
+    to_create = _new_rollups(new)
+
+    update_fields = ['count'] + [f'{metric}_{stat}' for metric in ROLLUP_METRICS for stat in ('min', 'max', 'sum')]
+    VitalRollup.objects.bulk_update(to_update, update_fields, batch_size=500)
+    VitalRollup.objects.bulk_create(to_create, batch_size=500)
+
+
+def _new_rollups(buckets):
+    return [
+        VitalRollup(patient_id=patient_id, resolution=resolution, bucket_start=start, **stats)
+        for (patient_id, resolution, start), stats in buckets.items()
+    ]
+
+
+def update_rollups(vitals):
+    """
+    Merges new readings into their minute/hour/day rollups.
+    Cost is proportional to the buckets touched, not to stored history.
+    Call inside the transaction that inserted the readings.
+    """
+    buckets = _aggregate(vitals)
+    if not buckets:
+        return
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                _apply(buckets)
+            return
+        except IntegrityError:
+            # A concurrent ingest created one of our buckets first; re-read and merge
+            if attempt:
+                raise
+
+
+def rebuild_rollups(points):
+    """
+    Recomputes the rollups of every UTC day containing one of the given
+    (patient_id, timestamp) points from the stored readings. Used when a
+    reading is edited or deleted, which incremental merging cannot undo.
+    Cost is proportional to the readings in the affected days.
+    """
+    day = dict(RESOLUTIONS)['day']
+    with transaction.atomic():
+        for patient_id, start in {(patient_id, bucket_start(timestamp, 'day')) for patient_id, timestamp in points}:
+            rollups = VitalRollup.objects.filter(patient_id=patient_id, bucket_start__gte=start, bucket_start__lt=start + day)
+            # Concurrent ingests merging into these buckets wait for the rebuild
+            list(rollups.select_for_update().values_list('id', flat=True))
+            rollups.delete()
+            vitals = VitalSign.objects.filter(
+                patient_id=patient_id, timestamp__gte=start, timestamp__lt=start + day
+            ).only('patient_id', 'timestamp', *ROLLUP_METRICS)
+            VitalRollup.objects.bulk_create(_new_rollups(_aggregate(vitals)), batch_size=500)
+
+
+# ==========================================
+# 2. QUERIES
+# ==========================================
+
+def choose_resolution(start, end, max_points):
+    """Finest resolution whose bucket count over the range fits the point budget"""
+    span = end - start
+    for resolution, length in RESOLUTIONS:
+        if span / length <= max_points:
+            return resolution
+    return RESOLUTIONS[-1][0]
+
+
+def _combine(rows):
+    """Merges consecutive rollup rows into one point"""
+    point = {'t': rows[0].bucket_start, 'count': sum(row.count for row in rows)}
+    for metric in ROLLUP_METRICS:
+        total = sum(getattr(row, f'{metric}_sum') for row in rows)
+        point[metric] = {
+            'min': min(getattr(row, f'{metric}_min') for row in rows),
+            'max': max(getattr(row, f'{metric}_max') for row in rows),
+            'mean': round(total / point['count'], 2) if point['count'] else None,
+        }
+    return point
+
+
+def vitals_series(patient_id, start, end, max_points, metrics=ROLLUP_METRICS):
+    """
+    Chart-ready series for a patient between start and end with at most
+    max_points points, read from the coarsest rollup that still fits.
+    """
+    resolution = choose_resolution(start, end, max_points)
+    rows = list(
+        VitalRollup.objects.filter(
+            patient_id=patient_id,
+            resolution=resolution,
+            bucket_start__gte=bucket_start(start, resolution),
+            bucket_start__lt=end,
+        ).order_by('bucket_start')
+    )
+    # Very long ranges at day resolution: merge neighbouring days to stay in budget
+    group = max(1, -(-len(rows) // max_points))
+    points = [_combine(rows[i:i + group]) for i in range(0, len(rows), group)]
+    for point in points:
+        for metric in ROLLUP_METRICS:
+            if metric not in metrics:
+                del point[metric]
+    return {'patient': patient_id, 'resolution': resolution, 'points': points}
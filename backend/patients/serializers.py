@@ -1,12 +1,97 @@
 from rest_framework import serializers
-from .models import PatientProfile, VitalSign, HealthAlert
+from .models import PatientProfile, VitalSign, HealthAlert, Medication, MedicationDose
 
 class VitalSignSerializer(serializers.ModelSerializer):
     class Meta:
         model = VitalSign
         fields = '__all__'
 
+    def validate(self, attrs):
+        # Same ranges and format as bulk ingest, so both paths store the same data
+        from .ingest import BLOOD_PRESSURE_RE, VITAL_FIELDS # ingest imports this module
+        errors = {}
+        for field, (_, bounds, _) in VITAL_FIELDS.items():
+            value = attrs.get(field)
+            if value is not None and bounds and not (bounds[0] <= value <= bounds[1]):
+                errors[field] = f"Must be between {bounds[0]} and {bounds[1]}."
+        blood_pressure = attrs.get('blood_pressure')
+        if blood_pressure is not None and not BLOOD_PRESSURE_RE.match(blood_pressure):
+            errors['blood_pressure'] = "Expected 'systolic/diastolic', e.g. 120/80."
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
 class PatientProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = PatientProfile
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class MedicationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Medication
+        fields = '__all__'
+        # Follows the dose schedule; doses are recorded via POST .../medications/<id>/take/
+        read_only_fields = ['is_taken']
+
+    def validate(self, attrs):
+        # is_taken is dropped like any read-only field (so a GET payload can be
+        # sent back), but trying to change it points clients to take/
+        if 'is_taken' in self.initial_data:
+            current = self.instance.is_taken if self.instance is not None else False
+            if serializers.BooleanField().to_internal_value(self.initial_data['is_taken']) != current:
+                raise serializers.ValidationError(
+                    {'is_taken': "Read-only. POST /api/patients/medications/<id>/take/ to record a dose."}
+                )
+        return attrs
+
+    def validate_dose_times(self, value):
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Expected a list of HH:MM times.")
+        from .medications import parse_dose_time # medications imports this module
+        try:
+            return sorted({parse_dose_time(v).strftime('%H:%M') for v in value})
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+class MedicationDoseSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MedicationDose
+        fields = ['id', 'medication', 'due_at', 'status', 'taken_at']
+
+class HealthAlertSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HealthAlert
+        fields = ['id', 'alert_type', 'message', 'is_read', 'created_at']
+
+class DashboardVitalSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = VitalSign
+        fields = ['heart_rate', 'steps', 'sleep_hours', 'blood_pressure', 'temperature', 'oxygen_level', 'timestamp']
+
+class DashboardPatientSerializer(serializers.ModelSerializer):
+    """
+    One row of the doctor dashboard. Expects the annotations and lookups
+    built by patients.dashboard.dashboard_patients (no extra queries).
+    """
+    username = serializers.CharField(source='user.username')
+    name = serializers.CharField(source='user.get_full_name')
+    unread_alerts = serializers.IntegerField()
+    latest_vital = serializers.SerializerMethodField()
+    latest_alert = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PatientProfile
+        fields = [
+            'id', 'username', 'name', 'medical_condition', 'language', 'caregiver_name',
+            'current_status', 'current_mood', 'satisfaction_score',
+            'last_heart_rate', 'last_temperature', 'last_blood_pressure', 'last_update',
+            'unread_alerts', 'latest_vital', 'latest_alert',
+        ]
+
+    def get_latest_vital(self, obj):
+        vital = self.context['latest_vitals'].get(obj.id)
+        return DashboardVitalSerializer(vital).data if vital else None
+
+    def get_latest_alert(self, obj):
+        alert = self.context['latest_alerts'].get(obj.id)
+        return HealthAlertSerializer(alert).data if alert else None
@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from carebridge.caching import invalidate_patients, invalidate_tags, patient_tags
+from realtime.events import doctor_channel, publish, publish_patient_event
+
+from .models import HealthAlert, PatientProfile, VitalSign
+from .serializers import DashboardVitalSerializer, HealthAlertSerializer
+
+# Single-row writes (admin, ModelViewSet). Bulk paths (ingest, alerts, mood
+# batching) bypass signals and invalidate / publish themselves.
+
+SNAPSHOT_FIELDS = (
+    'current_status', 'current_mood', 'last_heart_rate', 'last_temperature', 'last_blood_pressure', 'last_update',
+)
+
+
+def profile_snapshot(profile):
+    return {field: getattr(profile, field) for field in SNAPSHOT_FIELDS}
+
+
+@receiver(post_init, sender=PatientProfile)
+def remember_doctor(sender, instance, **kwargs):
+    # Lets post_save tell which doctor a patient was moved away from
+    instance._loaded_doctor_id = instance.assigned_doctor_id
+
+
+@receiver([post_save, post_delete], sender=PatientProfile)
+def profile_changed(sender, instance, **kwargs):
+    tags = patient_tags([instance.id], [instance.assigned_doctor_id])
+    # Reassignment moves the patient between dashboards
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or 'assigned_doctor' in update_fields:
+        tags.append('dashboards')
+    invalidate_tags(*tags)
+
+    if kwargs['signal'] is post_delete:
+        if instance.assigned_doctor_id:
+            publish(doctor_channel(instance.assigned_doctor_id), 'unassigned', {}, patient_id=instance.id)
+        return
+    publish_patient_event(instance.id, 'profile', profile_snapshot(instance))
+    previous = None if kwargs.get('created') else instance._loaded_doctor_id
+    if previous != instance.assigned_doctor_id:
+        if previous:
+            publish(doctor_channel(previous), 'unassigned', {}, patient_id=instance.id)
+        if instance.assigned_doctor_id:
+            publish(doctor_channel(instance.assigned_doctor_id), 'assigned', profile_snapshot(instance), patient_id=instance.id)
+        instance._loaded_doctor_id = instance.assigned_doctor_id
+
+
+@receiver([post_save, post_delete], sender=VitalSign)
+@receiver([post_save, post_delete], sender=HealthAlert)
+def patient_data_changed(sender, instance, **kwargs):
+    invalidate_patients(PatientProfile.objects.filter(id=instance.patient_id))
+    if kwargs['signal'] is post_save and kwargs.get('created'):
+        if sender is VitalSign:
+            publish_patient_event(instance.patient_id, 'vitals', DashboardVitalSerializer(instance).data)
+        else:
+            publish_patient_event(instance.patient_id, 'alert', HealthAlertSerializer(instance).data)
@@ -0,0 +1,149 @@
+import atexit
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from carebridge.caching import invalidate_tags, patient_tags
+from jobs.signals import worker_stopping
+from realtime.events import publish_patient_event
+
+from .models import PatientProfile
+
+# Snapshot fields the writer may set; last_update is maintained by the writer
+SNAPSHOT_FIELDS = {
+    'current_status', 'current_mood', 'last_heart_rate', 'last_temperature', 'last_blood_pressure',
+}
+
+
+def _event_for(fields):
+    """Push event type/payload for a set of changed snapshot fields"""
+    if set(fields) == {'current_mood'}:
+        return 'mood'
+    elif set(fields) == {'current_status'}:
+        return 'status'
+    return 'profile'
+
+
+def write_snapshots(changes, key='id'):
+    """
+    Applies {patient key: {field: value}} with targeted UPDATEs.
+    Patients receiving identical values share one UPDATE, and rows that
+    already hold those values are excluded, so no-op updates never write
+    (and never bump last_update, invalidate caches or push events).
+    `key` is 'id' (patient id) or 'user_id'. Returns the number of rows changed.
+    """
+    groups = {}
+    for patient_key, fields in changes.items():
+        unknown = set(fields) - SNAPSHOT_FIELDS
+        if unknown:
+            raise ValueError(f"Not snapshot fields: {', '.join(sorted(unknown))}")
+        if fields:
+            groups.setdefault(tuple(sorted(fields.items())), []).append(patient_key)
+
+    changed = 0
+    now = timezone.now()
+    for items, keys in groups.items():
+        fields = dict(items)
+        # Only rows where at least one field differs
+        rows = list(
+            PatientProfile.objects.filter(**{f'{key}__in': keys}).exclude(Q(**fields))
+            .values_list('id', 'assigned_doctor_id')
+        )
+        if not rows:
+            continue
+        ids = [row[0] for row in rows]
+        changed += PatientProfile.objects.filter(id__in=ids).exclude(Q(**fields)).update(last_update=now, **fields)
+        invalidate_tags(*patient_tags(ids, {row[1] for row in rows}))
+        for patient_id in ids:
+            publish_patient_event(patient_id, _event_for(fields), fields)
+    return changed
+
+
+class SnapshotWriter:
+    """
+    Coalesces rapid snapshot updates per patient. Updates queued within
+    `window_ms` of each other are merged (later values win) and flushed by a
+    background thread through write_snapshots(), so a burst of chat turns for
+    one patient costs at most one UPDATE per window instead of one per turn.
+    """
+    def __init__(self, window_ms):
+        self.window = window_ms / 1000
+        self.stats = {'updates': 0, 'flushes': 0, 'rows_written': 0}
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {'id': {}, 'user_id': {}}
+        self._thread = None
+
+    def update(self, patient_id=None, user_id=None, **fields):
+        """Queues snapshot changes for a patient (by profile id or user id)"""
+        key, value = ('id', patient_id) if patient_id is not None else ('user_id', user_id)
+        if value is None or not fields:
+            return
+        if self.window <= 0:
+            write_snapshots({value: fields}, key=key)
+            return
+        self._ensure_started()
+        with self._lock:
+            self._pending[key].setdefault(value, {}).update(fields)
+            self.stats['updates'] += 1
+        self._wakeup.set()
+
+    def flush(self):
+        """Writes everything queued so far (also used by tests and shutdown)"""
+        with self._lock:
+            pending, self._pending = self._pending, {'id': {}, 'user_id': {}}
+        if not any(pending.values()):
+            return 0
+        written = 0
+        try:
+            for key, changes in pending.items():
+                if changes:
+                    written += write_snapshots(changes, key=key)
+        except Exception as e:
+            print(f"Snapshot write Error: {e}")
+        finally:
+            close_old_connections()
+        self.stats['flushes'] += 1
+        self.stats['rows_written'] += written
+        return written
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='snapshot-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Let the rest of the burst arrive, then write it all at once
+            time.sleep(self.window)
+            self._wakeup.clear()
+            self.flush()
+
+
+snapshot_writer = SnapshotWriter(settings.SNAPSHOT_COALESCE_MS)
+
+if hasattr(os, 'register_at_fork'):
+    # The writer thread does not survive fork; the child starts its own
+    os.register_at_fork(after_in_child=snapshot_writer._reset)
+
+# The writer thread is a daemon; write whatever is still queued on exit
+atexit.register(snapshot_writer.flush)
+
+
+@receiver(worker_stopping)
+def flush_on_worker_stop(sender, **kwargs):
+    # Job worker processes exit without running atexit handlers
+    snapshot_writer.flush()
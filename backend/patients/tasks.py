@@ -0,0 +1,7 @@
+from jobs.registry import task
+from .medications import sweep
+
+
+@task('patients.medication_sweep')
+def medication_sweep():
+    return sweep()
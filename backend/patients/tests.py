@@ -0,0 +1,152 @@
+import io
+
+from django.test import TestCase
+
+from carebridge.caching import get_cache
+from users.models import User
+
+from .columnar import read_columnar
+from .models import HealthAlert, Medication, PatientProfile, VitalRollup, VitalSign
+
+# dashboard_patients() (profiles, latest vitals, latest alerts)
+DASHBOARD_QUERIES = 3
+
+
+class DoctorDashboardViewTests(TestCase):
+    """The dashboard's query count must not grow with the number of patients"""
+
+    def setUp(self):
+        self.doctor = User.objects.create(username='dr-house', role='doctor')
+        self.url = f'/api/patients/dashboard/{self.doctor.id}/'
+        self.seeded = 0
+
+    def seed_patients(self, count):
+        for _ in range(count):
+            self.seeded += 1
+            user = User.objects.create(username=f'patient-{self.seeded}', first_name=f'Patient {self.seeded}')
+            profile = PatientProfile.objects.create(user=user, assigned_doctor=self.doctor)
+            VitalSign.objects.create(patient=profile, heart_rate=70 + self.seeded, blood_pressure='120/80')
+            VitalSign.objects.create(patient=profile, heart_rate=80 + self.seeded, blood_pressure='130/85')
+            HealthAlert.objects.create(patient=profile, alert_type='High', message='High heart rate')
+            HealthAlert.objects.create(patient=profile, alert_type='Low', message='Checked in', is_read=True)
+
+    def fetch_dashboard(self, queries):
+        # Otherwise the second request is served from the response cache
+        get_cache().clear()
+        with self.assertNumQueries(queries):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_query_count_is_constant(self):
+        self.seed_patients(1)
+        data = self.fetch_dashboard(DASHBOARD_QUERIES)
+        self.assertEqual(data['patient_count'], 1)
+
+        self.seed_patients(25)
+        data = self.fetch_dashboard(DASHBOARD_QUERIES)
+        self.assertEqual(data['patient_count'], 26)
+        self.assertEqual(data['unread_alerts'], 26)
+
+    def test_latest_vital_and_alert(self):
+        self.seed_patients(3)
+        data = self.fetch_dashboard(DASHBOARD_QUERIES)
+        for patient in data['patients']:
+            self.assertEqual(patient['latest_vital']['blood_pressure'], '130/85')
+            self.assertEqual(patient['latest_alert']['message'], 'High heart rate')
+
+
+class VitalExportTests(TestCase):
+    """Out-of-range readings are rejected on POST and cannot break an export"""
+
+    def setUp(self):
+        user = User.objects.create(username='patient-export')
+        self.patient = PatientProfile.objects.create(user=user)
+
+    def export_columnar(self):
+        response = self.client.get(f'/api/patients/vitals/export/?patient={self.patient.id}&output=columnar')
+        self.assertEqual(response.status_code, 200)
+        return list(read_columnar(io.BytesIO(b''.join(response.streaming_content))))
+
+    def test_post_rejects_out_of_range_vitals(self):
+        response = self.client.post('/api/patients/vitals/', {
+            'patient': self.patient.id, 'heart_rate': 40000, 'blood_pressure': 'abc',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'heart_rate', 'blood_pressure'})
+        self.assertFalse(VitalSign.objects.exists())
+
+        batches = self.export_columnar()
+        self.assertEqual(sum(len(batch) for batch in batches), 0)
+
+    def test_export_survives_stored_out_of_range_vitals(self):
+        # Rows written before validation existed (or straight through the ORM)
+        VitalSign.objects.create(patient=self.patient, heart_rate=40000, oxygen_level=40000, blood_pressure='abc')
+        VitalSign.objects.create(patient=self.patient, heart_rate=72, blood_pressure='120/80')
+
+        batches = self.export_columnar()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(list(batches[0]['heart_rate']), [40000, 72])
+        self.assertEqual(list(batches[0]['systolic']), [-1, 120])
+
+
+class MedicationIsTakenTests(TestCase):
+    """is_taken is read-only: echoed payloads are accepted, changes are refused"""
+
+    def setUp(self):
+        user = User.objects.create(username='patient-meds')
+        patient = PatientProfile.objects.create(user=user)
+        self.medication = Medication.objects.create(
+            patient=patient, name='Aspirin', dosage='75mg', frequency='Once daily', time_of_day='Morning'
+        )
+        self.url = f'/api/patients/medications/{self.medication.id}/'
+
+    def test_put_of_get_payload_is_accepted(self):
+        payload = self.client.get(self.url).json()
+        payload['dosage'] = '100mg'
+        response = self.client.put(self.url, payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['dosage'], '100mg')
+
+    def test_changing_is_taken_is_refused(self):
+        response = self.client.patch(self.url, {'is_taken': True}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('take/', response.json()['is_taken'][0])
+        self.medication.refresh_from_db()
+        self.assertFalse(self.medication.is_taken)
+
+
+class VitalRollupEditTests(TestCase):
+    """Editing or deleting a reading keeps its rollup buckets consistent"""
+
+    def setUp(self):
+        user = User.objects.create(username='patient-rollups')
+        self.patient = PatientProfile.objects.create(user=user)
+
+    def post_vital(self, heart_rate):
+        response = self.client.post('/api/patients/vitals/', {
+            'patient': self.patient.id, 'heart_rate': heart_rate, 'timestamp': '2026-01-01T10:15:00Z',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return f"/api/patients/vitals/{response.json()['id']}/"
+
+    def day_rollup(self):
+        return VitalRollup.objects.filter(patient=self.patient, resolution='day').first()
+
+    def test_update_and_delete_rebuild_rollups(self):
+        first = self.post_vital(70)
+        self.post_vital(80)
+
+        response = self.client.patch(first, {'heart_rate': 100}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        rollup = self.day_rollup()
+        self.assertEqual((rollup.count, rollup.heart_rate_min, rollup.heart_rate_max), (2, 80, 100))
+
+        response = self.client.patch(first, {'timestamp': '2026-01-02T10:15:00Z'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(VitalRollup.objects.filter(patient=self.patient, resolution='day').count(), 2)
+
+        self.assertEqual(self.client.delete(first).status_code, 204)
+        rollup = self.day_rollup()
+        self.assertEqual((rollup.count, rollup.heart_rate_sum), (1, 80))
+        self.assertEqual(VitalRollup.objects.filter(patient=self.patient).count(), 3)
@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PatientViewSet, VitalSignViewSet
+from .views import PatientViewSet, VitalSignViewSet, MedicationViewSet, DoctorDashboardView
 
 router = DefaultRouter()
 router.register(r'profiles', PatientViewSet)
 router.register(r'vitals', VitalSignViewSet)
+router.register(r'medications', MedicationViewSet)
 
 urlpatterns = [
+    path('dashboard/<int:doctor_id>/', DoctorDashboardView.as_view(), name='doctor-dashboard'),
     path('', include(router.urls)),
 ]
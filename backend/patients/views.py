@@ -1,11 +1,243 @@
-from rest_framework import viewsets
-from .models import PatientProfile, VitalSign
-from .serializers import PatientProfileSerializer, VitalSignSerializer
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from carebridge.caching import cached_response
+from carebridge.streaming import streaming_response
+from .models import PatientProfile, VitalSign, Medication
+from .serializers import (
+    PatientProfileSerializer, VitalSignSerializer, DashboardPatientSerializer, MedicationSerializer,
+    MedicationDoseSerializer,
+)
+from .dashboard import dashboard_patients
+from .ingest import ingest_vitals, refresh_snapshots, rows_from_json, rows_from_ndjson, rows_from_csv, parse_timestamp
+from .alerts import detect_anomalies
+from .rollups import ROLLUP_METRICS, rebuild_rollups, update_rollups, vitals_series
+from .medications import adherence, expand_schedules, reschedule, take_dose
+
+# ?output= for vitals exports -> (patients.columnar encoder, content type, file extension)
+EXPORT_OUTPUTS = {
+    'csv': ('iter_csv', 'text/csv', 'csv'),
+    'columnar': ('iter_columnar', 'application/octet-stream', 'cbv'),
+}
 
 class PatientViewSet(viewsets.ModelViewSet):
     queryset = PatientProfile.objects.all()
     serializer_class = PatientProfileSerializer
 
+    # Reads are cached until a write touches the profile (ETag / 304 supported)
+    def list(self, request, *args, **kwargs):
+        return cached_response(request, ['patients'], lambda: super(PatientViewSet, self).list(request, *args, **kwargs).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request, [f"patient:{kwargs['pk']}"],
+            lambda: super(PatientViewSet, self).retrieve(request, *args, **kwargs).data
+        )
+
 class VitalSignViewSet(viewsets.ModelViewSet):
+    """
+    Rollups are merged incrementally on insert; edits and deletes rebuild the
+    buckets of the day(s) the reading was in (and moved to).
+    """
     queryset = VitalSign.objects.all()
-    serializer_class = VitalSignSerializer
\ No newline at end of file
+    serializer_class = VitalSignSerializer
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            vital = serializer.save()
+            refresh_snapshots([vital])
+            update_rollups([vital])
+            detect_anomalies([vital])
+
+    def perform_update(self, serializer):
+        before = (serializer.instance.patient_id, serializer.instance.timestamp)
+        with transaction.atomic():
+            vital = serializer.save()
+            rebuild_rollups([before, (vital.patient_id, vital.timestamp)])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            rebuild_rollups([(instance.patient_id, instance.timestamp)])
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Bulk ingestion for wearable sync bursts.
+        Body: JSON array (or {"readings": [...]}), NDJSON (application/x-ndjson)
+        or CSV with a header row (text/csv). Valid rows are inserted, invalid
+        ones are reported by index.
+        """
+        content_type = request.content_type.split(';')[0].strip()
+        try:
+            if content_type in ('application/x-ndjson', 'application/jsonl'):
+                rows = rows_from_ndjson(request.stream or [], max_rows=settings.VITALS_BULK_MAX_ROWS)
+            elif content_type == 'text/csv':
+                rows = rows_from_csv(request.stream or [], max_rows=settings.VITALS_BULK_MAX_ROWS)
+            else:
+                rows = rows_from_json(request.data)
+            result = ingest_vitals(rows)
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if result["errors"] and not result["created"]:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
+    @action(detail=False, methods=['get'], url_path='series')
+    def series(self, request):
+        """
+        Downsampled vitals for charts, served from the minute/hour/day rollups.
+        Query: ?patient=<id>&start=<iso>&end=<iso>&points=<max>&metrics=heart_rate,steps
+        Defaults to the last 24 hours. The finest resolution that fits `points` is used.
+        """
+        params = request.query_params
+        try:
+            patient_id = int(params.get('patient', ''))
+            end = parse_timestamp(params.get('end'))
+            start = parse_timestamp(params.get('start')) if params.get('start') else end - timedelta(hours=24)
+            points = int(params.get('points', settings.VITALS_SERIES_DEFAULT_POINTS))
+        except ValueError:
+            return Response(
+                {"error": "patient and points must be integers, start/end ISO 8601 timestamps"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start >= end:
+            return Response({"error": "start must be before end"}, status=status.HTTP_400_BAD_REQUEST)
+
+        metrics = params.get('metrics')
+        metrics = [m.strip() for m in metrics.split(',')] if metrics else list(ROLLUP_METRICS)
+        unknown = [m for m in metrics if m not in ROLLUP_METRICS]
+        if unknown:
+            return Response({"error": f"Unknown metrics: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        points = max(1, min(points, settings.VITALS_SERIES_MAX_POINTS))
+        return Response(vitals_series(patient_id, start, end, points, metrics))
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Streams raw vitals history for analytics / research exports.
+        Query: ?patient=<id>[,<id>...]&start=<iso>&end=<iso>&output=csv|columnar
+        All patients and all time by default. Rows are read and encoded in
+        batches, so memory stays flat however long the history is.
+        """
+        params = request.query_params
+        output = params.get('output', 'csv')
+        if output not in EXPORT_OUTPUTS:
+            return Response({"error": f"output must be one of {', '.join(EXPORT_OUTPUTS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            patient_ids = [int(p) for p in params['patient'].split(',')] if params.get('patient') else None
+            start = parse_timestamp(params['start']) if params.get('start') else None
+            end = parse_timestamp(params['end']) if params.get('end') else None
+        except ValueError:
+            return Response(
+                {"error": "patient must be integer ids, start/end ISO 8601 timestamps"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # NumPy is only imported by workers that serve an export
+        from . import columnar
+
+        encoder, content_type, extension = EXPORT_OUTPUTS[output]
+        chunks = getattr(columnar, encoder)(columnar.iter_batches(columnar.vitals_queryset(patient_ids, start, end)))
+        response = streaming_response(request, chunks, content_type)
+        response['Content-Disposition'] = f'attachment; filename="vitals.{extension}"'
+        return response
+
+
+class MedicationViewSet(viewsets.ModelViewSet):
+    """
+    Medications and their dose schedule. Doses are expanded ahead of time and
+    swept by `python manage.py run_medication_sweep` (missed doses raise alerts).
+    """
+    queryset = Medication.objects.all()
+    serializer_class = MedicationSerializer
+    SCHEDULE_FIELDS = {'frequency', 'time_of_day', 'dose_times', 'is_active'}
+
+    def get_queryset(self):
+        medications = super().get_queryset()
+        patient = self.request.query_params.get('patient')
+        if patient and patient.isdigit():
+            medications = medications.filter(patient_id=patient)
+        return medications
+
+    def perform_create(self, serializer):
+        medication = serializer.save()
+        expand_schedules(medications=Medication.objects.filter(id=medication.id))
+
+    def perform_update(self, serializer):
+        changed = self.SCHEDULE_FIELDS & set(serializer.validated_data)
+        medication = serializer.save()
+        if changed:
+            reschedule(medication)
+
+    @action(detail=True, methods=['post'])
+    def take(self, request, pk=None):
+        """Marks the current dose as taken"""
+        dose = take_dose(self.get_object())
+        if dose is None:
+            return Response({"error": "No dose is due"}, status=status.HTTP_409_CONFLICT)
+        return Response(MedicationDoseSerializer(dose).data)
+
+    @action(detail=True, methods=['get'])
+    def doses(self, request, pk=None):
+        """Dose history, newest first: ?days=<n> (default 7)"""
+        try:
+            days = int(request.query_params.get('days', 7))
+        except ValueError:
+            return Response({"error": "days must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        medication = self.get_object()
+        doses = medication.doses.filter(due_at__gte=timezone.now() - timedelta(days=days)).order_by('-due_at')
+        return Response(MedicationDoseSerializer(doses, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def adherence(self, request):
+        """
+        Taken vs missed doses per medication.
+        Query: ?patient=<id>&start=<iso>&end=<iso> (defaults to the last 30 days)
+        """
+        params = request.query_params
+        try:
+            patient_id = int(params.get('patient', ''))
+            end = parse_timestamp(params.get('end'))
+            start = parse_timestamp(params.get('start')) if params.get('start') else end - timedelta(days=30)
+        except ValueError:
+            return Response(
+                {"error": "patient must be an integer, start/end ISO 8601 timestamps"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(adherence(patient_id, start, end))
+
+
+class DoctorDashboardView(APIView):
+    """
+    GET /api/patients/dashboard/<doctor_id>/
+    All patients assigned to a doctor with their snapshot, latest vitals and
+    unread alerts. Query count is constant in the number of patients, and
+    unchanged dashboards are served from cache (ETag / 304 supported).
+    """
+    def get(self, request, doctor_id):
+        # Cached until one of the doctor's patients (or an assignment) changes
+        return cached_response(request, [f'doctor:{doctor_id}', 'dashboards'], lambda: self.build(doctor_id))
+
+    def build(self, doctor_id):
+        profiles, latest_vitals, latest_alerts = dashboard_patients(doctor_id)
+        patients = DashboardPatientSerializer(
+            profiles, many=True,
+            context={'latest_vitals': latest_vitals, 'latest_alerts': latest_alerts}
+        ).data
+        return {
+            "doctor": doctor_id,
+            "patient_count": len(profiles),
+            "critical_count": sum(1 for p in profiles if p.current_status == 'Critical'),
+            "unread_alerts": sum(p.unread_alerts for p in profiles),
+            "patients": patients,
+        }
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'realtime'
+
+    def ready(self):
+        # Warn when the broker cannot reach every web worker
+        from . import checks  # noqa: F401
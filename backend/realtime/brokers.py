@@ -0,0 +1,169 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+from django.conf import settings
+
+
+class Subscription:
+    """
+    One client's view of the event stream: a bounded asyncio queue fed from
+    any thread. If the client falls too far behind, events are dropped and
+    `overflowed` is set so the client can be told to refetch (also set when
+    the broker lost events, e.g. during a Redis reconnect).
+    """
+    def __init__(self, broker, channels, loop, max_size):
+        self.broker = broker
+        self.channels = set(channels)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Next event, or None after `timeout` seconds of silence"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def add(self, *channels):
+        self.broker.update(self, add=channels)
+
+    def remove(self, *channels):
+        self.broker.update(self, remove=channels)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fans events out to subscribers in this process only. Enough for a single
+    ASGI worker (or local dev); use RedisBroker when running several workers,
+    or when events come from run_jobs / run_medication_sweep processes.
+    publish() is safe to call from any thread, including request threads.
+    """
+    # Whether events published here reach subscribers in other processes
+    reaches_other_processes = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._ids = itertools.count(1)
+
+    def subscribe(self, channels, loop=None):
+        subscription = Subscription(
+            self, channels, loop or asyncio.get_running_loop(), settings.REALTIME_QUEUE_SIZE
+        )
+        with self._lock:
+            for channel in subscription.channels:
+                self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def update(self, subscription, add=(), remove=()):
+        with self._lock:
+            for channel in add:
+                subscription.channels.add(channel)
+                self._channels.setdefault(channel, set()).add(subscription)
+            for channel in remove:
+                subscription.channels.discard(channel)
+                self._discard(channel, subscription)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                self._discard(channel, subscription)
+
+    def _discard(self, channel, subscription):
+        subscribers = self._channels.get(channel)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[channel]
+
+    def publish(self, channel, event):
+        self.dispatch(channel, dict(event, id=next(self._ids)))
+
+    def dispatch(self, channel, event):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Loop already closed: the client went away
+                self.unsubscribe(subscription)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Publishes through Redis pub/sub so every worker process sees every event.
+    One listener thread per process relays messages to local subscribers.
+    Requires the `redis` package and settings.REALTIME_REDIS_URL. If Redis
+    goes away the listener reconnects with backoff and clients get a resync.
+    """
+    prefix = 'carebridge:'
+    reaches_other_processes = True
+    # Backoff between reconnect attempts when the Redis connection drops
+    reconnect_min_seconds = 0.5
+    reconnect_max_seconds = 30
+
+    def __init__(self):
+        super().__init__()
+        import redis
+
+        self._redis = redis.Redis.from_url(settings.REALTIME_REDIS_URL)
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def subscribe(self, channels, loop=None):
+        self._ensure_listener()
+        return super().subscribe(channels, loop)
+
+    def publish(self, channel, event):
+        self._redis.publish(self.prefix + channel, json.dumps(dict(event, id=next(self._ids))))
+
+    def _ensure_listener(self):
+        with self._start_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='realtime-redis', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        import redis
+
+        delay = self.reconnect_min_seconds
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(self.prefix + '*')
+                delay = self.reconnect_min_seconds
+                for message in pubsub.listen():
+                    try:
+                        channel = message['channel'].decode('utf-8')[len(self.prefix):]
+                        self.dispatch(channel, json.loads(message['data']))
+                    except (KeyError, ValueError, AttributeError) as e:
+                        print(f"Realtime relay error: {e}")
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                print(f"Realtime Redis connection lost, retrying in {delay}s. Error: {e}")
+            finally:
+                pubsub.close()
+            # Events published while disconnected are gone; tell clients to refetch
+            self._mark_missed()
+            time.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_seconds)
+
+    def _mark_missed(self):
+        with self._lock:
+            subscriptions = {s for subscribers in self._channels.values() for s in subscribers}
+        for subscription in subscriptions:
+            subscription.overflowed = True
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def broker_reaches_all_workers(app_configs, **kwargs):
+    """InProcessBroker only delivers to clients connected to the publishing process"""
+    if settings.REALTIME_BROKER == 'realtime.brokers.InProcessBroker' and settings.WEB_CONCURRENCY > 1:
+        return [Warning(
+            f"REALTIME_BROKER is InProcessBroker but WEB_CONCURRENCY is {settings.WEB_CONCURRENCY}.",
+            hint="Clients only receive events published by their own worker (and never those from "
+                 "run_jobs or run_medication_sweep); set REALTIME_BROKER=realtime.brokers.RedisBroker.",
+            id='realtime.W001',
+        )]
+    return []
@@ -0,0 +1,70 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+_broker = None
+# Set by commands that publish but serve no clients (job workers, sweeps)
+_producer = None
+_warned = False
+
+
+def get_broker():
+    """Broker configured by settings.REALTIME_BROKER (one per process)"""
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.REALTIME_BROKER)()
+    return _broker
+
+
+def mark_producer(name):
+    """
+    Marks this process as a background producer. Its events only reach
+    clients through a broker that relays between processes (RedisBroker);
+    with InProcessBroker the first publish logs a warning.
+    """
+    global _producer
+    _producer = name
+
+
+def _warn_if_undeliverable(broker):
+    global _warned
+    if _producer and not broker.reaches_other_processes and not _warned:
+        _warned = True
+        print(
+            f"Realtime warning: {_producer} publishes through {type(broker).__name__}, so its events "
+            f"never reach SSE/WebSocket clients. Set REALTIME_BROKER=realtime.brokers.RedisBroker."
+        )
+
+
+def patient_channel(patient_id):
+    return f'patient:{patient_id}'
+
+
+def doctor_channel(doctor_id):
+    return f'doctor:{doctor_id}'
+
+
+def publish(channel, event_type, data, patient_id=None):
+    """
+    Sends an event to everyone subscribed to `channel` once the current
+    transaction commits, so clients never see writes that were rolled back.
+    """
+    event = {'type': event_type, 'patient': patient_id, 'data': json.loads(json.dumps(data, cls=DjangoJSONEncoder))}
+
+    def send():
+        try:
+            broker = get_broker()
+            _warn_if_undeliverable(broker)
+            broker.publish(channel, event)
+        except Exception as e:
+            # Push is best effort; clients can always fall back to the REST endpoints
+            print(f"Realtime publish error ({channel}): {e}")
+
+    transaction.on_commit(send)
+
+
+def publish_patient_event(patient_id, event_type, data):
+    publish(patient_channel(patient_id), event_type, data, patient_id=patient_id)
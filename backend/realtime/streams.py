@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from patients.models import PatientProfile
+
+from .events import doctor_channel, get_broker, patient_channel
+
+
+def _assigned_patient_ids(doctor_id):
+    return list(PatientProfile.objects.filter(assigned_doctor_id=doctor_id).values_list('id', flat=True))
+
+
+async def subscribe_doctor(doctor_id):
+    """Subscribes to every patient assigned to the doctor, plus assignment changes"""
+    patient_ids = await sync_to_async(_assigned_patient_ids)(doctor_id)
+    channels = [doctor_channel(doctor_id)] + [patient_channel(patient_id) for patient_id in patient_ids]
+    return get_broker().subscribe(channels)
+
+
+async def subscribe_patient(patient_id):
+    return get_broker().subscribe([patient_channel(patient_id)])
+
+
+async def iter_events(subscription):
+    """
+    Yields events for a subscription, None as an idle heartbeat, and a
+    'resync' event if the client fell behind and events were dropped.
+    Follows assignment changes so a doctor's stream tracks their patient list.
+    """
+    while True:
+        event = await subscription.get(settings.REALTIME_HEARTBEAT_SECONDS)
+        if subscription.overflowed:
+            subscription.overflowed = False
+            yield {'type': 'resync', 'patient': None, 'data': {'reason': 'Events were missed; refetch current state'}}
+        if event is None:
+            yield None
+            continue
+        if event['type'] == 'assigned':
+            subscription.add(patient_channel(event['patient']))
+        elif event['type'] == 'unassigned':
+            subscription.remove(patient_channel(event['patient']))
+        yield event
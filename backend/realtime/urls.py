@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import DoctorEventStreamView, PatientEventStreamView
+
+urlpatterns = [
+    path('doctors/<int:doctor_id>/events/', DoctorEventStreamView.as_view(), name='doctor_events'),
+    path('patients/<int:patient_id>/events/', PatientEventStreamView.as_view(), name='patient_events'),
+]
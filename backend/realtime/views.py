@@ -0,0 +1,47 @@
+import json
+
+from django.http import StreamingHttpResponse
+from django.views import View
+
+from .streams import iter_events, subscribe_doctor, subscribe_patient
+
+
+def sse_message(event):
+    """Formats one Server-Sent Event (a comment line when event is None)"""
+    if event is None:
+        return ": keepalive\n\n"
+    event_id = f"id: {event['id']}\n" if 'id' in event else ''
+    return f"{event_id}event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def sse_stream(subscription):
+    try:
+        yield ": connected\n\n"
+        async for event in iter_events(subscription):
+            yield sse_message(event)
+    finally:
+        subscription.close()
+
+
+def sse_response(subscription):
+    response = StreamingHttpResponse(sse_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # Disable proxy buffering (nginx)
+    return response
+
+
+class DoctorEventStreamView(View):
+    """
+    GET /api/realtime/doctors/<doctor_id>/events/
+    Server-Sent Events for all patients assigned to the doctor: 'alert',
+    'vitals', 'mood', 'status', 'profile', 'assigned', 'unassigned', 'resync'.
+    Needs the ASGI server (uvicorn) to hold many connections cheaply.
+    """
+    async def get(self, request, doctor_id):
+        return sse_response(await subscribe_doctor(doctor_id))
+
+
+class PatientEventStreamView(View):
+    """GET /api/realtime/patients/<patient_id>/events/ - one patient's events"""
+    async def get(self, request, patient_id):
+        return sse_response(await subscribe_patient(patient_id))
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import re
+
+from .streams import iter_events, subscribe_doctor, subscribe_patient
+
+# Same subscriptions as the SSE endpoints, for clients that prefer WebSockets
+ROUTES = (
+    (re.compile(r'^/ws/doctors/(?P<id>\d+)/$'), subscribe_doctor),
+    (re.compile(r'^/ws/patients/(?P<id>\d+)/$'), subscribe_patient),
+)
+
+
+async def websocket_application(scope, receive, send):
+    """
+    Minimal ASGI WebSocket handler (no extra dependencies). Server -> client
+    only: each event is sent as a JSON text frame, heartbeats as {"type": "ping"}.
+    """
+    for pattern, subscribe in ROUTES:
+        match = pattern.match(scope['path'])
+        if match:
+            break
+    else:
+        await receive() # websocket.connect
+        await send({'type': 'websocket.close', 'code': 4404})
+        return
+
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    subscription = await subscribe(int(match.group('id')))
+    await send({'type': 'websocket.accept'})
+
+    async def push():
+        async for event in iter_events(subscription):
+            await send({'type': 'websocket.send', 'text': json.dumps(event or {'type': 'ping'})})
+
+    pusher = asyncio.create_task(push())
+    try:
+        # Anything the client sends is ignored; we only wait for the disconnect
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+    finally:
+        pusher.cancel()
+        subscription.close()